@@ -1,35 +1,118 @@
 """SWF workflow management service."""
 
+import sys
 import pathlib
 import argparse
+import importlib.util
 
-import pkg_resources
 
-try:
-    from pythonjsonlogger import jsonlogger
-except ImportError as e:  # pragma: no cover
-    jsonlogger = e
+class _VersionAction(argparse.Action):
+    """Show package version and exit, looking up the version only when used."""
 
-try:
-    version = pkg_resources.get_distribution("seddy").version
-except pkg_resources.DistributionNotFound:  # pragma: no cover
-    version = None
+    def __init__(
+        self,
+        option_strings,
+        dest=argparse.SUPPRESS,
+        default=argparse.SUPPRESS,
+        help="show program's version number and exit",
+    ):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
 
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(_get_version())
+        parser.exit()
+
+
+def _get_version() -> str:
+    """Get installed package version."""
+    try:
+        from importlib import metadata as importlib_metadata
+    except ImportError:  # pragma: no cover
+        import importlib_metadata
+
+    try:
+        return importlib_metadata.version("seddy")
+    except importlib_metadata.PackageNotFoundError:  # pragma: no cover
+        return "unknown"
+
+
+def _has_module(name: str) -> bool:
+    """Check whether a module is installed, without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+def _positive_float(value: str) -> float:
+    """Parse a positive number command-line argument."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    if number is None or not number > 0:
+        raise argparse.ArgumentTypeError("must be a positive number: %s" % value)
+    return number
+
+
+def run_app(args: argparse.Namespace) -> int:
+    """Run application from parsed command-line arguments.
+
+    Returns:
+        application exit status
+    """
 
-def run_app(args: argparse.Namespace):
-    """Run application from parsed command-line arguments."""
     from . import _util
 
-    _util.setup_logging(args.verbose - args.quiet, args.json_logging)
+    _util.setup_logging(
+        args.verbose - args.quiet,
+        args.json_logging,
+        args.queue_logging,
+        args.log_payload_size,
+    )
+
+    if args.rate_limit is not None:
+        from . import _ratelimit
+
+        _ratelimit.rate_limiter = _ratelimit.RateLimiter(scale=args.rate_limit)
 
     if args.command == "decider":
         from . import decider
 
-        decider.run_app(args.workflows_file, args.domain, args.task_list, args.identity)
+        if args.trace_file:
+            from . import _tracing
+
+            exporter_class = _tracing.exporters[args.trace_format]
+            _tracing.tracer.exporter = exporter_class(args.trace_file)
+
+        profiler = None
+        if args.profile_dir:
+            from . import _profiling
+
+            profiler = _profiling.Profiler(
+                args.profile_dir,
+                args.profile_sample_rate,
+                args.profile_threshold,
+                args.profile_memory,
+                enabled=not args.profile_paused,
+            )
+
+        decider.run_app(
+            args.workflows_files,
+            args.domain,
+            args.task_list,
+            args.identity,
+            args.compact_history,
+            args.pipeline_depth,
+            args.record_file,
+            profiler,
+            args.report_interval,
+        )
     elif args.command == "register":
         from . import registration
 
-        registration.run_app(args.workflows_file, args.domain)
+        registration.run_app(args.workflows_files, args.domain)
+    elif args.command == "replay":
+        from . import replay
+
+        return replay.run_app(args.workflows_files, args.recording_file)
     else:  # pragma: no cover
         raise ValueError(args.command)
 
@@ -43,14 +126,34 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-q", "--quiet", action="count", default=0, help="decrease logging verbosity"
     )
-    if not isinstance(jsonlogger, Exception):
+    if _has_module("pythonjsonlogger"):
         parser.add_argument(
             "-J",
             "--json-logging",
             action="store_true",
             help="JSON-format logs (coloured-logging disabled)",
         )
-    parser.add_argument("-V", "--version", action="version", version=version)
+    parser.add_argument(
+        "--queue-logging",
+        action="store_true",
+        help="format and write logs in a background thread",
+    )
+    parser.add_argument(
+        "--log-payload-size",
+        type=int,
+        metavar="N",
+        help="maximum logged length of large payloads (eg histories)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=_positive_float,
+        metavar="SCALE",
+        help=(
+            "scale the SWF request rate limits (200/s polling and responding, "
+            "5/s listing) by this factor"
+        ),
+    )
+    parser.add_argument("-V", "--version", action=_VersionAction)
     subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
     subparsers.required = True
 
@@ -59,7 +162,11 @@ def build_parser() -> argparse.ArgumentParser:
         "decider", help="run SWF decider", description="Run SWF decider."
     )
     decider_parser.add_argument(
-        "workflows_file", type=pathlib.Path, help="workflows specifications file path"
+        "workflows_files",
+        nargs="+",
+        type=pathlib.Path,
+        metavar="spec",
+        help="workflows specifications file or directory path",
     )
     decider_parser.add_argument("domain", help="SWF domain")
     decider_parser.add_argument("task_list", help="SWF decider task-list")
@@ -69,6 +176,85 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="NAME",
         help="decider identity, default: automatically generated",
     )
+    decider_parser.add_argument(
+        "--compact-history",
+        action="store_true",
+        help="store decision task history compactly, to reduce memory use",
+    )
+    decider_parser.add_argument(
+        "-p",
+        "--pipeline-depth",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "maximum number of decision tasks handled while polling for the "
+            "next, default: no pipelining"
+        ),
+    )
+    decider_parser.add_argument(
+        "--record",
+        type=pathlib.Path,
+        metavar="FILE",
+        dest="record_file",
+        help="record decision tasks and decisions to file (gzipped JSON-lines)",
+    )
+    decider_parser.add_argument(
+        "--report-interval",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "log a summary of poll, history fetch, decision building and "
+            "response latencies every this many seconds"
+        ),
+    )
+    decider_parser.add_argument(
+        "--trace-file",
+        type=pathlib.Path,
+        metavar="FILE",
+        help="export decision task trace spans to file",
+    )
+    decider_parser.add_argument(
+        "--trace-format",
+        choices=("jsonl", "otlp"),
+        default="jsonl",
+        help=(
+            "trace spans file format: JSON-lines of spans, or OTLP/JSON "
+            "(OpenTelemetry), default: jsonl"
+        ),
+    )
+    decider_parser.add_argument(
+        "--profile-dir",
+        type=pathlib.Path,
+        metavar="DIR",
+        help=(
+            "profile decision-making, saving profiles to directory (toggle "
+            "with SIGUSR1)"
+        ),
+    )
+    decider_parser.add_argument(
+        "--profile-sample-rate",
+        type=float,
+        default=1.0,
+        metavar="RATE",
+        help="fraction of decision tasks to profile, default: all",
+    )
+    decider_parser.add_argument(
+        "--profile-threshold",
+        type=float,
+        metavar="SECONDS",
+        help="only keep profiles of decision-making taking at least this long",
+    )
+    decider_parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="also save memory allocation snapshots of profiled tasks",
+    )
+    decider_parser.add_argument(
+        "--profile-paused",
+        action="store_true",
+        help="start with profiling disabled (enable with SIGUSR1)",
+    )
 
     # Workflows registration
     register_parser = subparsers.add_parser(
@@ -77,17 +263,41 @@ def build_parser() -> argparse.ArgumentParser:
         description="Synchronise workflow registration status with SWF.",
     )
     register_parser.add_argument(
-        "workflows_file", type=pathlib.Path, help="workflows specifications file path"
+        "workflows_files",
+        nargs="+",
+        type=pathlib.Path,
+        metavar="spec",
+        help="workflows specifications file or directory path",
     )
     register_parser.add_argument("domain", help="SWF domain")
 
+    # Decision tasks replay
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="replay recorded decision tasks",
+        description="Replay recorded decision tasks, comparing decisions.",
+    )
+    replay_parser.add_argument(
+        "recording_file",
+        type=pathlib.Path,
+        metavar="recording",
+        help="decision tasks recording file",
+    )
+    replay_parser.add_argument(
+        "workflows_files",
+        nargs="+",
+        type=pathlib.Path,
+        metavar="spec",
+        help="workflows specifications file or directory path",
+    )
+
     return parser
 
 
 def main():  # pragma: no cover
     parser = build_parser()
     args = parser.parse_args()
-    run_app(args)
+    sys.exit(run_app(args))
 
 
 if __name__ == "__main__":  # pragma: no cover
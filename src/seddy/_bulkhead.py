@@ -0,0 +1,83 @@
+"""Decision task concurrency isolation."""
+
+import threading
+import collections
+import typing as t
+from concurrent import futures as cf
+
+
+class BulkheadFull(RuntimeError):
+    """Bulkhead's queue is full."""
+
+
+class Bulkhead:
+    """Limit the number of tasks running at once, queueing excess tasks.
+
+    Queued tasks don't occupy executor workers: they are submitted to the
+    executor as running tasks finish.
+
+    Args:
+        executor: task executor
+        max_tasks: maximum number of tasks running at once
+        max_queued: maximum number of tasks waiting to run, default:
+            unlimited
+    """
+
+    def __init__(self, executor: cf.Executor, max_tasks: int, max_queued: int = None):
+        self.executor = executor
+        self.max_tasks = max_tasks
+        self.max_queued = max_queued
+        self._n_running = 0
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+
+    @property
+    def n_queued(self) -> int:
+        """Number of tasks waiting to run."""
+        return len(self._queue)
+
+    def submit(self, fn: t.Callable, *args) -> cf.Future:
+        """Run task, possibly after running tasks finish.
+
+        Args:
+            fn: task function
+            *args: task function positional arguments
+
+        Returns:
+            task result future
+
+        Raises:
+            BulkheadFull: task queue is full
+        """
+
+        future = cf.Future()
+        with self._lock:
+            if self._n_running >= self.max_tasks:
+                if self.max_queued is not None and self.n_queued >= self.max_queued:
+                    raise BulkheadFull(self.max_tasks, self.max_queued)
+                self._queue.append((future, fn, args))
+                return future
+            self._n_running += 1
+        self._start(future, fn, args)
+        return future
+
+    def _start(self, future: cf.Future, fn: t.Callable, args: tuple):
+        future.set_running_or_notify_cancel()
+        task_future = self.executor.submit(fn, *args)
+        task_future.add_done_callback(lambda f: self._finish(future, f))
+
+    def _finish(self, future: cf.Future, task_future: cf.Future):
+        with self._lock:
+            if self._queue:
+                next_task = self._queue.popleft()
+            else:
+                next_task = None
+                self._n_running -= 1
+        if next_task:
+            self._start(*next_task)
+
+        exc = task_future.exception()
+        if exc is None:
+            future.set_result(task_future.result())
+        else:
+            future.set_exception(exc)
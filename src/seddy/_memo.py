@@ -0,0 +1,68 @@
+"""Short-lived memoisation."""
+
+import time
+import threading
+import collections
+import typing as t
+
+
+class TTLCache:
+    """Size-bounded cache with expiring entries, safe to use from multiple
+    threads.
+
+    Args:
+        ttl: entry time-to-live (seconds)
+        max_size: maximum number of entries, oldest being evicted first
+        clock: monotonic time function
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int = 1024,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, now: float):
+        """Remove expired and excess entries, oldest first."""
+        entries = self._entries
+        while entries:
+            key, (expiry, _) = next(iter(entries.items()))
+            if expiry > now and len(entries) <= self.max_size:
+                break
+            del entries[key]
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        """Get unexpired entry value.
+
+        Args:
+            key: entry key
+            default: value to return if missing or expired
+        """
+
+        with self._lock:
+            self._evict(self.clock())
+            entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: t.Hashable, value: t.Any):
+        """Add or replace entry, expiring after the time-to-live.
+
+        Args:
+            key: entry key
+            value: entry value
+        """
+
+        with self._lock:
+            now = self.clock()
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, value)
+            self._evict(now)
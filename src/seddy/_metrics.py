@@ -0,0 +1,225 @@
+"""Decider metrics."""
+
+import math
+import time
+import threading
+import collections
+import typing as t
+import logging as lg
+
+logger = lg.getLogger(__name__)
+
+
+def percentile(values: t.Sequence[float], q: float) -> float:
+    """Calculate percentile, by nearest rank.
+
+    Args:
+        values: sorted values
+        q: percentile, in [0, 100]
+
+    Returns:
+        value at percentile, or NaN for no values
+    """
+
+    if not values:
+        return float("nan")
+    rank = int(math.ceil(q / 100.0 * len(values)))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class Histogram:
+    """Latency histogram, with log-linear buckets (as in HDR histograms).
+
+    Each power-of-two range of microseconds is split into
+    :attr:`sub_buckets` linear buckets, so recorded values have a bounded
+    relative error. Not thread-safe.
+
+    Attributes:
+        count (int): number of recorded values
+        total (float): sum of recorded values (seconds)
+        max (float): maximum recorded value (seconds)
+    """
+
+    sub_buckets = 16
+
+    def __init__(self):
+        self._buckets = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _get_index(self, value: float) -> int:
+        """Get bucket index of value (seconds)."""
+        us = max(int(value * 1e6), 0)
+        if us < self.sub_buckets:
+            return us
+        exponent = us.bit_length() - self.sub_buckets.bit_length()
+        return exponent * self.sub_buckets + (us >> exponent)
+
+    def _get_upper_bound(self, index: int) -> float:
+        """Get exclusive upper bound (seconds) of bucket values."""
+        if index < self.sub_buckets:
+            return (index + 1) / 1e6
+        exponent = index // self.sub_buckets - 1
+        sub_bucket = index - exponent * self.sub_buckets
+        return ((sub_bucket + 1) << exponent) / 1e6
+
+    def record(self, value: float):
+        """Record a value.
+
+        Args:
+            value: latency (seconds)
+        """
+
+        self._buckets[self._get_index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Calculate percentile of recorded values, by nearest rank.
+
+        Args:
+            q: percentile, in [0, 100]
+
+        Returns:
+            upper bound of percentile's bucket (at most the maximum value),
+                or NaN for no values
+        """
+
+        if not self.count:
+            return float("nan")
+        rank = min(max(int(math.ceil(q / 100.0 * self.count)), 1), self.count)
+        n = 0
+        for index in sorted(self._buckets):
+            n += self._buckets[index]
+            if n >= rank:
+                return min(self._get_upper_bound(index), self.max)
+        raise AssertionError(rank)  # pragma: no cover
+
+
+class Metrics:
+    """Decider metrics, safe to record from multiple threads.
+
+    Attributes:
+        counts (dict[str, int]): event counts
+    """
+
+    def __init__(self):
+        self._counts = collections.Counter()
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self) -> t.Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def increment(self, name: str, n: int = 1):
+        """Increment event count.
+
+        Args:
+            name: event name
+            n: increment
+        """
+
+        with self._lock:
+            self._counts[name] += n
+
+    def record_latency(self, name: str, key: t.Hashable, duration: float):
+        """Record operation latency.
+
+        Args:
+            name: operation name
+            key: latency breakdown key, eg workflow name and version
+            duration: operation duration (seconds)
+        """
+
+        with self._lock:
+            histogram = self._latencies.get((key, name))
+            if histogram is None:
+                histogram = self._latencies[(key, name)] = Histogram()
+            histogram.record(duration)
+
+    def pop_latencies(self) -> t.Dict[t.Tuple[t.Hashable, str], Histogram]:
+        """Get and reset recorded latencies.
+
+        Returns:
+            latency histograms, by breakdown key and operation name
+        """
+
+        with self._lock:
+            latencies, self._latencies = self._latencies, {}
+        return latencies
+
+
+class Reporter:
+    """Periodically log a summary of recorded latencies, then reset them,
+    in a background thread.
+
+    Args:
+        metrics: metrics to report
+        interval: reporting interval (seconds)
+    """
+
+    def __init__(self, metrics: Metrics, interval: float):
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = time.monotonic()
+
+    def report(self):
+        """Log and reset recorded latencies.
+
+        Logs one line per breakdown key, with each operation's count,
+        50th, 90th and 99th percentiles, and maximum latency.
+        """
+
+        now = time.monotonic()
+        elapsed, self._started = now - self._started, now
+        by_key = collections.defaultdict(list)
+        for (key, name), histogram in sorted(self.metrics.pop_latencies().items()):
+            by_key[key].append((name, histogram))
+        for key, histograms in by_key.items():
+            summaries = [
+                "%s n=%d p50=%.1f p90=%.1f p99=%.1f max=%.1f"
+                % (
+                    name,
+                    h.count,
+                    h.percentile(50) * 1e3,
+                    h.percentile(90) * 1e3,
+                    h.percentile(99) * 1e3,
+                    h.max * 1e3,
+                )
+                for name, h in histograms
+            ]
+            _fmt = "Latency (ms) for '%s' over %.0f s: %s"
+            logger.log(25, _fmt, "-".join(key), elapsed, "; ".join(summaries))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.report()
+            except Exception:  # pragma: no cover
+                logger.exception("Failed to report metrics")
+
+    def start(self):
+        """Start reporting."""
+        self._stop.clear()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="seddy-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop reporting, waiting on the reporting thread to finish, then
+        report latencies recorded since the last report.
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.report()
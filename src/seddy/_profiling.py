@@ -0,0 +1,167 @@
+"""Decision-making profiling."""
+
+import re
+import time
+import random
+import signal
+import cProfile
+import pathlib
+import threading
+import tracemalloc
+import collections
+import typing as t
+import logging as lg
+
+from . import _specs
+
+logger = lg.getLogger(__name__)
+
+
+class Profiler:
+    """Decision-making profiler, for investigating slow decision tasks.
+
+    Profiled decision tasks have decisions made under ``cProfile`` (and
+    optionally ``tracemalloc``), with the profile saved to the output
+    directory, named with the workflow type and history size. Only the
+    most recent profiles are kept.
+
+    Only one decision task is profiled at a time: tasks decided while
+    another task is being profiled are not profiled.
+
+    Args:
+        directory: profiles output directory
+        sample_rate: fraction of decision tasks to profile
+        threshold: only keep profiles of decision-making taking at least
+            this long (seconds), default: keep all profiles
+        trace_memory: also save a memory allocation snapshot
+        max_files: number of most-recent profiles to keep
+        enabled: initially profile decision tasks, toggle with
+            :meth:`toggle`
+
+    Attributes:
+        enabled (bool): profile decision tasks
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        sample_rate: float = 1.0,
+        threshold: float = None,
+        trace_memory: bool = False,
+        max_files: int = 100,
+        enabled: bool = True,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.trace_memory = trace_memory
+        self.max_files = max_files
+        self.enabled = enabled
+        self._saved = collections.deque()
+        self._n_profiled = 0
+        self._lock = threading.Lock()
+
+    def toggle(self):
+        """Switch decision task profiling on or off."""
+        self.enabled = not self.enabled
+        _fmt = "Decision task profiling %s"
+        logger.log(25, _fmt, "enabled" if self.enabled else "disabled")
+
+    def install_signal_handler(self, signum: int = None):
+        """Toggle profiling on receiving a signal.
+
+        Must be called from the main thread.
+
+        Args:
+            signum: signal number, default: ``SIGUSR1`` (where available)
+        """
+
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+            if signum is None:  # pragma: no cover
+                return
+        signal.signal(signum, lambda *_: self.toggle())
+
+    def make_decisions(
+        self, workflow: _specs.Workflow, task: t.Dict[str, t.Any]
+    ) -> t.List[t.Dict[str, t.Any]]:
+        """Make decisions for decision task, possibly profiling.
+
+        Args:
+            workflow: task's workflow specification
+            task: decision task
+
+        Returns:
+            workflow decisions
+        """
+
+        if not self.enabled or random.random() >= self.sample_rate:
+            return workflow.make_decisions(task)
+        if not self._lock.acquire(blocking=False):  # already profiling
+            return workflow.make_decisions(task)
+        try:
+            return self._make_decisions_profiled(workflow, task)
+        finally:
+            self._lock.release()
+
+    def _make_decisions_profiled(
+        self, workflow: _specs.Workflow, task: t.Dict[str, t.Any]
+    ) -> t.List[t.Dict[str, t.Any]]:
+        profile = cProfile.Profile()
+        snapshot = None
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            return workflow.make_decisions(task)
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - start
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+            if self.threshold is None or duration >= self.threshold:
+                try:
+                    self._save(profile, snapshot, workflow, task, duration)
+                except Exception:
+                    logger.exception("Failed to save decision task profile")
+
+    def _save(
+        self,
+        profile: cProfile.Profile,
+        snapshot: t.Union[tracemalloc.Snapshot, None],
+        workflow: _specs.Workflow,
+        task: t.Dict[str, t.Any],
+        duration: float,
+    ):
+        """Save decision-making profile, removing the oldest profiles."""
+        self._n_profiled += 1
+        n_events = len(task.get("events") or ())
+        stem = "%s-%04d-%s-%s-%devents-%dms" % (
+            time.strftime("%Y%m%dT%H%M%S"),
+            self._n_profiled % 10000,
+            workflow.name,
+            workflow.version,
+            n_events,
+            duration * 1000,
+        )
+        stem = re.sub(r"[^\w.-]", "_", stem)
+        paths = [self.directory / (stem + ".prof")]
+        if snapshot:
+            paths.append(self.directory / (stem + ".tracemalloc"))
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(paths[0]))
+        if snapshot:
+            snapshot.dump(str(paths[1]))
+        _fmt = "Saved profile of decision task '%s' (%.3f s): %s"
+        logger.info(_fmt, task["taskToken"], duration, paths[0])
+
+        self._saved.append(paths)
+        while len(self._saved) > self.max_files:
+            for path in self._saved.popleft():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
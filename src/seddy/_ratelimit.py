@@ -0,0 +1,173 @@
+"""SWF API client-side rate limiting."""
+
+import time
+import threading
+import typing as t
+import logging as lg
+
+logger = lg.getLogger(__name__)
+_throttling_error_codes = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "LimitExceededException",
+}
+_default_budgets = {
+    "poll": (200.0, 1000.0),
+    "respond": (200.0, 1000.0),
+    "list": (5.0, 100.0),
+}
+
+
+class TokenBucket:
+    """Adaptive token-bucket rate limiter, safe to use from multiple threads.
+
+    The rate is halved on each throttled request (down to a minimum), and
+    recovers additively on each successful request.
+
+    Args:
+        rate: maximum (and initial) request rate (requests per second)
+        burst: bucket size: maximum number of requests without waiting
+        min_rate: minimum request rate, default: 1/32 of ``rate``
+        clock: monotonic time function
+        sleep: sleep function
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float = None,
+        clock: t.Callable[[], float] = time.monotonic,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ):
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = rate / 32.0 if min_rate is None else min_rate
+        self.clock = clock
+        self.sleep = sleep
+        self.rate = rate
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        with self._lock:
+            self._refill(self.clock())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+
+    def on_throttle(self):
+        """Decrease the rate after a throttled request."""
+        with self._lock:
+            self._refill(self.clock())
+            self.rate = max(self.min_rate, self.rate / 2.0)
+
+    def on_success(self):
+        """Recover the rate after a successful request."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(self.clock())
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 64.0)
+
+
+class RateLimiter:
+    """SWF client rate limiter, with separate budgets for polling,
+    responding and listing.
+
+    Install on SWF clients with :meth:`install`. Default budgets are 200
+    requests per second (bursting to 1000) for polling and responding, and
+    5 requests per second (bursting to 100) for listing.
+
+    Args:
+        poll: decision task polling budget, default: scaled default budget
+        respond: decision task responding budget, default: scaled default
+            budget
+        list_: listing and description budget, default: scaled default
+            budget
+        scale: default budgets' rate and burst multiplier, eg to share an
+            account's SWF request quota between deciders
+    """
+
+    def __init__(
+        self,
+        poll: TokenBucket = None,
+        respond: TokenBucket = None,
+        list_: TokenBucket = None,
+        scale: float = 1.0,
+    ):
+        if scale <= 0:
+            raise ValueError("rate-limit scale must be positive: %s" % scale)
+        buckets = {"poll": poll, "respond": respond, "list": list_}
+        self.buckets = {}
+        for name, bucket in buckets.items():
+            if not bucket:
+                rate, burst = _default_budgets[name]
+                bucket = TokenBucket(rate * scale, max(1.0, burst * scale))
+            self.buckets[name] = bucket
+
+    def get_bucket(self, operation_name: str) -> t.Union[TokenBucket, None]:
+        """Get the budget of an SWF API operation.
+
+        Args:
+            operation_name: SWF API operation name
+
+        Returns:
+            operation's rate limiter, or ``None`` if unlimited
+        """
+
+        if operation_name.startswith("PollFor"):
+            return self.buckets["poll"]
+        elif operation_name.startswith("Respond"):
+            return self.buckets["respond"]
+        elif operation_name.startswith(("List", "Describe", "Count", "Get")):
+            return self.buckets["list"]
+        return None
+
+    def _before_call(self, model, **_):
+        bucket = self.get_bucket(model.name)
+        if bucket:
+            bucket.acquire()
+
+    def _needs_retry(self, operation, response=None, **_):
+        if response is None:
+            return
+        error_code = response[1].get("Error", {}).get("Code")
+        if error_code in _throttling_error_codes:
+            bucket = self.get_bucket(operation.name)
+            if bucket:
+                _fmt = "Throttled on '%s', reducing request rate to %.3g/s"
+                bucket.on_throttle()
+                logger.warning(_fmt, operation.name, bucket.rate)
+
+    def _after_call(self, model, parsed, **_):
+        if "Error" not in parsed:
+            bucket = self.get_bucket(model.name)
+            if bucket:
+                bucket.on_success()
+
+    def install(self, client):
+        """Rate-limit an SWF client's requests.
+
+        Args:
+            client (botocore.client.BaseClient): SWF client
+        """
+
+        events = client.meta.events
+        events.register("before-call.swf", self._before_call)
+        events.register("needs-retry.swf", self._needs_retry)
+        events.register("after-call.swf", self._after_call)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,97 @@
+"""Decision task recording."""
+
+import json
+import gzip
+import pathlib
+import datetime
+import threading
+import collections.abc
+import typing as t
+import logging as lg
+
+logger = lg.getLogger(__name__)
+
+
+def _json_default(obj: t.Any) -> t.Any:
+    """Serialise decision task values not supported by JSON."""
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    elif isinstance(obj, collections.abc.Sequence):  # eg compact history
+        return list(obj)
+    raise TypeError("Object of type %s is not JSON serializable" % type(obj))
+
+
+class Recorder:
+    """Decision task recorder, writing gzip-compressed JSON-lines.
+
+    Each line has the decision task (without response metadata) and its
+    decisions. Recording stops once the file reaches the maximum size, or
+    on close.
+
+    Args:
+        path: recording file path
+        max_bytes: maximum (compressed) file size
+    """
+
+    def __init__(self, path: pathlib.Path, max_bytes: int = 100 * 1024**2):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._file = None
+        self._raw_file = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        logger.info("Recording decision tasks to '%s'", self.path)
+        self._raw_file = self.path.open("wb")
+        self._file = gzip.GzipFile(fileobj=self._raw_file, mode="wb")
+
+    def record(self, task: t.Dict[str, t.Any], decisions: t.List[t.Dict[str, t.Any]]):
+        """Record decision task and its decisions.
+
+        Args:
+            task: decision task
+            decisions: task's decisions
+        """
+
+        task = {k: v for k, v in task.items() if k != "ResponseMetadata"}
+        line = json.dumps({"task": task, "decisions": decisions}, default=_json_default)
+        with self._lock:
+            if self._stopped:
+                return
+            if self._file is None:
+                self._open()
+            self._file.write(line.encode("utf-8") + b"\n")
+            if self._raw_file.tell() >= self.max_bytes:
+                _fmt = "Decision task recording '%s' is full (%d bytes)"
+                logger.warning(_fmt, self.path, self.max_bytes)
+                self._stopped = True
+                self._close()
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._raw_file.close()
+            self._file = self._raw_file = None
+
+    def close(self):
+        """Finish recording, flushing to file."""
+        with self._lock:
+            self._stopped = True
+            self._close()
+
+
+def load_recording(path: pathlib.Path) -> t.Iterable[t.Dict[str, t.Any]]:
+    """Load decision task recording.
+
+    Args:
+        path: recording file path
+
+    Returns:
+        recorded decision tasks and decisions
+    """
+
+    with gzip.open(str(path), "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
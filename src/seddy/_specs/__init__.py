@@ -3,23 +3,31 @@
 __all__ = [
     "ChildPolicy",
     "Registration",
+    "DecisionConcurrency",
     "DecisionsBuilder",
     "Workflow",
     "make_decisions_on_error",
     "DAGBuilder",
     "DAGWorkflow",
+    "History",
+    "prune_history",
     "load_workflows",
+    "WorkflowsLoader",
     "WORKFLOW",
 ]
 
 from ._base import ChildPolicy
 from ._base import Registration
+from ._base import DecisionConcurrency
 from ._base import DecisionsBuilder
 from ._base import Workflow
 from ._base import make_decisions_on_error
 from ._dag import DAGBuilder
 from ._dag import DAGWorkflow
+from ._history import History
+from ._history import prune_history
 from ._io import load_workflows
+from ._io import WorkflowsLoader
 
 WORKFLOW = {
     DAGWorkflow.spec_type: DAGWorkflow,
@@ -5,6 +5,8 @@ import enum
 import dataclasses
 import typing as t
 
+from .. import _tracing
+
 
 class DeciderError(RuntimeError):
     """Misconfiguration of the decider."""
@@ -73,6 +75,34 @@ class Registration:
         return cls(**kw)
 
 
+@dataclasses.dataclass
+class DecisionConcurrency:
+    """Workflow decision task concurrency configuration.
+
+    Args:
+        max_tasks: maximum number of the workflow's decision tasks being
+            handled at once
+        max_queued: maximum number of the workflow's decision tasks waiting
+            to be handled, default: unlimited
+    """
+
+    max_tasks: int
+    max_queued: int = None
+
+    @classmethod
+    def from_spec(cls, spec: t.Dict[str, t.Any]):
+        """Construct concurrency configuration from specification.
+
+        Args:
+            spec: workflow decision task concurrency specification
+        """
+
+        kw = {"max_tasks": spec["max_tasks"]}
+        if "max_queued" in spec:
+            kw["max_queued"] = spec["max_queued"]
+        return cls(**kw)
+
+
 class DecisionsBuilder(metaclass=abc.ABCMeta):
     """SWF decision builder.
 
@@ -99,9 +129,16 @@ class Workflow(metaclass=abc.ABCMeta):
         name: workflow name
         version: workflow version
         registration: workflow registration configuration
+        decision_concurrency: decision task concurrency configuration
+
+    Attributes:
+        history_attributes (dict[str, tuple[str]]): names of history event
+            attributes used in making decisions, for each event type, or
+            ``None`` for all attributes
     """
 
     _registration_cls = Registration
+    history_attributes = None
 
     def __init__(
         self,
@@ -109,11 +146,13 @@ class Workflow(metaclass=abc.ABCMeta):
         version: str,
         description: str = None,
         registration: Registration = None,
+        decision_concurrency: DecisionConcurrency = None,
     ):
         self.name = name
         self.version = version
         self.description = description
         self.registration = registration
+        self.decision_concurrency = decision_concurrency
 
     @classmethod
     def _args_from_spec(
@@ -136,6 +175,10 @@ class Workflow(metaclass=abc.ABCMeta):
             kwargs["registration"] = cls._registration_cls.from_spec(
                 spec["registration"]
             )
+        if "decision_concurrency" in spec:
+            kwargs["decision_concurrency"] = DecisionConcurrency.from_spec(
+                spec["decision_concurrency"]
+            )
         return args, kwargs
 
     @classmethod
@@ -175,8 +218,11 @@ class Workflow(metaclass=abc.ABCMeta):
             workflow decisions
         """
 
-        builder = self.decisions_builder(self, task)
-        builder.build_decisions()
+        n_events = len(task.get("events") or ())
+        with _tracing.tracer.span("build_decisions", n_events=n_events) as span:
+            builder = self.decisions_builder(self, task)
+            builder.build_decisions()
+            span.set_attribute("n_decisions", len(builder.decisions))
         return builder.decisions
 
 
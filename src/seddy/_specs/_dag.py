@@ -1,12 +1,16 @@
 """SWF decisions making."""
 
+import sys
 import json
+import math
+import types
 import string
 import dataclasses
 import typing as t
 import logging as lg
 
 from . import _base
+from .. import _tracing
 
 logger = lg.getLogger(__name__)
 _jsonpath_characters = string.digits + string.ascii_letters + "_"
@@ -73,7 +77,6 @@ _error_events = {
     "CancelTimerFailed",
     "CancelWorkflowExecutionFailed",
     "CompleteWorkflowExecutionFailed",
-    "DecisionTaskTimedOut",
     "FailWorkflowExecutionFailed",
     "RecordMarkerFailed",
     "RequestCancelActivityTaskFailed",
@@ -81,13 +84,26 @@ _error_events = {
     "StartTimerFailed",
     "WorkflowExecutionCancelRequested",
 }
-_activity_events = {
-    "ActivityTaskCompleted",
-    "ActivityTaskFailed",
-    "ActivityTaskTimedOut",
-    "ActivityTaskScheduled",
-    "ActivityTaskStarted",
+_in_flight_events = {"ActivityTaskScheduled", "ActivityTaskStarted"}
+_child_workflow_activity_events = {
+    "ChildWorkflowExecutionStarted": "ActivityTaskStarted",
+    "ChildWorkflowExecutionCompleted": "ActivityTaskCompleted",
+    "ChildWorkflowExecutionFailed": "ActivityTaskFailed",
+    "ChildWorkflowExecutionTimedOut": "ActivityTaskFailed",
+    "ChildWorkflowExecutionCanceled": "ActivityTaskFailed",
+    "ChildWorkflowExecutionTerminated": "ActivityTaskFailed",
 }
+_child_workflow_inherited_attributes = (
+    "taskList",
+    "executionStartToCloseTimeout",
+    "taskStartToCloseTimeout",
+)
+_continued_inherited_attributes = _child_workflow_inherited_attributes + (
+    "childPolicy",
+)
+_partition_input_key = "seddy_partition"
+_continued_input_key = "seddy_continued"
+_max_input_length = 32768  # SWF execution input limit
 _decision_failed_events = {
     "ScheduleActivityTaskFailed",
     "RequestCancelActivityTaskFailed",
@@ -103,8 +119,49 @@ _decision_failed_events = {
 }
 
 
+def _intern(value):
+    """Intern value if it's a string, sharing equal strings across specs."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _add_slots(cls: type) -> type:
+    """Recreate dataclass with ``__slots__``, so instances have no ``__dict__``.
+
+    Base classes must also define ``__slots__`` for instances to be
+    compact.
+
+    Args:
+        cls: dataclass to recreate
+
+    Returns:
+        slotted dataclass
+    """
+
+    cls_dict = dict(cls.__dict__)
+    annotations = cls_dict.get("__annotations__", {})
+    field_names = tuple(
+        f.name for f in dataclasses.fields(cls) if f.name in annotations
+    )
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+    # Fix zero-argument 'super()' references to the original class
+    for value in cls_dict.values():
+        value = getattr(value, "__func__", value)
+        for cell in getattr(value, "__closure__", None) or ():
+            if cell.cell_contents is cls:
+                cell.cell_contents = new_cls
+    return new_cls
+
+
 @dataclasses.dataclass
 class TaskInput:
+    __slots__ = ()
+
     @staticmethod
     def from_spec(spec: t.Dict[str, t.Any]) -> "TaskInput":
         for cls in [NoInput, Constant, WorkflowInput, DependencyResult, Object]:
@@ -115,6 +172,7 @@ class TaskInput:
         return cls.from_spec(spec)
 
 
+@_add_slots
 @dataclasses.dataclass
 class NoInput(TaskInput):
     type: t.ClassVar = "none"
@@ -124,6 +182,7 @@ class NoInput(TaskInput):
         return cls()
 
 
+@_add_slots
 @dataclasses.dataclass
 class Constant(TaskInput):
     type: t.ClassVar = "constant"
@@ -134,6 +193,7 @@ class Constant(TaskInput):
         return cls(spec["value"])
 
 
+@_add_slots
 @dataclasses.dataclass
 class WorkflowInput(TaskInput):
     type: t.ClassVar = "workflow-input"
@@ -147,6 +207,7 @@ class WorkflowInput(TaskInput):
         return cls(**kwargs)
 
 
+@_add_slots
 @dataclasses.dataclass
 class DependencyResult(TaskInput):
     type: t.ClassVar = "dependency-result"
@@ -158,9 +219,10 @@ class DependencyResult(TaskInput):
         kwargs = {}
         if "path" in spec:
             kwargs["path"] = spec["path"]
-        return cls(spec["id"], **kwargs)
+        return cls(_intern(spec["id"]), **kwargs)
 
 
+@_add_slots
 @dataclasses.dataclass
 class Object(TaskInput):
     type: t.ClassVar = "object"
@@ -170,10 +232,11 @@ class Object(TaskInput):
     def from_spec(cls, spec) -> "Object":
         items = {}
         for key, subspec in spec["items"].items():
-            items[key] = cls.from_spec(subspec)
+            items[_intern(key)] = cls.from_spec(subspec)
         return cls(items)
 
 
+@_add_slots
 @dataclasses.dataclass
 class Task:  # TODO: unit-test
     """DAG-type workflow activity task specification.
@@ -189,6 +252,10 @@ class Task:  # TODO: unit-test
         task_list: task-list to schedule task on
         priority: task priority
         dependencies: IDs of task’s dependencies
+        duration: estimated task duration (seconds), for critical-path
+            prioritisation
+        batch_size: maximum number of tasks coalesced into one activity
+            task, default: don't coalesce
     """
 
     id: str
@@ -200,12 +267,53 @@ class Task:  # TODO: unit-test
     task_list: str = None
     priority: int = None
     dependencies: t.List[str] = None
+    duration: float = None
+    batch_size: int = None
+    _type: t.Mapping[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    decision_template: t.Mapping[str, t.Any] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
     _input_cls: t.ClassVar = TaskInput
 
+    def __post_init__(self):
+        self.id = _intern(self.id)
+        self.name = _intern(self.name)
+        self.version = _intern(self.version)
+        self.task_list = _intern(self.task_list)
+        self._type = types.MappingProxyType(
+            {"name": self.name, "version": self.version}
+        )
+        self.decision_template = None
+
+    def build_decision_template(self, default_priority: int = None):
+        """Build the fixed schedule-activity-task decision attributes.
+
+        Scheduling only needs to add the activity ID and input to a copy
+        (see ``_copy_decision_template``) of ``decision_template``, which
+        is read-only down to its nested attributes.
+
+        Args:
+            default_priority: task priority if not specified
+        """
+
+        attributes = {"activityType": self._type}
+        if self.heartbeat is not None:
+            attributes["heartbeatTimeout"] = str(self.heartbeat)
+        if self.timeout is not None:
+            attributes["startToCloseTimeout"] = str(self.timeout)
+        if self.task_list is not None:
+            attributes["taskList"] = types.MappingProxyType({"name": self.task_list})
+        priority = self.priority if self.priority is not None else default_priority
+        if priority is not None:
+            attributes["taskPriority"] = str(priority)
+        self.decision_template = types.MappingProxyType(attributes)
+
     @property
-    def type(self) -> t.Dict[str, str]:
-        """Activity type."""
-        return {"name": self.name, "version": self.version}
+    def type(self) -> t.Mapping[str, str]:
+        """Activity type (read-only)."""
+        return self._type
 
     @classmethod
     def from_spec(cls, spec: t.Dict[str, t.Any]) -> "Task":
@@ -229,12 +337,178 @@ class Task:  # TODO: unit-test
             kwargs["priority"] = spec["priority"]
         if "dependencies" in spec:
             kwargs["dependencies"] = spec["dependencies"]
+        if "duration" in spec:
+            kwargs["duration"] = spec["duration"]
+        if "batch_size" in spec:
+            kwargs["batch_size"] = spec["batch_size"]
         return cls(*args, **kwargs)
 
+    @property
+    def batch_key(self) -> t.Tuple:
+        """Scheduling attributes shared by tasks coalesced together."""
+        return (
+            self.name,
+            self.version,
+            self.task_list,
+            self.heartbeat,
+            self.timeout,
+            self.decision_template.get("taskPriority"),
+            self.batch_size,
+        )
+
+
+@_add_slots
+@dataclasses.dataclass
+class MapTask(Task):
+    """DAG-type workflow map task specification: an activity task for each
+    item (or chunk of items) of the task's input array.
 
-def _get(item_id, items, id_key):
-    """Get item from list with given ID."""
-    return next(item for item in items if item[id_key] == item_id)
+    Item activity IDs are the task ID followed by the item (or chunk)
+    index, eg ``foo[0]``. The task's result (passed to dependants) is the
+    array of its items' results, with chunk results concatenated.
+
+    Args:
+        chunk_size: number of items in each activity task's input array,
+            default: input each item (not in an array)
+        max_parallelism: maximum number of the task's activity tasks
+            scheduled or running at once, default: unlimited
+    """
+
+    chunk_size: int = None
+    max_parallelism: int = None
+
+    def get_item_id(self, index: int) -> str:
+        """Get activity ID of item (or chunk).
+
+        Args:
+            index: item (or chunk) index
+        """
+
+        return "%s[%d]" % (self.id, index)
+
+    def split_input(self, input_: t.Any) -> t.List[t.Any]:
+        """Split task input into activity tasks' inputs.
+
+        Args:
+            input_: task input array
+
+        Returns:
+            activity tasks' inputs: items, or chunks of items
+        """
+
+        if not isinstance(input_, list):
+            raise _base.DeciderError("Map task '%s' input is not an array" % self.id)
+        if self.chunk_size is None:
+            return input_
+        size = self.chunk_size
+        return [input_[j : j + size] for j in range(0, len(input_), size)]
+
+    def gather_results(self, results: t.List[t.Any]) -> t.List[t.Any]:
+        """Gather activity tasks' results into the task's result.
+
+        Args:
+            results: activity tasks' results, in item (or chunk) order
+
+        Returns:
+            item results
+        """
+
+        if self.chunk_size is None:
+            return results
+        gathered = []
+        for result in results:
+            if isinstance(result, list):
+                gathered.extend(result)
+            else:
+                gathered.append(result)
+        return gathered
+
+    @classmethod
+    def from_spec(cls, spec: t.Dict[str, t.Any]) -> "MapTask":
+        task = super().from_spec(spec)
+        map_spec = spec["map"] or {}
+        if "chunk_size" in map_spec:
+            task.chunk_size = map_spec["chunk_size"]
+        if "max_parallelism" in map_spec:
+            task.max_parallelism = map_spec["max_parallelism"]
+        return task
+
+
+@_add_slots
+@dataclasses.dataclass
+class PartitionTask(Task):
+    """Partitioned DAG-type workflow partition: a child workflow execution
+    (of the same workflow type) running some of the workflow's tasks.
+
+    Args:
+        index: partition index
+        workflow: workflow of the partition's tasks
+        external_dependencies: IDs of other partitions' tasks which the
+            partition's tasks depend on
+    """
+
+    index: int = None
+    workflow: "DAGWorkflow" = dataclasses.field(default=None, repr=False, compare=False)
+    external_dependencies: t.List[str] = None
+
+    def build_decision_template(self, default_priority: int = None):
+        """Build the fixed start-child-workflow-execution decision
+        attributes.
+
+        Args:
+            default_priority: ignored
+        """
+
+        attributes = {"workflowType": self._type, "childPolicy": "TERMINATE"}
+        self.decision_template = types.MappingProxyType(attributes)
+
+
+@dataclasses.dataclass
+class ContinueAsNew:
+    """DAG-type workflow continue-as-new configuration.
+
+    Args:
+        max_events: continue as a new execution once the history has at
+            least this many events
+        max_bytes: continue as a new execution once the activity task
+            results in the history total at least this many characters;
+            must be well under SWF's 32768-character input limit, as the
+            results are carried in the new execution's input
+    """
+
+    max_events: int = None
+    max_bytes: int = None
+
+    @classmethod
+    def from_spec(cls, spec: t.Dict[str, t.Any]):
+        """Construct continue-as-new configuration from specification.
+
+        Args:
+            spec: continue-as-new configuration specification
+        """
+
+        kw = {}
+        if "max_events" in spec:
+            kw["max_events"] = spec["max_events"]
+        if "max_bytes" in spec:
+            kw["max_bytes"] = spec["max_bytes"]
+        return cls(**kw)
+
+
+def _copy_decision_template(task: Task) -> t.Dict[str, t.Any]:
+    """Copy a task's decision template into mutable decision attributes.
+
+    Args:
+        task: task with built decision template
+
+    Returns:
+        decision attributes, sharing no mutable state with the template
+    """
+
+    return {
+        k: dict(v) if isinstance(v, types.MappingProxyType) else v
+        for k, v in task.decision_template.items()
+    }
 
 
 def _get_item_jsonpath(path: str, obj) -> t.Any:
@@ -310,8 +584,7 @@ def _build_activity_input(
         activity task input
     """
 
-    input_spec = input_spec or NoInput()
-    if isinstance(input_spec, NoInput):
+    if input_spec is None or isinstance(input_spec, NoInput):
         return _sentinel
     if isinstance(input_spec, Constant):
         return input_spec.value
@@ -339,46 +612,117 @@ class DAGBuilder(_base.DecisionsBuilder):
     def __init__(self, workflow: "DAGWorkflow", task):
         super().__init__(workflow, task)
         self.workflow = workflow
+        self._workflow_input = _sentinel
+        self._activity_results = None
         self._scheduled = {}
-        self._activity_task_events = {at.id: [] for at in workflow.task_specs}
-        self._new_events = None
+        self._latest_activity_task_events = {}
+        self._decision_task_events = {}
+        self._n_dependencies_completed = {}
+        self._n_completed = 0
+        self._new_events = []
         self._error_events = []
-        self._ready_activities = set()
+        self._ready_activities = {}  # ordered set, for deterministic decisions
+        self._map_items = {}
+        self._map_next_items = {}
+        self._n_map_items_completed = {}
+        self._map_results = {}
+        self._batches = {}
+        self._n_carried = 0
+        self._n_result_bytes = 0
+
+    def _get_workflow_input(self) -> t.Any:
+        """Get (and cache) the deserialised workflow execution input."""
+        if self._workflow_input is _sentinel:
+            workflow_started_event = self.task["events"][0]
+            assert workflow_started_event["eventType"] == "WorkflowExecutionStarted"
+            attrs = workflow_started_event["workflowExecutionStartedEventAttributes"]
+            self._workflow_input = json.loads(attrs.get("input", "null"))
+        return self._workflow_input
+
+    def _get_activity_results(self) -> t.Dict[str, t.Any]:
+        """Get (and cache) the deserialised results of completed activities."""
+        if self._activity_results is None:
+            self._activity_results = {}
+            task_specs_by_id = self.workflow.task_specs_by_id
+            for activity_task_id, event in self._latest_activity_task_events.items():
+                if event["eventType"] != "ActivityTaskCompleted":
+                    continue
+                if activity_task_id not in task_specs_by_id:  # map task item
+                    continue
+                attrs = event.get("activityTaskCompletedEventAttributes", {})
+                if "result" in attrs:
+                    result = json.loads(attrs["result"])
+                    self._activity_results[activity_task_id] = result
+        return self._activity_results
+
+    def _get_map_task_id(self, activity_id: str) -> t.Union[str, None]:
+        """Get ID of activity's map task.
 
-    def _schedule_task(self, activity_task: Task):
-        workflow_started_event = self.task["events"][0]
-        assert workflow_started_event["eventType"] == "WorkflowExecutionStarted"
-        attrs = workflow_started_event["workflowExecutionStartedEventAttributes"]
-        decision_attributes = {
-            "activityId": activity_task.id,
-            "activityType": activity_task.type,
-        }
+        Args:
+            activity_id: activity task ID
 
-        # Build input
-        input_spec = activity_task.input
-        workflow_input = json.loads(attrs.get("input", "null"))
-        activity_results = {}
-        for activity_task_id, events in self._activity_task_events.items():
-            if activity_task_id in (activity_task.dependencies or []):
-                assert events[-1]["eventType"] == "ActivityTaskCompleted"
-            elif not events or events[-1]["eventType"] != "ActivityTaskCompleted":
+        Returns:
+            map task ID, or ``None`` if not a map task item
+        """
+
+        if activity_id in self.workflow.task_specs_by_id:
+            return None
+        map_task_id, _, _ = activity_id.rpartition("[")
+        return map_task_id if map_task_id in self.workflow.map_tasks else None
+
+    def _scan_map_item(self, map_task_id: str, activity_id: str):
+        """Advance map task's next-item cursor past a scheduled item.
+
+        A map task's items are scheduled in order, so all items before the
+        cursor have been scheduled, and none after.
+        """
+
+        index = int(activity_id[len(map_task_id) + 1 : -1])
+        if index >= self._map_next_items.get(map_task_id, 0):
+            self._map_next_items[map_task_id] = index + 1
+
+    def _is_ready(self, activity_task: Task) -> bool:
+        """Check if all of the task's dependencies have completed."""
+        n_completed = self._n_dependencies_completed.get(activity_task.id, 0)
+        return n_completed == self.workflow.dependency_counts[activity_task.id]
+
+    def _build_task_input(self, activity_task: Task) -> t.Any:
+        for dependency_activity_task_id in activity_task.dependencies or []:
+            if dependency_activity_task_id in self._map_results:
                 continue
-            d_attrs = events[-1].get("activityTaskCompletedEventAttributes", {})
-            if "result" in d_attrs:
-                activity_results[activity_task_id] = json.loads(d_attrs["result"])
-        input_ = _build_activity_input(input_spec, workflow_input, activity_results)
+            event = self._latest_activity_task_events[dependency_activity_task_id]
+            assert event["eventType"] == "ActivityTaskCompleted"
+        input_spec = activity_task.input
+        workflow_input = self._get_workflow_input()
+        activity_results = self._get_activity_results()
+        return _build_activity_input(input_spec, workflow_input, activity_results)
+
+    def _get_map_items(self, map_task: MapTask) -> t.List[t.Any]:
+        """Get (and cache) the inputs of a ready map task's activity tasks."""
+        if map_task.id not in self._map_items:
+            input_ = self._build_task_input(map_task)
+            if input_ is _sentinel:
+                input_ = None
+            self._map_items[map_task.id] = map_task.split_input(input_)
+        return self._map_items[map_task.id]
+
+    def _schedule_task(self, activity_task: Task):
+        input_ = self._build_task_input(activity_task)
+        self._add_schedule_decision(activity_task, activity_task.id, input_)
+
+    def _add_schedule_decision(
+        self,
+        activity_task: Task,
+        activity_id: str,
+        input_: t.Any = _sentinel,
+        control: str = None,
+    ):
+        decision_attributes = _copy_decision_template(activity_task)
+        decision_attributes["activityId"] = activity_id
         if input_ is not _sentinel:
             decision_attributes["input"] = json.dumps(input_)
-
-        # Set other attributes
-        if activity_task.heartbeat is not None:
-            decision_attributes["heartbeatTimeout"] = str(activity_task.heartbeat)
-        if activity_task.timeout is not None:
-            decision_attributes["startToCloseTimeout"] = str(activity_task.timeout)
-        if activity_task.task_list is not None:
-            decision_attributes["taskList"] = {"name": activity_task.task_list}
-        if activity_task.priority is not None:
-            decision_attributes["taskPriority"] = str(activity_task.priority)
+        if control is not None:
+            decision_attributes["control"] = control
 
         decision = {
             "decisionType": "ScheduleActivityTask",
@@ -386,56 +730,30 @@ class DAGBuilder(_base.DecisionsBuilder):
         }
         self.decisions.append(decision)
 
-    def _get_scheduled_references(self):
-        for event in self.task["events"]:
-            if event["eventType"] in _activity_events:
-                if event["eventType"] == "ActivityTaskScheduled":
-                    self._scheduled[event["eventId"]] = event
-                else:
-                    attrs = event[_attr_keys[event["eventType"]]]
-                    self._scheduled[event["eventId"]] = _get(
-                        attrs["scheduledEventId"], self.task["events"], "eventId"
-                    )
-
-    def _get_activity_task_events(self):
-        for event in self.task["events"]:
-            if event["eventType"] in _activity_events:
-                scheduled_event = self._scheduled[event["eventId"]]
-                attrs = scheduled_event["activityTaskScheduledEventAttributes"]
-                self._activity_task_events[attrs["activityId"]].append(event)
-
     def _process_activity_task_completed_event(self, event: t.Dict[str, t.Any]):
-        scheduled_event = self._scheduled[event["eventId"]]
-        attrs = scheduled_event["activityTaskScheduledEventAttributes"]
-        dependants_task = self.workflow.dependants[attrs["activityId"]]
+        attrs = event["activityTaskCompletedEventAttributes"]
+        activity_id = self._scheduled[attrs["scheduledEventId"]]
+        dependants_task = self.workflow.dependants[activity_id]
+        dependency_counts = self.workflow.dependency_counts
 
         for activity_task_id in dependants_task:
-            assert not self._activity_task_events[activity_task_id]
-            task = next(a for a in self.workflow.task_specs if a.id == activity_task_id)
-
-            dependencies_satisfied = True
-            for dependency_activity_task_id in task.dependencies:
-                events = self._activity_task_events[dependency_activity_task_id]
-                if not events or events[-1]["eventType"] != "ActivityTaskCompleted":
-                    dependencies_satisfied = False
-                    break
-            if dependencies_satisfied:
-                self._ready_activities.add(task.id)
+            assert activity_task_id not in self._latest_activity_task_events
+            n_completed = self._n_dependencies_completed[activity_task_id]
+            if n_completed == dependency_counts[activity_task_id]:
+                self._ready_activities[activity_task_id] = None
 
     def _complete_workflow(self):
-        tasks_complete = True
-        for events in self._activity_task_events.values():
-            if not events or events[-1]["eventType"] != "ActivityTaskCompleted":
-                tasks_complete = False
-                break
-
-        if tasks_complete:
+        if self._n_completed == len(self.workflow.task_specs):
             result = {}
-            for activity_id, events in self._activity_task_events.items():
-                assert events and events[-1]["eventType"] == "ActivityTaskCompleted"
-                attrs = events[-1].get("activityTaskCompletedEventAttributes")
+            for activity_task in self.workflow.task_specs:
+                if activity_task.id in self._map_results:
+                    result[activity_task.id] = self._map_results[activity_task.id]
+                    continue
+                event = self._latest_activity_task_events.get(activity_task.id)
+                assert event and event["eventType"] == "ActivityTaskCompleted"
+                attrs = event.get("activityTaskCompletedEventAttributes")
                 if attrs and "result" in attrs:
-                    result[activity_id] = json.loads(attrs["result"])
+                    result[activity_task.id] = json.loads(attrs["result"])
 
             decision = {"decisionType": "CompleteWorkflowExecution"}
             if result:
@@ -455,14 +773,11 @@ class DAGBuilder(_base.DecisionsBuilder):
         self.decisions = [decision]
 
     def _process_decision_failed(self, event: t.Dict[str, t.Any]) -> bool:
-        event_ids = [event["eventId"] for event in self.task["events"]]
         attrs = event[_attr_keys[event["eventType"]]]
         if attrs["cause"] == "OPERATION_NOT_PERMITTED":
-            idx = event_ids.index(attrs["DecisionTaskCompletedEventId"])
-            dc_event = self.task["events"][idx]
+            dc_event = self._decision_task_events[attrs["DecisionTaskCompletedEventId"]]
             dc_attrs = dc_event["decisionTaskCompletedEventAttributes"]
-            idx = event_ids.index(dc_attrs["startedEventId"])
-            ds_event = self.task["events"][idx]
+            ds_event = self._decision_task_events[dc_attrs["startedEventId"]]
             ds_attrs = ds_event["decisionTaskStartedEventAttributes"]
             this_ds_event = self.task["events"][-1]
             this_ds_attrs = this_ds_event["decisionTaskStartedEventAttributes"]
@@ -484,7 +799,7 @@ class DAGBuilder(_base.DecisionsBuilder):
 
     def _schedule_initial_activity_tasks(self):
         for task_id in self.workflow.dependants[None]:
-            self._ready_activities.add(task_id)
+            self._ready_activities[task_id] = None
 
     def _process_error_events(self):
         if not self._error_events:
@@ -509,10 +824,7 @@ class DAGBuilder(_base.DecisionsBuilder):
                 if self._process_decision_failed(event):
                     return True
                 decider_events.append(event)
-            elif event["eventType"] in (
-                "DecisionTaskTimedOut",
-                "WorkflowExecutionTimedOut",
-            ):
+            elif event["eventType"] == "WorkflowExecutionTimedOut":
                 time_out_events.append(event)
             elif event["eventType"] == "RecordMarkerFailed":
                 other_events.append(event)
@@ -536,49 +848,573 @@ class DAGBuilder(_base.DecisionsBuilder):
         elif event["eventType"] == "WorkflowExecutionStarted":
             self._schedule_initial_activity_tasks()
 
-    def _get_new_events(self):
-        event_ids = [event["eventId"] for event in self.task["events"]]
-        current_idx = event_ids.index(self.task["startedEventId"])
-        previous_idx = -1
-        if self.task["previousStartedEventId"] in event_ids:
-            previous_idx = event_ids.index(self.task["previousStartedEventId"])
-        events = self.task["events"][previous_idx + 1 : current_idx + 1]
-        logger.debug(
-            "Processing %d events from index %d (ID: %s) to %d (ID: %s)",
-            len(events),
-            previous_idx + 1,
-            events[0]["eventId"],
-            current_idx,
-            events[-1]["eventId"],
-        )
-        self._new_events = events
-
     def _schedule_tasks(self):
+        workflow = self.workflow
+        if (
+            workflow.is_concurrency_limited
+            or workflow.map_tasks
+            or workflow.is_batched
+            or self._n_carried
+        ):
+            self._schedule_ready_tasks()
+            return
         for task_id in self._ready_activities:
-            task = next(ts for ts in self.workflow.task_specs if ts.id == task_id)
-            assert not self._activity_task_events[task.id]
+            task = self.workflow.task_specs_by_id[task_id]
+            assert task.id not in self._latest_activity_task_events
             self._schedule_task(task)
 
+    def _schedule_ready_tasks(self):
+        """Schedule ready tasks and map task items, up to the workflow's
+        concurrency limits.
+
+        All unscheduled tasks with completed dependencies are ready (not
+        just those made ready by new events), as some may have been held
+        back by a previous decision. Tasks are scheduled in order of
+        priority, then specification. Inputs are only built for the tasks
+        within the limits.
+        """
+
+        workflow = self.workflow
+        max_concurrency = workflow.max_concurrency
+        task_list_max_concurrency = workflow.task_list_max_concurrency or {}
+
+        n_in_flight = 0
+        n_task_list_in_flight = {}
+        n_map_task_in_flight = {}
+        in_flight_event_ids = set()
+        for activity_id, event in self._latest_activity_task_events.items():
+            if event["eventType"] in _in_flight_events:
+                if workflow.is_batched:  # count each batch once, by its tasks
+                    if activity_id in self._batches:
+                        continue
+                    if event["eventId"] in in_flight_event_ids:
+                        continue
+                    in_flight_event_ids.add(event["eventId"])
+                map_task_id = workflow.map_tasks and self._get_map_task_id(activity_id)
+                task = workflow.task_specs_by_id[map_task_id or activity_id]
+                n_in_flight += 1
+                n = n_task_list_in_flight.get(task.task_list, 0)
+                n_task_list_in_flight[task.task_list] = n + 1
+                if map_task_id:
+                    n = n_map_task_in_flight.get(map_task_id, 0)
+                    n_map_task_in_flight[map_task_id] = n + 1
+        if max_concurrency is not None and n_in_flight >= max_concurrency:
+            return
+
+        ready = []  # task, activity ID, map task item, batch tasks
+        for task in workflow.task_specs:
+            if task.id in self._map_results or not self._is_ready(task):
+                continue
+            if task.id not in workflow.map_tasks:
+                if task.id not in self._latest_activity_task_events:
+                    ready.append((task, task.id, None, None))
+                continue
+            items = self._get_map_items(task)
+            start = self._map_next_items.get(task.id, 0)
+            stop = len(items)
+            if task.max_parallelism is not None:
+                n_map_in_flight = n_map_task_in_flight.get(task.id, 0)
+                stop = min(stop, start + task.max_parallelism - n_map_in_flight)
+            for j in range(start, stop):
+                ready.append((task, task.get_item_id(j), items[j], None))
+
+        ready.sort(key=lambda r: -int(r[0].decision_template.get("taskPriority", 0)))
+        if workflow.is_batched:
+            ready = self._coalesce_ready_tasks(ready)
+        for task, activity_id, item, batch_tasks in ready:
+            if max_concurrency is not None and n_in_flight >= max_concurrency:
+                break
+            n = n_task_list_in_flight.get(task.task_list, 0)
+            task_list_limit = task_list_max_concurrency.get(task.task_list)
+            if task_list_limit is not None and n >= task_list_limit:
+                continue
+            if batch_tasks:
+                inputs = [self._build_task_input(t) for t in batch_tasks]
+                input_ = [None if i is _sentinel else i for i in inputs]
+                control = json.dumps({"batch": [t.id for t in batch_tasks]})
+                self._add_schedule_decision(task, activity_id, input_, control)
+            elif task.id in workflow.map_tasks:
+                self._add_schedule_decision(task, activity_id, item)
+            else:
+                self._schedule_task(task)
+            n_in_flight += 1
+            n_task_list_in_flight[task.task_list] = n + 1
+
+    def _coalesce_ready_tasks(
+        self, ready: t.List[t.Tuple[Task, str, t.Any, None]]
+    ) -> t.List[t.Tuple[Task, str, t.Any, t.Union[t.List[Task], None]]]:
+        """Coalesce ready batched tasks into batch activity tasks.
+
+        Ready tasks with the same batch key (see :attr:`Task.batch_key`)
+        are coalesced, in order, up to the batch size. A batch activity
+        task's input is the array of its tasks' inputs, and its control
+        data lists its tasks' IDs. A lone ready task is a batch of one, so
+        its activity always takes an array.
+
+        Args:
+            ready: ready tasks, with activity IDs and map task items
+
+        Returns:
+            ready tasks and batches, with activity IDs, map task items and
+                batches' tasks
+        """
+
+        coalesced = []  # task, activity ID, item, batch tasks; or batch
+        batches = {}
+        for task, activity_id, item, batch_tasks in ready:
+            if task.batch_size is None or task.id in self.workflow.map_tasks:
+                coalesced.append((task, activity_id, item, batch_tasks))
+                continue
+            batch = batches.get(task.batch_key)
+            if batch is None or len(batch) >= task.batch_size:
+                batch = batches[task.batch_key] = []
+                coalesced.append(batch)
+            batch.append(task)
+
+        for j, item in enumerate(coalesced):
+            if isinstance(item, list):
+                activity_id = "%s+%d" % (item[0].id, len(item))
+                coalesced[j] = (item[0], activity_id, None, item)
+        return coalesced
+
+    def _scan_activity_task_scheduled(self, event, is_new):
+        attrs = event["activityTaskScheduledEventAttributes"]
+        self._scheduled[event["eventId"]] = attrs["activityId"]
+        self._latest_activity_task_events[attrs["activityId"]] = event
+        if self.workflow.map_tasks:
+            map_task_id = self._get_map_task_id(attrs["activityId"])
+            if map_task_id:
+                self._scan_map_item(map_task_id, attrs["activityId"])
+        if self.workflow.is_batched and attrs.get("control"):
+            task_ids = json.loads(attrs["control"]).get("batch")
+            if task_ids:
+                self._batches[attrs["activityId"]] = task_ids
+                for activity_task_id in task_ids:
+                    self._latest_activity_task_events[activity_task_id] = event
+
+    def _scan_activity_task_event(self, event, is_new):
+        attrs = event[_attr_keys[event["eventType"]]]
+        activity_id = self._scheduled[attrs["scheduledEventId"]]
+        self._latest_activity_task_events[activity_id] = event
+        for activity_task_id in self._batches.get(activity_id, ()):
+            self._latest_activity_task_events[activity_task_id] = event
+
+    def _scan_batch_completed(self, event: t.Dict[str, t.Any], activity_id: str):
+        """Split batch activity task's result into its tasks' completions."""
+        task_ids = self._batches[activity_id]
+        attrs = event["activityTaskCompletedEventAttributes"]
+        results = json.loads(attrs["result"]) if "result" in attrs else None
+        if not isinstance(results, list) or len(results) != len(task_ids):
+            _fmt = "Batch activity '%s' result is not an array of %d results"
+            raise _base.DeciderError(_fmt % (activity_id, len(task_ids)))
+        for activity_task_id, result in zip(task_ids, results):
+            task_event = {
+                "eventId": event["eventId"],
+                "eventType": "ActivityTaskCompleted",
+                "activityTaskCompletedEventAttributes": {
+                    "scheduledEventId": attrs["scheduledEventId"],
+                    "result": json.dumps(result),
+                },
+            }
+            self._latest_activity_task_events[activity_task_id] = task_event
+            self._n_completed += 1
+            n_dependencies_completed = self._n_dependencies_completed
+            for dependant_id in self.workflow.dependants[activity_task_id]:
+                n = n_dependencies_completed.get(dependant_id, 0)
+                n_dependencies_completed[dependant_id] = n + 1
+
+    def _scan_activity_task_completed(self, event, is_new):
+        attrs = event["activityTaskCompletedEventAttributes"]
+        activity_id = self._scheduled[attrs["scheduledEventId"]]
+        self._latest_activity_task_events[activity_id] = event
+        self._n_result_bytes += len(attrs.get("result", ""))
+        if activity_id in self._batches:
+            self._scan_batch_completed(event, activity_id)
+            return  # batched tasks are scheduled from all ready tasks
+        map_task_id = self.workflow.map_tasks and self._get_map_task_id(activity_id)
+        if map_task_id:  # map task completion is found after scanning
+            self._scan_map_item(map_task_id, activity_id)  # may be carried
+            n = self._n_map_items_completed.get(map_task_id, 0)
+            self._n_map_items_completed[map_task_id] = n + 1
+            return
+        self._n_completed += 1
+        n_dependencies_completed = self._n_dependencies_completed
+        for dependant_id in self.workflow.dependants[activity_id]:
+            n = n_dependencies_completed.get(dependant_id, 0)
+            n_dependencies_completed[dependant_id] = n + 1
+        if is_new:
+            self._new_events.append(event)
+
+    def _scan_activity_task_error(self, event, is_new):
+        self._scan_activity_task_event(event, is_new)
+        if is_new:
+            self._error_events.append(event)
+
+    def _scan_error_event(self, event, is_new):
+        if is_new:
+            self._error_events.append(event)
+
+    def _scan_decision_task_event(self, event, is_new):
+        self._decision_task_events[event["eventId"]] = event
+
+    def _scan_continue_as_new_failed(self, event, is_new):
+        attrs = event["continueAsNewWorkflowExecutionFailedEventAttributes"]
+        if attrs["cause"] != "UNHANDLED_DECISION":  # otherwise decide again
+            self._scan_error_event(event, is_new)
+
+    def _scan_workflow_execution_started(self, event, is_new):
+        if self.workflow.continue_as_new is not None:
+            input_ = self._get_workflow_input()
+            if isinstance(input_, dict) and _continued_input_key in input_:
+                self._restore_progress(input_[_continued_input_key])
+        if is_new:
+            self._new_events.append(event)
+
+    _scan_handlers = dict.fromkeys(_error_events, _scan_error_event)
+    _scan_handlers.update(
+        {
+            "ActivityTaskScheduled": _scan_activity_task_scheduled,
+            "ActivityTaskStarted": _scan_activity_task_event,
+            "ActivityTaskCompleted": _scan_activity_task_completed,
+            "ActivityTaskFailed": _scan_activity_task_error,
+            "ActivityTaskTimedOut": _scan_activity_task_error,
+            "DecisionTaskCompleted": _scan_decision_task_event,
+            "DecisionTaskStarted": _scan_decision_task_event,
+            "WorkflowExecutionStarted": _scan_workflow_execution_started,
+            "ContinueAsNewWorkflowExecutionFailed": _scan_continue_as_new_failed,
+        }
+    )
+
+    def _restore_progress(self, progress: t.Dict[str, t.Any]):
+        """Restore the progress carried from the previous execution.
+
+        Carried activity tasks are completed as if by (old) history
+        events, with scheduled-event IDs below 1.
+        """
+
+        self._workflow_input = progress["input"]
+        results = progress["results"]
+        for j, activity_id in enumerate(progress["completed"]):
+            scheduled_event_id = -j
+            self._scheduled[scheduled_event_id] = activity_id
+            attrs = {"scheduledEventId": scheduled_event_id}
+            if activity_id in results:
+                attrs["result"] = json.dumps(results[activity_id])
+            event = {
+                "eventId": scheduled_event_id,
+                "eventType": "ActivityTaskCompleted",
+                "activityTaskCompletedEventAttributes": attrs,
+            }
+            self._scan_activity_task_completed(event, is_new=False)
+        self._n_carried = len(progress["completed"])
+        self._n_result_bytes = 0  # carried results aren't in the history
+
+    def _get_progress(self) -> t.Dict[str, t.Any]:
+        """Get the progress to carry to a new execution."""
+        completed = []
+        results = {}
+        for activity_id, event in self._latest_activity_task_events.items():
+            if event["eventType"] != "ActivityTaskCompleted":
+                continue
+            if activity_id in self._batches:
+                continue  # batched tasks' completions are carried
+            completed.append(activity_id)
+            attrs = event.get("activityTaskCompletedEventAttributes", {})
+            if "result" in attrs:
+                results[activity_id] = json.loads(attrs["result"])
+        workflow_input = self._get_workflow_input()
+        input_ = None if workflow_input is _sentinel else workflow_input
+        return {"input": input_, "completed": completed, "results": results}
+
+    def _is_history_large(self) -> bool:
+        """Check if the history has passed the continue-as-new limits.
+
+        Histories of executions which haven't run any activity tasks are
+        never large, so continuing executions always make progress.
+        """
+
+        if len(self._scheduled) <= self._n_carried:
+            return False
+        continue_as_new = self.workflow.continue_as_new
+        events = self.task["events"]
+        max_events = continue_as_new.max_events
+        if max_events is not None and len(events) >= max_events:
+            return True
+        max_bytes = continue_as_new.max_bytes
+        return max_bytes is not None and self._n_result_bytes >= max_bytes
+
+    def _continue_as_new_when_idle(self):
+        """Continue as a new execution, once no activity tasks are in
+        flight, carrying the progress so far. Ready tasks are held back
+        (for the new execution) until then.
+
+        The execution fails if the carried progress is too large for the
+        new execution's input.
+        """
+
+        self._complete_workflow()
+        if self.decisions:
+            return
+        for event in self._latest_activity_task_events.values():
+            if event["eventType"] in _in_flight_events:
+                return
+
+        input_ = json.dumps({_continued_input_key: self._get_progress()})
+        if len(input_) > _max_input_length:
+            details = "Continued execution input has %d characters (limit: %d)"
+            self._fail_workflow(
+                reason="Progress too large to continue as new execution",
+                details=details % (len(input_), _max_input_length),
+            )
+            return
+        decision_attributes = {"input": input_}
+        workflow_started_event = self.task["events"][0]
+        attrs = workflow_started_event["workflowExecutionStartedEventAttributes"]
+        for name in _continued_inherited_attributes:
+            if name in attrs:
+                decision_attributes[name] = attrs[name]
+        decision = {
+            "decisionType": "ContinueAsNewWorkflowExecution",
+            "continueAsNewWorkflowExecutionDecisionAttributes": decision_attributes,
+        }
+        self.decisions = [decision]
+
+    def _scan_events(self):
+        """Index and classify history events, in a single pass.
+
+        Events after the previous decision task start, up to this decision
+        task's start, are new.
+        """
+
+        previous_id = self.task.get("previousStartedEventId") or 0
+        current_id = self.task["startedEventId"]
+        handlers = self._scan_handlers
+        n_new = 0
+        for event in self.task["events"]:
+            event_id = event["eventId"]
+            is_new = previous_id < event_id <= current_id
+            n_new += is_new
+            handler = handlers.get(event["eventType"])
+            if handler:
+                handler(self, event, is_new)
+        logger.debug(
+            "Processing %d events from ID %d to %d", n_new, previous_id + 1, current_id
+        )
+        if self.workflow.map_tasks:
+            self._resolve_map_tasks()
+
+    def _resolve_map_tasks(self):
+        """Find completed map tasks, gathering their items' results.
+
+        Map tasks are resolved in dependency order, so a map task's
+        dependants are ready before their own completion is resolved.
+        """
+
+        map_tasks = self.workflow.map_tasks
+        for activity_task_id in self.workflow.topological_order:
+            map_task = map_tasks.get(activity_task_id)
+            if not map_task or not self._is_ready(map_task):
+                continue
+            n_items = len(self._get_map_items(map_task))
+            if self._n_map_items_completed.get(map_task.id, 0) < n_items:
+                continue
+            results = []
+            for j in range(n_items):
+                event = self._latest_activity_task_events[map_task.get_item_id(j)]
+                attrs = event.get("activityTaskCompletedEventAttributes", {})
+                results.append(
+                    json.loads(attrs["result"]) if "result" in attrs else None
+                )
+            self._complete_map_task(map_task, map_task.gather_results(results))
+
+    def _complete_map_task(self, map_task: MapTask, result: t.List[t.Any]):
+        self._map_results[map_task.id] = result
+        self._get_activity_results()[map_task.id] = result
+        self._n_completed += 1
+        n_dependencies_completed = self._n_dependencies_completed
+        for dependant_id in self.workflow.dependants[map_task.id]:
+            n = n_dependencies_completed.get(dependant_id, 0)
+            n_dependencies_completed[dependant_id] = n + 1
+
     def _process_new_events(self):
         assert self.task["events"][-1]["eventType"] == "DecisionTaskStarted"
         assert self.task["events"][-2]["eventType"] == "DecisionTaskScheduled"
 
-        for event in self._new_events[:-2]:
-            if event["eventType"] in _error_events:
-                self._error_events.append(event)
         if self._process_error_events():
             return
 
-        for event in self._new_events[:-2]:
+        for event in self._new_events:
             self._process_event(event)
+        if self.workflow.continue_as_new is not None and self._is_history_large():
+            self._continue_as_new_when_idle()
+            return
         self._schedule_tasks()
         self._complete_workflow()
 
     def build_decisions(self):
-        self._get_scheduled_references()
-        self._get_activity_task_events()
-        self._get_new_events()
-        self._process_new_events()
+        tracer = _tracing.tracer
+        with tracer.span("scan_events"):
+            self._scan_events()
+        with tracer.span(
+            "process_events",
+            n_new_events=len(self._new_events),
+            n_error_events=len(self._error_events),
+        ):
+            self._process_new_events()
+
+
+class PartitionBuilder(DAGBuilder):
+    """SWF decision builder for a partition's child workflow execution.
+
+    Args:
+        workflow: workflow of the partition's tasks
+        task: decision task
+        partition_input: partition execution input, with workflow input
+            and results of other partitions' tasks
+    """
+
+    def __init__(
+        self,
+        workflow: "DAGWorkflow",
+        task: t.Dict[str, t.Any],
+        partition_input: t.Dict[str, t.Any],
+    ):
+        super().__init__(workflow, task)
+        self._workflow_input = partition_input["input"]
+        self._partition_results = partition_input["results"]
+
+    def _get_activity_results(self):
+        if self._activity_results is None:
+            activity_results = super()._get_activity_results()
+            for activity_task_id, result in self._partition_results.items():
+                activity_results.setdefault(activity_task_id, result)
+        return self._activity_results
+
+
+class PartitionGraphBuilder(DAGBuilder):
+    """SWF decision builder for a partitioned workflow's (parent) execution,
+    starting a child workflow execution for each partition.
+
+    Child workflow execution events are handled as the equivalent activity
+    task events of the partition.
+    """
+
+    def __init__(self, workflow: "DAGWorkflow", task):
+        super().__init__(workflow, task)
+        self._partition_results = None
+
+    def _get_partition_results(self) -> t.Dict[str, t.Any]:
+        """Get (and cache) the results of completed partitions' tasks."""
+        if self._partition_results is None:
+            self._partition_results = {}
+            for partition_results in self._get_activity_results().values():
+                self._partition_results.update(partition_results or {})
+        return self._partition_results
+
+    def _build_task_input(self, activity_task: PartitionTask) -> t.Any:
+        results = self._get_partition_results()
+        return {
+            _partition_input_key: activity_task.index,
+            "input": self._get_workflow_input(),
+            "results": {
+                activity_task_id: results[activity_task_id]
+                for activity_task_id in activity_task.external_dependencies
+                if activity_task_id in results
+            },
+        }
+
+    def _add_schedule_decision(
+        self,
+        activity_task: PartitionTask,
+        activity_id: str,
+        input_: t.Any = _sentinel,
+        control: str = None,
+    ):
+        workflow_id = self.task["workflowExecution"]["workflowId"]
+        decision_attributes = _copy_decision_template(activity_task)
+        decision_attributes["workflowId"] = "%s-%s" % (workflow_id, activity_id)
+        decision_attributes["input"] = json.dumps(input_)
+        decision_attributes["control"] = activity_id
+
+        # Child executions inherit the parent's configuration
+        workflow_started_event = self.task["events"][0]
+        attrs = workflow_started_event["workflowExecutionStartedEventAttributes"]
+        for name in _child_workflow_inherited_attributes:
+            if name in attrs:
+                decision_attributes[name] = attrs[name]
+
+        decision = {
+            "decisionType": "StartChildWorkflowExecution",
+            "startChildWorkflowExecutionDecisionAttributes": decision_attributes,
+        }
+        self.decisions.append(decision)
+
+    def _complete_workflow(self):
+        if self._n_completed == len(self.workflow.task_specs):
+            result = self._get_partition_results()
+            decision = {"decisionType": "CompleteWorkflowExecution"}
+            if result:
+                decision_attrs = {"result": json.dumps(result)}
+                decision["completeWorkflowExecutionDecisionAttributes"] = decision_attrs
+            self.decisions = [decision]
+
+    def _scan_child_workflow_initiated(self, event, is_new):
+        attrs = event["startChildWorkflowExecutionInitiatedEventAttributes"]
+        activity_event = {
+            "eventId": event["eventId"],
+            "eventType": "ActivityTaskScheduled",
+            "activityTaskScheduledEventAttributes": {"activityId": attrs["control"]},
+        }
+        self._scan_activity_task_scheduled(activity_event, is_new)
+
+    def _scan_child_workflow_event(self, event, is_new):
+        attrs = event[_attr_keys[event["eventType"]]]
+        event_type = _child_workflow_activity_events[event["eventType"]]
+        activity_attrs = {"scheduledEventId": attrs["initiatedEventId"]}
+        if "result" in attrs:
+            activity_attrs["result"] = attrs["result"]
+        activity_event = {
+            "eventId": event["eventId"],
+            "eventType": event_type,
+            _attr_keys[event_type]: activity_attrs,
+        }
+        self._scan_handlers[event_type](self, activity_event, is_new)
+
+    _scan_handlers = dict(DAGBuilder._scan_handlers)
+    _scan_handlers.update(
+        dict.fromkeys(_child_workflow_activity_events, _scan_child_workflow_event)
+    )
+    _scan_handlers.update(
+        {
+            "StartChildWorkflowExecutionInitiated": _scan_child_workflow_initiated,
+            "StartChildWorkflowExecutionFailed": DAGBuilder._scan_error_event,
+        }
+    )
+
+
+class PartitionedDAGBuilder(_base.DecisionsBuilder):
+    """SWF decision builder from partitioned DAG-type workflow
+    specification.
+
+    The workflow's execution starts a child execution for each partition,
+    which runs the partition's tasks.
+    """
+
+    def build_decisions(self):
+        workflow_started_event = self.task["events"][0]
+        assert workflow_started_event["eventType"] == "WorkflowExecutionStarted"
+        attrs = workflow_started_event["workflowExecutionStartedEventAttributes"]
+        input_ = json.loads(attrs.get("input", "null"))
+
+        if isinstance(input_, dict) and _partition_input_key in input_:
+            partition_graph = self.workflow.partition_graph
+            partition = partition_graph.task_specs[input_[_partition_input_key]]
+            builder = PartitionBuilder(partition.workflow, self.task, input_)
+        else:
+            builder = PartitionGraphBuilder(self.workflow.partition_graph, self.task)
+            builder._workflow_input = input_
+        builder.build_decisions()
+        self.decisions = builder.decisions
 
 
 class DAGWorkflow(_base.Workflow):
@@ -588,25 +1424,116 @@ class DAGWorkflow(_base.Workflow):
         name: workflow name
         version: workflow version
         task_specs: DAG task specifications
+        description: workflow description
+        registration: workflow registration configuration
+        decision_concurrency: decision task concurrency configuration
+        critical_path_priority: default each task's priority to its
+            critical-path length: the estimated duration of the longest
+            chain of tasks from it to the end of the workflow
+        max_concurrency: maximum number of an execution's activity tasks
+            scheduled or running at once, default: unlimited
+        task_list_max_concurrency: maximum number of an execution's
+            activity tasks scheduled or running at once on each task-list
+        partition_size: maximum number of tasks run in each execution,
+            partitioning larger workflows into child executions, default:
+            don't partition
+        continue_as_new: continue as a new execution, carrying progress,
+            once the history is large, default: never
+
+    Attributes:
+        topological_order (list[str]): task IDs, each after its
+            dependencies, calculated on set-up
+        map_tasks (dict[str, MapTask]): map tasks, by ID, found on set-up
+        is_batched (bool): some tasks may be coalesced into batch activity
+            tasks, found on set-up
+        partition_graph (DAGWorkflow): workflow of partitions (as tasks),
+            built on set-up for workflows larger than the partition size,
+            otherwise ``None``
+        critical_path_lengths (dict[str, float]): estimated duration of
+            the longest chain of tasks from each task, calculated on set-up
+            with critical-path priority
     """
 
     spec_type = "dag"
+    default_duration = 1.0
     decisions_builder = DAGBuilder
     _task_cls = Task
-
-    def __init__(self, name, version, task_specs: t.List[Task], description=None):
-        super().__init__(name, version, description)
+    _map_task_cls = MapTask
+    _partition_task_cls = PartitionTask
+    history_attributes = {
+        "WorkflowExecutionStarted": ("input",) + _continued_inherited_attributes,
+        "ActivityTaskScheduled": ("activityId", "control"),
+        "ActivityTaskCompleted": ("result",),
+        "ActivityTaskTimedOut": ("timeoutType",),
+        "DecisionTaskStarted": ("identity",),
+        "DecisionTaskCompleted": ("startedEventId",),
+        **dict.fromkeys(
+            _decision_failed_events,
+            ("cause", "DecisionTaskCompletedEventId", "decisionTaskCompletedEventId"),
+        ),
+        "StartChildWorkflowExecutionInitiated": ("control",),
+        **dict.fromkeys(_child_workflow_activity_events, ("initiatedEventId",)),
+        "ChildWorkflowExecutionCompleted": ("initiatedEventId", "result"),
+    }
+
+    def __init__(
+        self,
+        name,
+        version,
+        task_specs: t.List[Task],
+        description=None,
+        registration: _base.Registration = None,
+        decision_concurrency: _base.DecisionConcurrency = None,
+        critical_path_priority: bool = False,
+        max_concurrency: int = None,
+        task_list_max_concurrency: t.Dict[str, int] = None,
+        partition_size: int = None,
+        continue_as_new: ContinueAsNew = None,
+    ):
+        super().__init__(name, version, description, registration, decision_concurrency)
         self.task_specs = task_specs
+        self.critical_path_priority = critical_path_priority
+        self.max_concurrency = max_concurrency
+        self.task_list_max_concurrency = task_list_max_concurrency
+        self.partition_size = partition_size
+        self.continue_as_new = continue_as_new
+        self.task_specs_by_id = {}
         self.dependants = {None: []}
+        self.dependency_counts = {}
+        self.topological_order = []
+        self.map_tasks = {}
+        self.is_batched = False
+        self.partition_graph = None
+        self.critical_path_lengths = {}
 
     @classmethod
     def _args_from_spec(cls, spec):
         args, kwargs = super()._args_from_spec(spec)
-        tasks = [cls._task_cls.from_spec(s) for s in spec["tasks"]]
+        tasks = [
+            (cls._map_task_cls if "map" in s else cls._task_cls).from_spec(s)
+            for s in spec["tasks"]
+        ]
         args += (tasks,)
+        if "critical_path_priority" in spec:
+            kwargs["critical_path_priority"] = spec["critical_path_priority"]
+        if "max_concurrency" in spec:
+            kwargs["max_concurrency"] = spec["max_concurrency"]
+        if "task_list_max_concurrency" in spec:
+            kwargs["task_list_max_concurrency"] = spec["task_list_max_concurrency"]
+        if "partition_size" in spec:
+            kwargs["partition_size"] = spec["partition_size"]
+        if "continue_as_new" in spec:
+            continue_as_new = ContinueAsNew.from_spec(spec["continue_as_new"])
+            kwargs["continue_as_new"] = continue_as_new
         return args, kwargs
 
+    @property
+    def is_concurrency_limited(self) -> bool:
+        """Activity task scheduling is limited by concurrency."""
+        return bool(self.max_concurrency is not None or self.task_list_max_concurrency)
+
     def _build_dependants(self):
+        self.dependants = {None: []}
         for activity_task in self.task_specs:
             dependants_task = []
             for other_activity_task in self.task_specs:
@@ -616,5 +1543,130 @@ class DAGWorkflow(_base.Workflow):
             if not activity_task.dependencies:
                 self.dependants[None].append(activity_task.id)
 
+    def _build_dependency_counts(self):
+        self.task_specs_by_id = {ts.id: ts for ts in self.task_specs}
+        self.dependency_counts = {}
+        for activity_task_id, dependants_task in self.dependants.items():
+            if activity_task_id is None:
+                continue
+            for dependant_id in dependants_task:
+                n = self.dependency_counts.get(dependant_id, 0)
+                self.dependency_counts[dependant_id] = n + 1
+        for activity_task in self.task_specs:
+            self.dependency_counts.setdefault(activity_task.id, 0)
+
+    def _build_topological_order(self):
+        n_dependencies = dict(self.dependency_counts)
+        self.topological_order = []
+        ready = list(self.dependants[None])
+        while ready:
+            activity_task_id = ready.pop()
+            self.topological_order.append(activity_task_id)
+            for dependant_id in self.dependants[activity_task_id]:
+                n_dependencies[dependant_id] -= 1
+                if not n_dependencies[dependant_id]:
+                    ready.append(dependant_id)
+
+    def _build_critical_path_lengths(self):
+        """Calculate each task's critical-path length, in reverse
+        topological order.
+
+        Tasks without a duration estimate are assumed to take
+        :attr:`default_duration`.
+        """
+
+        self.critical_path_lengths = {}
+        for activity_task_id in reversed(self.topological_order):
+            activity_task = self.task_specs_by_id[activity_task_id]
+            duration = activity_task.duration
+            if duration is None:
+                duration = self.default_duration
+            dependant_lengths = (
+                self.critical_path_lengths[dependant_id]
+                for dependant_id in self.dependants[activity_task_id]
+            )
+            length = duration + max(dependant_lengths, default=0.0)
+            self.critical_path_lengths[activity_task_id] = length
+
+    def _build_decision_templates(self):
+        for activity_task in self.task_specs:
+            length = self.critical_path_lengths.get(activity_task.id)
+            default_priority = None if length is None else math.ceil(length)
+            activity_task.build_decision_template(default_priority)
+
+    def _build_partitions(self):
+        """Split tasks into partitions of consecutive tasks in topological
+        order, each run in a child execution.
+
+        Each partition's dependencies are the partitions of its tasks'
+        dependencies, which are all earlier partitions.
+        """
+
+        size = self.partition_size
+        partition_indices = {}
+        for j, activity_task_id in enumerate(self.topological_order):
+            partition_indices[activity_task_id] = j // size
+        n_partitions = max(partition_indices.values(), default=-1) + 1
+
+        partitions_task_specs = [[] for _ in range(n_partitions)]
+        partitions_dependencies = [[] for _ in range(n_partitions)]
+        partitions_external_dependencies = [[] for _ in range(n_partitions)]
+        for activity_task in self.task_specs:
+            index = partition_indices[activity_task.id]
+            dependencies = []
+            for dependency_id in activity_task.dependencies or []:
+                dependency_index = partition_indices[dependency_id]
+                if dependency_index == index:
+                    dependencies.append(dependency_id)
+                    continue
+                if dependency_id not in partitions_external_dependencies[index]:
+                    partitions_external_dependencies[index].append(dependency_id)
+                partition_id = "partition-%d" % dependency_index
+                if partition_id not in partitions_dependencies[index]:
+                    partitions_dependencies[index].append(partition_id)
+            partition_task = dataclasses.replace(
+                activity_task, dependencies=dependencies or None
+            )
+            partitions_task_specs[index].append(partition_task)
+
+        partitions = []
+        for index, task_specs in enumerate(partitions_task_specs):
+            workflow = type(self)(
+                self.name,
+                self.version,
+                task_specs,
+                max_concurrency=self.max_concurrency,
+                task_list_max_concurrency=self.task_list_max_concurrency,
+            )
+            workflow.setup()
+            for activity_task in task_specs:  # keep whole-workflow priorities
+                original = self.task_specs_by_id[activity_task.id]
+                activity_task.decision_template = original.decision_template
+            partition = self._partition_task_cls(
+                "partition-%d" % index,
+                self.name,
+                self.version,
+                dependencies=partitions_dependencies[index] or None,
+                index=index,
+                workflow=workflow,
+                external_dependencies=partitions_external_dependencies[index],
+            )
+            partitions.append(partition)
+        self.partition_graph = type(self)(self.name, self.version, partitions)
+        self.partition_graph.setup()
+
     def setup(self):
         self._build_dependants()
+        self._build_dependency_counts()
+        self._build_topological_order()
+        self.map_tasks = {
+            ts.id: ts for ts in self.task_specs if isinstance(ts, self._map_task_cls)
+        }
+        self.is_batched = any(ts.batch_size is not None for ts in self.task_specs)
+        if self.critical_path_priority:
+            self._build_critical_path_lengths()
+        self._build_decision_templates()
+        partition_size = self.partition_size
+        if partition_size is not None and len(self.task_specs) > partition_size:
+            self._build_partitions()
+            self.decisions_builder = PartitionedDAGBuilder
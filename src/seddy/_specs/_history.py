@@ -0,0 +1,183 @@
+"""Compact workflow execution history."""
+
+import sys
+import array
+import datetime
+import threading
+import collections.abc
+import typing as t
+
+_event_types = []
+_event_type_codes = {}
+_attr_keys = {}
+_event_types_lock = threading.Lock()
+_utc = datetime.timezone.utc
+
+
+def _get_event_type_code(event_type: str) -> int:
+    """Get (and assign if new) the integer code of an event type."""
+    code = _event_type_codes.get(event_type)
+    if code is not None:
+        return code
+    with _event_types_lock:
+        if event_type not in _event_type_codes:
+            event_type = sys.intern(event_type)
+            attr_key = event_type[0].lower() + event_type[1:] + "EventAttributes"
+            _attr_keys[event_type] = attr_key
+            _event_types.append(event_type)
+            _event_type_codes[event_type] = len(_event_types) - 1
+        return _event_type_codes[event_type]
+
+
+def _compact_value(value: t.Any) -> t.Any:
+    """Intern short string attribute values, which tend to be repeated."""
+    if isinstance(value, str) and len(value) <= 256:
+        return sys.intern(value)
+    return value
+
+
+def prune_history(
+    events: t.List[t.Dict[str, t.Any]], attribute_names: t.Dict[str, t.Collection[str]]
+):
+    """Drop unused attributes from history events, in-place.
+
+    Scheduled-event links are always kept.
+
+    Args:
+        events: history events
+        attribute_names: names of attributes to keep for each event type.
+            Event types not included have all attributes dropped
+    """
+
+    for event in events:
+        event_type = event["eventType"]
+        _get_event_type_code(event_type)
+        attr_key = _attr_keys[event_type]
+        attrs = event.get(attr_key)
+        if not attrs:
+            continue
+        pruned = {}
+        for name in attribute_names.get(event_type, ()):
+            if name in attrs:
+                pruned[name] = attrs[name]
+        if "scheduledEventId" in attrs:
+            pruned["scheduledEventId"] = attrs["scheduledEventId"]
+        event[attr_key] = pruned
+
+
+class History(collections.abc.Sequence):
+    """Compact, column-oriented workflow execution history.
+
+    Event IDs, event types (as integer codes) and scheduled-event links are
+    stored in ``array`` columns, and only the requested event attributes are
+    kept. Indexing reconstructs (a pruned copy of) the SWF event.
+
+    Args:
+        events: initial history events
+        attribute_names: names of attributes to keep for each event type,
+            default: keep all attributes. Event types not included have
+            all attributes (apart from the scheduled-event link) dropped
+
+    Attributes:
+        attribute_names (dict[str, typing.Collection[str]]): names of
+            attributes kept for each event type
+    """
+
+    def __init__(
+        self,
+        events: t.Iterable[t.Dict[str, t.Any]] = (),
+        attribute_names: t.Dict[str, t.Collection[str]] = None,
+    ):
+        self.attribute_names = attribute_names
+        self._event_ids = array.array("q")
+        self._event_types = array.array("H")
+        self._scheduled_event_ids = array.array("q")
+        self._timestamps = array.array("d")
+        self._attributes = {}
+        self.extend(events)
+
+    def __repr__(self):
+        if not self._event_ids:
+            return "%s([])" % type(self).__name__
+        _fmt = "%s(<%d events, IDs %d to %d>)"
+        _args = (len(self), self._event_ids[0], self._event_ids[-1])
+        return _fmt % ((type(self).__name__,) + _args)
+
+    def __len__(self):
+        return len(self._event_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get_event(j) for j in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._get_event(index)
+
+    def __iter__(self):
+        for j in range(len(self)):
+            yield self._get_event(j)
+
+    def _get_event(self, index: int) -> t.Dict[str, t.Any]:
+        """Reconstruct event.
+
+        Args:
+            index: event index
+
+        Returns:
+            history event, with only kept attributes
+        """
+
+        event_type = _event_types[self._event_types[index]]
+        event = {"eventId": self._event_ids[index], "eventType": event_type}
+        timestamp = self._timestamps[index]
+        if timestamp == timestamp:  # not NaN
+            event["eventTimestamp"] = datetime.datetime.fromtimestamp(timestamp, _utc)
+        attrs = dict(self._attributes.get(index, ()))
+        scheduled_event_id = self._scheduled_event_ids[index]
+        if scheduled_event_id:
+            attrs["scheduledEventId"] = scheduled_event_id
+        event[_attr_keys[event_type]] = attrs
+        return event
+
+    def append(self, event: t.Dict[str, t.Any]):
+        """Add event to history.
+
+        Args:
+            event: history event
+        """
+
+        code = _get_event_type_code(event["eventType"])
+        event_type = _event_types[code]
+        attrs = event.get(_attr_keys[event_type]) or {}
+        timestamp = event.get("eventTimestamp")
+        if isinstance(timestamp, datetime.datetime):
+            timestamp = timestamp.timestamp()
+
+        index = len(self._event_ids)
+        self._event_ids.append(event["eventId"])
+        self._event_types.append(code)
+        self._scheduled_event_ids.append(attrs.get("scheduledEventId") or 0)
+        self._timestamps.append(float("nan") if timestamp is None else timestamp)
+
+        if self.attribute_names is None:
+            names = attrs.keys()
+        else:
+            names = self.attribute_names.get(event_type, ())
+        kept = {}
+        for name in names:
+            if name in attrs and name != "scheduledEventId":
+                kept[sys.intern(name)] = _compact_value(attrs[name])
+        if kept:
+            self._attributes[index] = kept
+
+    def extend(self, events: t.Iterable[t.Dict[str, t.Any]]):
+        """Add events to history.
+
+        Args:
+            events: history events
+        """
+
+        for event in events:
+            self.append(event)
@@ -2,12 +2,14 @@
 
 import json
 import pathlib
+import threading
 import typing as t
 import logging as lg
 
 from . import Workflow
 
 logger = lg.getLogger(__package__)
+_spec_suffixes = (".json", ".yml", ".yaml")
 
 
 def _construct_workflows(workflows_spec: t.Dict[str, t.Any]) -> t.List[Workflow]:
@@ -79,3 +81,98 @@ def load_workflows(workflows_file: pathlib.Path) -> t.List[Workflow]:
 
     workflows_specs = _load_specs(workflows_file)
     return _construct_workflows(workflows_specs)
+
+
+def _get_spec_files(paths: t.List[pathlib.Path]) -> t.List[pathlib.Path]:
+    """Get workflows specifications files.
+
+    Directories are expanded to their (non-recursive) JSON and YAML files,
+    in name order.
+
+    Args:
+        paths: workflows specifications file and directory paths
+
+    Returns:
+        workflows specifications file paths
+    """
+
+    files = []
+    for path in paths:
+        if path.is_dir():
+            children = sorted(p for p in path.iterdir() if p.suffix in _spec_suffixes)
+            files.extend(p for p in children if p.is_file())
+        else:
+            files.append(path)
+    return files
+
+
+def _get_file_key(path: pathlib.Path) -> t.Tuple[int, int, int]:
+    """Get cache key of file, changing on modification."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class WorkflowsLoader:
+    """Workflows specifications loader.
+
+    Caches each file's workflows, only re-loading modified files.
+
+    Args:
+        paths: workflows specifications file and directory paths
+    """
+
+    def __init__(self, paths: t.List[pathlib.Path]):
+        self.paths = paths
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _load_file(self, path: pathlib.Path) -> t.Tuple[tuple, t.List[Workflow]]:
+        """Load workflows specifications file, using cache if unmodified.
+
+        Args:
+            path: workflows specifications file path
+
+        Returns:
+            file cache key, and workflows specifications
+        """
+
+        key = _get_file_key(path)
+        cached = self._cache.get(path)
+        if cached and cached[0] == key:
+            logger.debug("Using cached workflows specifications of '%s'", path)
+            return cached
+        return key, load_workflows(path)
+
+    def load(self) -> t.List[Workflow]:
+        """Load workflows specifications.
+
+        The cache is only updated once all files have been loaded.
+
+        Returns:
+            workflows specifications, in file order
+
+        Raises:
+            ValueError: workflow is defined more than once
+        """
+
+        with self._lock:
+            cache = {}
+            for path in _get_spec_files(self.paths):
+                cache[path] = self._load_file(path)
+
+            workflows = []
+            workflow_paths = {}
+            for path, (_, file_workflows) in cache.items():
+                for workflow in file_workflows:
+                    workflow_id = (workflow.name, workflow.version)
+                    if workflow_id in workflow_paths:
+                        _fmt = (
+                            "Workflow '%s' (version %s) defined in both '%s' and '%s'"
+                        )
+                        _args = workflow_id + (workflow_paths[workflow_id], path)
+                        raise ValueError(_fmt % _args)
+                    workflow_paths[workflow_id] = path
+                    workflows.append(workflow)
+
+            self._cache = cache
+        return workflows
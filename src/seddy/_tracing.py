@@ -0,0 +1,354 @@
+"""Decision task tracing."""
+
+import os
+import abc
+import json
+import time
+import pathlib
+import threading
+import contextlib
+import typing as t
+import logging as lg
+
+logger = lg.getLogger(__name__)
+
+
+def _now_ns() -> int:
+    return int(time.time() * 1e9)
+
+
+class Span:
+    """Traced operation.
+
+    Args:
+        tracer: span's tracer
+        name: operation name
+        trace_id: trace ID (32 hexadecimal digits)
+        parent_id: parent span ID, or ``None`` for a trace's root span
+        attributes: operation attributes
+
+    Attributes:
+        span_id (str): span ID (16 hexadecimal digits)
+        start_time (int): operation start time (nanoseconds since epoch)
+        end_time (int): operation end time (nanoseconds since epoch), or
+            ``None`` if in progress
+        error (str): operation error message, or ``None`` if successful
+    """
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_time",
+        "end_time",
+        "error",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: str = None,
+        attributes: t.Dict[str, t.Any] = None,
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start_time = _now_ns()
+        self.end_time = None
+        self.error = None
+
+    def set_attribute(self, name: str, value: t.Any):
+        """Set operation attribute.
+
+        Args:
+            name: attribute name
+            value: attribute value (string, number or boolean)
+        """
+
+        self.attributes[name] = value
+
+    def end(self, exc: BaseException = None):
+        """Finish operation, if not already finished.
+
+        Args:
+            exc: operation error, if failed
+        """
+
+        if self.end_time is not None:
+            return
+        self.end_time = _now_ns()
+        if exc is not None:
+            self.error = "%s: %s" % (type(exc).__name__, exc)
+        self.tracer._finish(self)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Convert to JSON-serialisable representation."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Span of disabled tracer."""
+
+    trace_id = span_id = None
+
+    def set_attribute(self, name, value):
+        pass
+
+    def end(self, exc=None):
+        pass
+
+
+_noop_span = _NoopSpan()
+
+
+class Exporter(metaclass=abc.ABCMeta):
+    """Trace exporter."""
+
+    @abc.abstractmethod
+    def export(self, spans: t.List[Span]):  # pragma: no cover
+        """Export a finished trace.
+
+        Args:
+            spans: trace's spans, in order of finishing
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """Finish exporting."""
+
+
+class JSONLExporter(Exporter):
+    """Export spans to a file, as JSON-lines: one span per line.
+
+    Args:
+        path: output file path, appended to
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _format(self, spans: t.List[Span]) -> t.List[t.Dict[str, t.Any]]:
+        return [span.to_dict() for span in spans]
+
+    def export(self, spans):
+        lines = [json.dumps(obj, default=str) + "\n" for obj in self._format(spans)]
+        with self._lock:
+            if self._file is None:
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.writelines(lines)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _get_otlp_value(value: t.Any) -> t.Dict[str, t.Any]:
+    """Convert attribute value to OTLP/JSON ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    elif isinstance(value, int):
+        return {"intValue": str(value)}  # 64-bit integers are strings
+    elif isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPJSONExporter(JSONLExporter):
+    """Export traces to a file, in OpenTelemetry protocol JSON encoding:
+    one ``ExportTraceServiceRequest`` per trace per line, as read by the
+    OpenTelemetry Collector's OTLP JSON file receiver.
+
+    Args:
+        path: output file path, appended to
+        service_name: traced service name
+    """
+
+    def __init__(self, path: pathlib.Path, service_name: str = "seddy"):
+        super().__init__(path)
+        self.service_name = service_name
+
+    def _format_span(self, span: Span) -> t.Dict[str, t.Any]:
+        obj = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # internal
+            "startTimeUnixNano": str(span.start_time),
+            "endTimeUnixNano": str(span.end_time),
+            "attributes": [
+                {"key": k, "value": _get_otlp_value(v)}
+                for k, v in span.attributes.items()
+            ],
+            "status": {"code": 1},  # ok
+        }
+        if span.parent_id:
+            obj["parentSpanId"] = span.parent_id
+        if span.error is not None:
+            obj["status"] = {"code": 2, "message": span.error}  # error
+        return obj
+
+    def _format(self, spans):
+        resource_attributes = [
+            {"key": "service.name", "value": {"stringValue": self.service_name}}
+        ]
+        return [
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {"attributes": resource_attributes},
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": __package__},
+                                "spans": [self._format_span(s) for s in spans],
+                            }
+                        ],
+                    }
+                ]
+            }
+        ]
+
+
+class Tracer:
+    """Operation tracer, safe to use from multiple threads.
+
+    Spans started in a thread are children of the thread's current span
+    by default. A trace is exported once its root span finishes. Without
+    an exporter, nothing is recorded.
+
+    Args:
+        exporter: finished traces exporter
+
+    Attributes:
+        exporter (Exporter): finished traces exporter, or ``None`` to
+            disable tracing
+    """
+
+    def __init__(self, exporter: Exporter = None):
+        self.exporter = exporter
+        self._local = threading.local()
+        self._traces = {}
+        self._lock = threading.Lock()
+
+    @property
+    def current_span(self) -> t.Union[Span, None]:
+        """Current thread's innermost active span."""
+        return getattr(self._local, "span", None)
+
+    def start_span(
+        self, name: str, parent: Span = None, **attributes
+    ) -> t.Union[Span, _NoopSpan]:
+        """Start an operation span, finished with :meth:`Span.end`.
+
+        Args:
+            name: operation name
+            parent: parent span, default: current thread's span, or start
+                a new trace if none
+            **attributes: operation attributes
+
+        Returns:
+            started span
+        """
+
+        if self.exporter is None:
+            return _noop_span
+        parent = parent or self.current_span
+        if parent is None or parent is _noop_span:
+            trace_id, parent_id = os.urandom(16).hex(), None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        span = Span(self, name, trace_id, parent_id, attributes)
+        with self._lock:
+            self._traces.setdefault(trace_id, [])
+        return span
+
+    @contextlib.contextmanager
+    def activate(self, span: t.Union[Span, _NoopSpan]):
+        """Make span the current thread's span, finishing it on exit.
+
+        Args:
+            span: started span
+
+        Returns:
+            context manager of the span
+        """
+
+        previous = self.current_span
+        self._local.span = span
+        try:
+            yield span
+        except BaseException as e:
+            span.end(e)
+            raise
+        else:
+            span.end()
+        finally:
+            self._local.span = previous
+
+    def span(self, name: str, parent: Span = None, **attributes):
+        """Trace an operation, as the current thread's span.
+
+        Args:
+            name: operation name
+            parent: parent span, default: current thread's span
+            **attributes: operation attributes
+
+        Returns:
+            context manager of the started span
+        """
+
+        return self.activate(self.start_span(name, parent, **attributes))
+
+    def discard(self, span: t.Union[Span, _NoopSpan]):
+        """Drop a root span's trace, without exporting.
+
+        Args:
+            span: trace's root span
+        """
+
+        with self._lock:
+            self._traces.pop(span.trace_id, None)
+
+    def _finish(self, span: Span):
+        """Record finished span, exporting its trace if root span."""
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:  # pragma: no cover
+                return
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            del self._traces[span.trace_id]
+        exporter = self.exporter
+        if exporter is None:  # pragma: no cover
+            return
+        try:
+            exporter.export(spans)
+        except Exception:
+            logger.exception("Failed to export trace '%s'", span.trace_id)
+
+
+exporters = {"jsonl": JSONLExporter, "otlp": OTLPJSONExporter}
+tracer = Tracer()
@@ -2,10 +2,13 @@
 
 import os
 import sys
+import copy
+import queue
+import atexit
+import reprlib
 import typing as t
 import logging as lg
-
-import boto3
+import logging.handlers
 
 logger = lg.getLogger(__package__)
 AWS_SWF_ENDPOINT_URL = os.environ.get("AWS_SWF_ENDPOINT_URL")
@@ -18,16 +21,99 @@ LOGGING_LEVELS = {
 }
 
 
-def setup_logging(verbose: int, json_logging: bool = False):
+class Payload:
+    """Log message argument for large payloads, eg decision task history.
+
+    The payload is only summarised when the log message is formatted, and
+    the summary is limited in nesting, number of items and size.
+
+    Args:
+        obj: payload
+
+    Attributes:
+        max_size (int): maximum summary length
+    """
+
+    __slots__ = ("obj",)
+    max_size = 1000
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 4
+    _repr.maxdict = 10
+    _repr.maxlist = 10
+    _repr.maxstring = 200
+    _repr.maxother = 200
+
+    def __init__(self, obj: t.Any):
+        self.obj = obj
+
+    def __str__(self):
+        summary = self._repr.repr(self.obj)
+        if len(summary) > self.max_size:
+            summary = summary[: max(self.max_size - 3, 0)] + "..."
+        return summary
+
+
+class _QueueHandler(lg.handlers.QueueHandler):
+    """Queue logging handler which leaves formatting to the listener."""
+
+    def prepare(self, record: lg.LogRecord) -> lg.LogRecord:
+        return copy.copy(record)
+
+
+def _start_queue_logging() -> lg.handlers.QueueListener:
+    """Move root logger's handlers to a background thread.
+
+    Log records are passed to the handlers via a queue, to be formatted
+    and emitted by the listener thread, which is stopped at exit.
+
+    Returns:
+        started queue listener
+    """
+
+    handlers = lg.root.handlers[:]
+    records = queue.Queue()
+    listener = lg.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        lg.root.removeHandler(handler)
+    lg.root.addHandler(_QueueHandler(records))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def setup_logging(
+    verbose: int,
+    json_logging: bool = False,
+    queue_logging: bool = False,
+    payload_size: int = None,
+):
     """Setup logging.
 
     Args:
         verbose: logging verbosity
         json_logging: JSON-format logs
+        queue_logging: format and emit logs in a background thread
+        payload_size: maximum logged size of large payloads, default:
+            ``Payload.max_size``
     """
 
     lg.addLevelName(25, "NOTICE")
     level = LOGGING_LEVELS.get(verbose, lg.CRITICAL if verbose < 0 else lg.NOTSET)
+    if payload_size is not None:
+        Payload.max_size = payload_size
+    _setup_logging_handlers(level, json_logging)
+    if queue_logging:
+        _start_queue_logging()
+
+
+def _setup_logging_handlers(level: int, json_logging: bool = False):
+    """Setup root logger's handlers.
+
+    Args:
+        level: logging level
+        json_logging: JSON-format logs
+    """
+
     fmt = "%(asctime)s [%(levelname)8s] %(name)s: %(message)s"
 
     if json_logging:
@@ -70,6 +156,37 @@ def setup_logging(verbose: int, json_logging: bool = False):
     lg.root.setLevel(level)
 
 
+def iter_paginated(
+    fn: t.Callable[..., t.Dict[str, t.Any]],
+    kwargs: t.Dict[str, t.Any] = None,
+    next_key: str = "nextPageToken",
+    next_arg: str = None,
+) -> t.Generator[t.Dict[str, t.Any], None, None]:
+    """Iterate over pages of AWS resources, as each page is received.
+
+    Args:
+        fn: resource listing function
+        kwargs: keyword arguments to ``fn``
+        next_key: key of next-page token in response
+        next_arg: argument name of next-page token in ``fn``, default: same
+            as ``next_key``
+
+    Returns:
+        responses of ``fn``, with next-page token removed
+    """
+
+    next_arg = next_key if next_arg is None else next_arg
+    kwargs = kwargs or {}
+    while True:
+        resp = fn(**kwargs)
+        next_token = resp.pop(next_key, None)
+        yield resp
+        if not next_token:
+            return
+        kwargs = kwargs.copy()
+        kwargs[next_arg] = next_token
+
+
 def list_paginated(
     fn: t.Callable[..., t.Dict[str, t.Any]],
     list_key: str,
@@ -91,27 +208,32 @@ def list_paginated(
         collected response of ``fn``
     """
 
-    next_arg = next_key if next_arg is None else next_arg
-    kwargs = kwargs or {}
-    resp = fn(**kwargs)
-    if resp.get(next_key):
-        kwargs = kwargs.copy()
-        kwargs[next_arg] = resp.pop(next_key)
-        new_resp = list_paginated(fn, list_key, kwargs, next_key, next_arg)
-        resp[list_key].extend(new_resp[list_key])
+    pages = iter_paginated(fn, kwargs, next_key, next_arg)
+    resp = next(pages)
+    for page in pages:
+        resp[list_key].extend(page[list_key])
     return resp
 
 
-def get_swf_client():
+def get_swf_client(rate_limiter=None):
     """Create an SWF client.
 
     Uses ``AWS_SWF_ENDPOINT_URL`` from environment for the endpoint URL.
 
+    Args:
+        rate_limiter (seddy._ratelimit.RateLimiter): client request rate
+            limiter, default: the rate limiter shared by all clients
+
     Returns:
         botocore.client.BaseClient: SWF client
     """
 
+    import boto3
+    from . import _ratelimit
+
     logger.debug(
         "Creating SWF client with endpoint URL: %s", AWS_SWF_ENDPOINT_URL or "<default>"
     )
-    return boto3.client("swf", endpoint_url=AWS_SWF_ENDPOINT_URL)
+    client = boto3.client("swf", endpoint_url=AWS_SWF_ENDPOINT_URL)
+    (rate_limiter or _ratelimit.rate_limiter).install(client)
+    return client
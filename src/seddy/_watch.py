@@ -0,0 +1,138 @@
+"""Workflows specifications file watching."""
+
+import pathlib
+import threading
+import typing as t
+import logging as lg
+
+try:
+    import inotify_simple
+except ImportError:  # pragma: no cover
+    inotify_simple = None
+
+logger = lg.getLogger(__package__)
+
+
+def _get_file_state(path: pathlib.Path) -> t.Union[t.Tuple[int, int, int], None]:
+    """Get file modification state.
+
+    Args:
+        path: file path
+
+    Returns:
+        file modification time (nanoseconds), size and inode, or ``None``
+            if the file can't be accessed
+    """
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class Watcher:
+    """Watch files for modification, in a background thread.
+
+    Waits on ``inotify`` events for the files' parent directories if
+    ``inotify_simple`` is installed, falling back to polling the files'
+    modification times.
+
+    Args:
+        paths: paths of files and directories to watch
+        callback: called (in the watching thread) on modification
+        interval: polling interval (seconds)
+    """
+
+    def __init__(
+        self,
+        paths: t.List[pathlib.Path],
+        callback: t.Callable[[], None],
+        interval: float = 5.0,
+    ):
+        self.paths = paths
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+
+    def _get_state(self) -> t.Dict[pathlib.Path, t.Any]:
+        """Get modification state of watched files.
+
+        Watched directories include the state of their (non-recursive)
+        contents.
+        """
+
+        state = {}
+        for path in self.paths:
+            state[path] = _get_file_state(path)
+            if path.is_dir():
+                for child in sorted(path.iterdir()):
+                    state[child] = _get_file_state(child)
+        return state
+
+    def _setup_inotify(self):
+        """Start watching files' directories with ``inotify``."""
+        if inotify_simple is None:  # pragma: no cover
+            return
+        flags = inotify_simple.flags
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE
+        try:
+            self._inotify = inotify_simple.INotify()
+            directories = {p if p.is_dir() else p.parent for p in self.paths}
+            for directory in directories:
+                self._inotify.add_watch(str(directory), mask)
+        except OSError as e:  # pragma: no cover
+            logger.warning("Falling back to polling for file changes: %s", e)
+            self._close_inotify()
+
+    def _close_inotify(self):
+        """Stop watching with ``inotify``."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _wait(self):
+        """Wait for a possible file modification, or for the watcher to stop."""
+        if self._inotify is None:
+            self._stop.wait(self.interval)
+            return
+        self._inotify.read(timeout=int(self.interval * 1000))  # pragma: no cover
+
+    def _run(self, state: t.Dict[pathlib.Path, t.Any]):
+        """Watch files, calling back on modification.
+
+        Args:
+            state: initial modification state of watched files
+        """
+
+        while not self._stop.is_set():
+            self._wait()
+            new_state = self._get_state()
+            if new_state == state or self._stop.is_set():
+                continue
+            state = new_state
+            logger.info("Detected modification of: %s", [str(p) for p in self.paths])
+            try:
+                self.callback()
+            except Exception:
+                logger.exception("Failed to handle file modification")
+        self._close_inotify()
+
+    def start(self):
+        """Start watching files."""
+        self._stop.clear()
+        self._setup_inotify()
+        state = self._get_state()
+        self._thread = threading.Thread(
+            target=self._run, args=(state,), name="seddy-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching files, waiting on the watching thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,17 +1,33 @@
 """SWF decider."""
 
+import time
 import uuid
 import socket
 import pathlib
+import datetime
+import threading
 import typing as t
 import logging as lg
 from concurrent import futures as cf
 
 from . import _util
+from . import _watch
 from . import _specs
+from . import _metrics
+from . import _bulkhead
+from . import _recording
+from . import _profiling
+from . import _tracing
+from ._memo import TTLCache
 
 logger = lg.getLogger(__name__)
 socket.setdefaulttimeout(70.0)
+_decider_history_attributes = {"DecisionTaskScheduled": ("startToCloseTimeout",)}
+_decision_task_events = {
+    "DecisionTaskScheduled",
+    "DecisionTaskStarted",
+    "DecisionTaskTimedOut",
+}
 
 
 class UnsupportedWorkflow(LookupError):
@@ -22,36 +38,99 @@ class Decider:
     """SWF decider.
 
     Args:
-        workflows_spec_file: workflows specifications file path
+        workflows_spec_files: workflows specifications file and directory
+            paths
         domain: SWF domain to poll in
         task_list: SWF decider task-list
         identity: decider identity, default: automatically generated from
             fully-qualified domain-name and a UUID
+        compact_history: store decision task history in compact form,
+            keeping only the event attributes the workflow uses
+        pipeline_depth: maximum number of decision tasks being decided and
+            responded to while polling for the next task, default: decide
+            and respond before polling again
+        record_file: record decision tasks and decisions to this file
+            (gzip-compressed JSON-lines), for replay
+        profiler: decision-making profiler, toggled on ``SIGUSR1``
+        report_interval: log a summary of poll, history fetch, decision
+            building and response latencies every this many seconds,
+            default: don't report
 
     Attributes:
         client (botocore.client.BaseClient): SWF client
         identity (str): name of decider to poll as
+        watch_interval (float): workflows specifications file modification
+            polling interval (seconds)
+        deadline_margin (float): minimum time (seconds) remaining before
+            a decision task's time-out to start deciding, otherwise the
+            task is skipped: it times out, and SWF schedules a new decision
+            task for the execution (DAG workflows continue after decision
+            task time-outs)
+        decisions_memo_ttl (float): time (seconds) to remember built
+            decisions, to reuse for repeated decision tasks (eg after
+            time-out) with unchanged history
+        metrics (seddy._metrics.Metrics): decider metrics
     """
 
+    watch_interval = 5.0
+    deadline_margin = 1.0
+    decisions_memo_ttl = 120.0
+
     def __init__(
         self,
-        workflows_spec_file: pathlib.Path,
+        workflows_spec_files: t.List[pathlib.Path],
         domain: str,
         task_list: str,
         identity: str = None,
+        compact_history: bool = False,
+        pipeline_depth: int = 0,
+        record_file: pathlib.Path = None,
+        profiler: _profiling.Profiler = None,
+        report_interval: float = None,
     ):
-        self.workflows_spec_file = workflows_spec_file
+        self.workflows_spec_files = workflows_spec_files
         self.domain = domain
         self.task_list = task_list
         self.client = _util.get_swf_client()
         self.identity = identity or (socket.getfqdn() + "-" + str(uuid.uuid4())[:8])
-        self._future = None
+        self.compact_history = compact_history
+        self.pipeline_depth = pipeline_depth
+        self._executor = cf.ThreadPoolExecutor(
+            max_workers=pipeline_depth + 1, thread_name_prefix="seddy-decision"
+        )
+        self._futures = set()
+        self._bulkheads = {}
+        self.metrics = _metrics.Metrics()
+        self._decisions_memo = TTLCache(self.decisions_memo_ttl)
+        self._recorder = record_file and _recording.Recorder(record_file)
+        self.profiler = profiler
+        self.report_interval = report_interval
+        self._reporter = None
+        self._workflows = None
+        self._workflows_lock = threading.Lock()
+        self._workflows_loader = _specs.WorkflowsLoader(workflows_spec_files)
+        self._watcher = None
+
+    def _poll_page(self, **kwargs) -> t.Dict[str, t.Any]:
+        """Poll for a decision task page from SWF, tracing the request."""
+        with _tracing.tracer.span("poll_page") as span:
+            page = self.client.poll_for_decision_task(**kwargs)
+            headers = page.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            span.set_attribute("n_events", len(page.get("events") or ()))
+            if "content-length" in headers:
+                span.set_attribute("bytes", int(headers["content-length"]))
+        return page
 
     def _poll_for_decision_task(self) -> t.Dict[str, t.Any]:
         """Poll for a decision task from SWF.
 
         See https://docs.aws.amazon.com/amazonswf/latest/apireference/API_PollForDecisionTask.html
 
+        History event pages are added to the task as they are received,
+        dropping event attributes the task's workflow doesn't use (see
+        :attr:`seddy._specs.Workflow.history_attributes`), and compacting
+        if configured.
+
         Returns:
             decision task
         """
@@ -61,13 +140,91 @@ class Decider:
             "identity": self.identity,
             "taskList": {"name": self.task_list},
         }
-        return _util.list_paginated(
-            self.client.poll_for_decision_task, "events", _kwargs
-        )
+        pages = _util.iter_paginated(self._poll_page, _kwargs)
+        start = time.perf_counter()
+        task = next(pages)
+        if task["taskToken"]:
+            workflow_id = _get_workflow_id(task)
+            self.metrics.record_latency(
+                "poll", workflow_id, time.perf_counter() - start
+            )
+        events = task["events"]
+        workflow = self._get_history_workflow(task)
+        attribute_names = workflow and _get_history_attributes(workflow)
+        if workflow and self.compact_history:
+            events = task["events"] = _specs.History(events, attribute_names)
+            attribute_names = None  # compact history prunes its own events
+        elif attribute_names is not None:
+            _specs.prune_history(events, attribute_names)
+
+        start = time.perf_counter()
+        for page in pages:
+            if attribute_names is not None:
+                _specs.prune_history(page["events"], attribute_names)
+            events.extend(page["events"])
+        if task["taskToken"]:
+            self.metrics.record_latency(
+                "history", workflow_id, time.perf_counter() - start
+            )
+        return task
+
+    def _get_history_workflow(self, task: t.Dict[str, t.Any]) -> _specs.Workflow:
+        """Get workflow specification for task, for history ingestion.
+
+        Args:
+            task: first page of decision task
+
+        Returns:
+            workflow specification, or ``None`` for no or unsupported task
+        """
+
+        if not task["taskToken"]:
+            return None
+        try:
+            return self._get_workflow(task)
+        except UnsupportedWorkflow:
+            return None
+
+    def _load_workflows(self):
+        """Load and set up workflow specifications.
+
+        The new workflows registry replaces the current registry only once
+        it has been fully built. Only newly loaded workflows are set up.
+        Loads (on start-up and on reload) are serialised, so a workflow is
+        never set up by two threads at once.
+        """
+
+        tracer = _tracing.tracer
+        with self._workflows_lock, tracer.span("load_workflows") as span:
+            workflows = self._workflows_loader.load()
+            span.set_attribute("n_workflows", len(workflows))
+            current = self._workflows or {}
+            registry = {}
+            for workflow in workflows:
+                workflow_id = (workflow.name, workflow.version)
+                if current.get(workflow_id) is not workflow:
+                    with tracer.span("setup", workflow="-".join(workflow_id)):
+                        workflow.setup()
+                registry[workflow_id] = workflow
+            self._workflows = registry
+
+    def _reload_workflows(self):
+        """Reload workflow specifications, keeping current on failure."""
+        try:
+            self._load_workflows()
+        except Exception:
+            _fmt = "Failed to reload workflows specifications, keeping current: %s"
+            logger.exception(_fmt, self.workflows_spec_files)
+        else:
+            _fmt = "Reloaded %d workflows specifications"
+            logger.log(25, _fmt, len(self._workflows))
 
     def _get_workflow(self, task: t.Dict[str, t.Any]) -> _specs.Workflow:
         """Get workflow specification for task.
 
+        Workflows are loaded (and set up) on starting the decider, not
+        here.
+
         Args:
             task: decision task
 
@@ -75,14 +232,11 @@ class Decider:
             workflow specification
         """
 
-        workflows = _specs.load_workflows(self.workflows_spec_file)
-        workflow_ids = [(w.name, w.version) for w in workflows]
-        task_id = (task["workflowType"]["name"], task["workflowType"]["version"])
+        task_id = _get_workflow_id(task)
         try:
-            idx = workflow_ids.index(task_id)
-        except ValueError:
+            return (self._workflows or {})[task_id]
+        except KeyError:
             raise UnsupportedWorkflow(task["workflowType"]) from None
-        return workflows[idx]
 
     def _respond_decision_task_completed(
         self, decisions: t.List[t.Dict[str, t.Any]], task: t.Dict[str, t.Any]
@@ -97,24 +251,196 @@ class Decider:
         """
 
         logger.debug(
-            "Sending %d decisions for task '%s'", len(decisions), task["taskToken"]
+            "Sending %d decisions for task '%s': %s",
+            len(decisions),
+            task["taskToken"],
+            _util.Payload(decisions),
         )
-        self.client.respond_decision_task_completed(
-            taskToken=task["taskToken"], decisions=decisions
+        start = time.perf_counter()
+        with _tracing.tracer.span("respond", n_decisions=len(decisions)):
+            self.client.respond_decision_task_completed(
+                taskToken=task["taskToken"], decisions=decisions
+            )
+        self.metrics.record_latency(
+            "respond", _get_workflow_id(task), time.perf_counter() - start
         )
 
+    def _wait_for_decision_tasks(self, n_in_flight: int = 0):
+        """Wait on in-flight decision tasks.
+
+        Args:
+            n_in_flight: wait until at most this many tasks are in flight,
+                not counting tasks queued by workflow concurrency limits
+                (unless waiting on all tasks)
+
+        Raises:
+            Exception: error of the first finished decision task which
+                failed
+        """
+
+        finished = {f for f in self._futures if f.done()}
+        while True:
+            pending = self._futures - finished
+            n_queued = 0
+            if n_in_flight:
+                n_queued = sum(b.n_queued for _, b in self._bulkheads.values())
+            if len(pending) - n_queued <= n_in_flight:
+                break
+            done, _ = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+            finished.update(done)
+        self._futures.difference_update(finished)
+        for future in finished:
+            future.result()
+
     def _poll_and_run(self):
-        """Perform poll, and possibly run decision task."""
-        task = self._poll_for_decision_task()
-        logger.debug("Decision task: %s", task)
+        """Perform poll, and possibly run decision task.
+
+        With pipelining, the decision task is run in the background, after
+        waiting for the number of in-flight tasks to fall to the pipeline
+        depth before polling. A decision task beyond its workflow's
+        decision concurrency queue limit is dropped, to be rescheduled by
+        SWF on time-out, so polling isn't held up for other workflows.
+        """
+
+        self._wait_for_decision_tasks(self.pipeline_depth)
+        tracer = _tracing.tracer
+        span = tracer.start_span("decision_task")
+        try:
+            with tracer.span("poll", span):
+                task = self._poll_for_decision_task()
+        except BaseException as e:
+            span.end(e)
+            raise
+        logger.debug("Decision task: %s", _util.Payload(task))
         if not task["taskToken"]:
+            tracer.discard(span)
             return
-        executor = cf.ThreadPoolExecutor(max_workers=1)
-        self._future = executor.submit(self._decide_and_respond, task)
-        self._future.result()
+        span.set_attribute("workflow", "-".join(_get_workflow_id(task)))
+        span.set_attribute("workflow_id", task["workflowExecution"]["workflowId"])
+        span.set_attribute("run_id", task["workflowExecution"]["runId"])
+        span.set_attribute("n_events", len(task.get("events") or ()))
+        try:
+            bulkhead = self._get_bulkhead(task)
+            if bulkhead:
+                future = bulkhead.submit(self._decide_and_respond, task, span)
+            else:
+                future = self._executor.submit(self._decide_and_respond, task, span)
+        except _bulkhead.BulkheadFull:
+            _fmt = "Dropping decision task '%s': too many queued tasks for %s"
+            logger.warning(_fmt, task["taskToken"], task["workflowType"])
+            self.metrics.increment("decision_tasks_dropped")
+            span.set_attribute("dropped", True)
+            span.end()
+            return
+        except BaseException as e:
+            span.end(e)
+            raise
+        self._futures.add(future)
+        if not self.pipeline_depth:
+            self._wait_for_decision_tasks()
 
-    def _decide_and_respond(self, task):
-        """Make and respond with decisions."""
+    def _get_bulkhead(self, task: t.Dict[str, t.Any]) -> _bulkhead.Bulkhead:
+        """Get decision task concurrency limiter of task's workflow.
+
+        Without pipelining, decision tasks are already handled one at a
+        time, so workflows' decision concurrency limits are ignored.
+
+        Args:
+            task: decision task
+
+        Returns:
+            workflow's concurrency limiter, or ``None`` if unlimited
+        """
+
+        if not self.pipeline_depth:
+            return None
+        workflow_id = _get_workflow_id(task)
+        workflow = (self._workflows or {}).get(workflow_id)
+        concurrency = workflow and workflow.decision_concurrency
+        if not concurrency:
+            return None
+        config, bulkhead = self._bulkheads.get(workflow_id, (None, None))
+        if config != concurrency:  # new or reloaded configuration
+            bulkhead = _bulkhead.Bulkhead(
+                self._executor, concurrency.max_tasks, concurrency.max_queued
+            )
+            self._bulkheads[workflow_id] = (concurrency, bulkhead)
+        return bulkhead
+
+    def _get_deadline(
+        self, task: t.Dict[str, t.Any], workflow: _specs.Workflow
+    ) -> t.Union[datetime.datetime, None]:
+        """Get the time by which the decision task must be responded to.
+
+        The decision task time-out is taken from the task's scheduling
+        event, falling back to the workflow's registration configuration.
+
+        Args:
+            task: decision task
+            workflow: task's workflow specification
+
+        Returns:
+            decision task deadline, or ``None`` if unlimited or unknown
+        """
+
+        events = task.get("events") or ()
+        if len(events) < 2 or "eventTimestamp" not in events[-1]:
+            return None
+        started_event, scheduled_event = events[-1], events[-2]
+        assert started_event["eventType"] == "DecisionTaskStarted"
+
+        timeout = None
+        if scheduled_event["eventType"] == "DecisionTaskScheduled":
+            attrs = scheduled_event.get("decisionTaskScheduledEventAttributes", {})
+            timeout = attrs.get("startToCloseTimeout")
+        if timeout is None and workflow.registration:
+            timeout = workflow.registration.task_timeout
+        if timeout is None or timeout == "NONE":
+            return None
+        return started_event["eventTimestamp"] + datetime.timedelta(
+            seconds=int(timeout)
+        )
+
+    def _is_stale(self, task: t.Dict[str, t.Any], workflow: _specs.Workflow) -> bool:
+        """Check if there's no time left to make and respond with decisions.
+
+        Stale tasks are left to time out rather than decided: the execution
+        isn't failed, as SWF then schedules a new decision task for it.
+
+        Args:
+            task: decision task
+            workflow: task's workflow specification
+        """
+
+        deadline = self._get_deadline(task, workflow)
+        if deadline is None:
+            return False
+        now = datetime.datetime.now(datetime.timezone.utc)
+        remaining = (deadline - now).total_seconds()
+        return remaining < self.deadline_margin
+
+    def _decide_and_respond(self, task: t.Dict[str, t.Any], span: _tracing.Span = None):
+        """Make and respond with decisions, tracing.
+
+        Args:
+            task: decision task
+            span: decision task's trace span, finished on return, default:
+                start a new span
+        """
+
+        tracer = _tracing.tracer
+        with tracer.activate(span or tracer.start_span("decision_task")) as span:
+            self._decide_and_respond_traced(task, span)
+
+    def _decide_and_respond_traced(self, task: t.Dict[str, t.Any], span: _tracing.Span):
+        """Make and respond with decisions.
+
+        Args:
+            task: decision task
+            span: decision task's trace span
+        """
+
+        tracer = _tracing.tracer
         logger.info(
             "Got decision task '%s' for workflow '%s-%s' execution '%s' (run '%s')",
             task["taskToken"],
@@ -124,18 +450,48 @@ class Decider:
             task["workflowExecution"]["runId"],
         )
         try:
-            workflow = self._get_workflow(task)
+            with tracer.span("get_workflow"):
+                workflow = self._get_workflow(task)
         except UnsupportedWorkflow:
             logger.error("Unsupported workflow type: %s" % task["workflowType"])
             raise
-        workflow.setup()
 
+        if self._is_stale(task, workflow):
+            logger.warning(
+                "Skipping decision task '%s': decision time-out has passed, "
+                "leaving SWF to schedule a new decision task",
+                task["taskToken"],
+            )
+            self.metrics.increment("decision_tasks_skipped")
+            span.set_attribute("skipped", True)
+            return
+
+        memo_key = _get_decisions_memo_key(task, workflow)
+        decisions = self._decisions_memo.get(memo_key)
         exc = None
-        try:
-            decisions = workflow.make_decisions(task)
-        except Exception as e:
-            decisions = _specs.make_decisions_on_error(e)
-            exc = e
+        if decisions is not None:
+            _fmt = "Reusing decisions built for run '%s' at event %d"
+            logger.info(_fmt, memo_key[0], memo_key[1])
+            self.metrics.increment("decisions_reused")
+            span.set_attribute("reused", True)
+        else:
+            start = time.perf_counter()
+            try:
+                if self.profiler:
+                    decisions = self.profiler.make_decisions(workflow, task)
+                else:
+                    decisions = workflow.make_decisions(task)
+            except Exception as e:
+                decisions = _specs.make_decisions_on_error(e)
+                exc = e
+            else:
+                if memo_key:
+                    self._decisions_memo.set(memo_key, decisions)
+            self.metrics.record_latency(
+                "decide", _get_workflow_id(task), time.perf_counter() - start
+            )
+        if self._recorder:
+            self._recorder.record(task, decisions)
         self._respond_decision_task_completed(decisions, task)
         if exc:
             raise exc
@@ -147,28 +503,146 @@ class Decider:
         while True:
             self._poll_and_run()
 
+    def _start_watcher(self):
+        """Start reloading workflow specifications on file modification."""
+        self._watcher = _watch.Watcher(
+            self.workflows_spec_files, self._reload_workflows, self.watch_interval
+        )
+        self._watcher.start()
+
+    def _stop_watcher(self):
+        """Stop watching workflow specifications files."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _start_reporter(self):
+        """Start periodically reporting latencies, if configured."""
+        if self.report_interval:
+            self._reporter = _metrics.Reporter(self.metrics, self.report_interval)
+            self._reporter.start()
+
+    def _stop_reporter(self):
+        """Stop reporting latencies, reporting any since the last report."""
+        if self._reporter:
+            self._reporter.stop()
+            self._reporter = None
+
     def run(self):
         """Run decider."""
+        if self.profiler:
+            self.profiler.install_signal_handler()
+        self._load_workflows()
+        self._start_watcher()
+        self._start_reporter()
         try:
             self._run_uncaught()
         except KeyboardInterrupt:
             logger.info("Quitting due to keyboard-interrupt")
-        if self._future and self._future.running():
-            logger.log(25, "Waiting on current decision task to be handled")
-            self._future.result()
+        finally:
+            self._stop_watcher()
+        n_in_flight = sum(not f.done() for f in self._futures)
+        if n_in_flight:
+            _fmt = "Waiting on %d current decision tasks to be handled"
+            logger.log(25, _fmt, n_in_flight)
+        try:
+            self._wait_for_decision_tasks()
+        finally:
+            self._executor.shutdown()
+            self._stop_reporter()
+            if self._recorder:
+                self._recorder.close()
+            if _tracing.tracer.exporter:
+                _tracing.tracer.exporter.close()
+
+
+def _get_workflow_id(task: t.Dict[str, t.Any]) -> t.Tuple[str, str]:
+    """Get name and version of decision task's workflow."""
+    return task["workflowType"]["name"], task["workflowType"]["version"]
+
+
+def _get_history_attributes(
+    workflow: _specs.Workflow,
+) -> t.Union[t.Dict[str, t.Tuple[str]], None]:
+    """Get history event attributes used by the workflow and decider.
+
+    Args:
+        workflow: workflow specification
+
+    Returns:
+        names of attributes to keep for each event type, or ``None`` for
+            all attributes
+    """
+
+    if workflow.history_attributes is None:
+        return None
+    attribute_names = dict(workflow.history_attributes)
+    for event_type, names in _decider_history_attributes.items():
+        attribute_names[event_type] = tuple(attribute_names.get(event_type, ())) + names
+    return attribute_names
+
+
+def _get_decisions_memo_key(
+    task: t.Dict[str, t.Any], workflow: _specs.Workflow
+) -> t.Union[t.Tuple[str, int, _specs.Workflow], None]:
+    """Get key of decision task's built decisions.
+
+    The history position is the ID of the last event which isn't for
+    decision task scheduling, starting or time-out: repeated decision
+    tasks with the same position (eg a decision task rescheduled after
+    time-out) have the same decisions.
+
+    Args:
+        task: decision task
+        workflow: task's workflow specification
+
+    Returns:
+        execution run ID, history position and workflow, or ``None`` if
+            the task has no history
+    """
+
+    for event in reversed(task.get("events") or ()):
+        if event["eventType"] not in _decision_task_events:
+            return task["workflowExecution"]["runId"], event["eventId"], workflow
+    return None
 
 
 def run_app(
-    workflows_spec_file: pathlib.Path, domain: str, task_list: str, identity: str = None
+    workflows_spec_files: t.List[pathlib.Path],
+    domain: str,
+    task_list: str,
+    identity: str = None,
+    compact_history: bool = False,
+    pipeline_depth: int = 0,
+    record_file: pathlib.Path = None,
+    profiler: _profiling.Profiler = None,
+    report_interval: float = None,
 ):
     """Run decider application.
 
     Arguments:
-        workflows_spec_file: workflows specifications file path
+        workflows_spec_files: workflows specifications file and directory
+            paths
         domain: SWF domain
         task_list: SWF decider task-list
         identity: decider identity, default: automatically generated
+        compact_history: store decision task history in compact form
+        pipeline_depth: maximum number of decision tasks in flight while
+            polling
+        record_file: decision tasks recording file
+        profiler: decision-making profiler
+        report_interval: latency summary logging interval (seconds)
     """
 
-    decider = Decider(workflows_spec_file, domain, task_list, identity)
+    decider = Decider(
+        workflows_spec_files,
+        domain,
+        task_list,
+        identity,
+        compact_history,
+        pipeline_depth,
+        record_file,
+        profiler,
+        report_interval,
+    )
     decider.run()
@@ -160,13 +160,14 @@ def register_workflows(workflows: t.List[_specs.Workflow], domain: str):
         _sync_workflow(workflow, domain, existing, client)
 
 
-def run_app(workflows_spec_file: pathlib.Path, domain: str):
+def run_app(workflows_spec_files: t.List[pathlib.Path], domain: str):
     """Run registration synchronisation application.
 
     Arguments:
-        workflows_spec_file: workflows specifications file path
+        workflows_spec_files: workflows specifications file and directory
+            paths
         domain: SWF domain
     """
 
-    workflows = _specs.load_workflows(workflows_spec_file)
+    workflows = _specs.WorkflowsLoader(workflows_spec_files).load()
     register_workflows(workflows, domain)
@@ -0,0 +1,138 @@
+"""SWF decision task replay."""
+
+import time
+import pathlib
+import tracemalloc
+import typing as t
+import logging as lg
+
+from . import _util
+from . import _specs
+from . import _metrics
+from . import _recording
+
+logger = lg.getLogger(__name__)
+
+
+def _make_decisions(
+    workflow: _specs.Workflow, task: t.Dict[str, t.Any]
+) -> t.List[t.Dict[str, t.Any]]:
+    """Make decisions as the decider would, including on error."""
+    try:
+        return workflow.make_decisions(task)
+    except Exception as e:
+        return _specs.make_decisions_on_error(e)
+
+
+def replay_task(
+    workflow: _specs.Workflow, task: t.Dict[str, t.Any]
+) -> t.Tuple[t.List[t.Dict[str, t.Any]], float, int]:
+    """Replay decision task.
+
+    Decisions are made twice: once timed, then once with memory allocation
+    tracing (which would distort the timing).
+
+    Args:
+        workflow: task's workflow specification
+        task: decision task
+
+    Returns:
+        decisions, decision-making duration (seconds) and peak allocated
+            memory (bytes)
+    """
+
+    start = time.perf_counter()
+    decisions = _make_decisions(workflow, task)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        _make_decisions(workflow, task)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return decisions, duration, peak_memory
+
+
+def replay(workflows: t.List[_specs.Workflow], recording_file: pathlib.Path) -> int:
+    """Replay recorded decision tasks, reporting performance and differences.
+
+    Args:
+        workflows: workflows specifications
+        recording_file: decision tasks recording file
+
+    Returns:
+        number of tasks whose decisions differ from the recording
+    """
+
+    registry = {}
+    for workflow in workflows:
+        workflow.setup()
+        registry[(workflow.name, workflow.version)] = workflow
+
+    durations = []
+    peak_memory = 0
+    n_different = 0
+    n_unsupported = 0
+    for j, record in enumerate(_recording.load_recording(recording_file)):
+        task = record["task"]
+        workflow_id = (task["workflowType"]["name"], task["workflowType"]["version"])
+        if workflow_id not in registry:
+            _fmt = "Skipping task %d: unsupported workflow type: %s"
+            logger.warning(_fmt, j, task["workflowType"])
+            n_unsupported += 1
+            continue
+
+        decisions, duration, task_peak_memory = replay_task(registry[workflow_id], task)
+        durations.append(duration)
+        peak_memory = max(peak_memory, task_peak_memory)
+        if decisions != record["decisions"]:
+            n_different += 1
+            logger.error(
+                "Decisions differ for task %d (execution '%s', run '%s'):"
+                "\n  recorded: %s\n  replayed: %s",
+                j,
+                task["workflowExecution"]["workflowId"],
+                task["workflowExecution"]["runId"],
+                _util.Payload(record["decisions"]),
+                _util.Payload(decisions),
+            )
+
+    durations.sort()
+    _fmt = (
+        "Replayed %d decision tasks (%d unsupported): latency (ms) p50 %.3f, "
+        "p90 %.3f, p99 %.3f, max %.3f; peak memory %.1f KiB; %d with "
+        "different decisions"
+    )
+    logger.log(
+        25,
+        _fmt,
+        len(durations),
+        n_unsupported,
+        _metrics.percentile(durations, 50) * 1e3,
+        _metrics.percentile(durations, 90) * 1e3,
+        _metrics.percentile(durations, 99) * 1e3,
+        _metrics.percentile(durations, 100) * 1e3,
+        peak_memory / 1024,
+        n_different,
+    )
+    return n_different
+
+
+def run_app(
+    workflows_spec_files: t.List[pathlib.Path], recording_file: pathlib.Path
+) -> int:
+    """Run decision task replay application.
+
+    Arguments:
+        workflows_spec_files: workflows specifications file and directory
+            paths
+        recording_file: decision tasks recording file
+
+    Returns:
+        application exit status: 1 if any decisions differ, otherwise 0
+    """
+
+    workflows = _specs.WorkflowsLoader(workflows_spec_files).load()
+    n_different = replay(workflows, recording_file)
+    return 1 if n_different else 0
@@ -0,0 +1,65 @@
+"""Test ``seddy._bulkhead``."""
+
+import threading
+from concurrent import futures as cf
+
+from seddy import _bulkhead as seddy_bulkhead
+import pytest
+
+
+class TestBulkhead:
+    """Test ``seddy._bulkhead.Bulkhead``."""
+
+    @pytest.fixture
+    def executor(self):
+        """Task executor."""
+        executor = cf.ThreadPoolExecutor(max_workers=4)
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def instance(self, executor):
+        """Bulkhead instance."""
+        return seddy_bulkhead.Bulkhead(executor, 1, max_queued=1)
+
+    def test_submit(self, instance):
+        """Test excess tasks are queued until running tasks finish."""
+        # Setup environment
+        release = threading.Event()
+        started = []
+
+        def fn(x):
+            started.append(x)
+            assert release.wait(1.0)
+            return x * 2
+
+        # Run function
+        future1 = instance.submit(fn, 3)
+        future2 = instance.submit(fn, 4)
+        assert instance.n_queued == 1
+        with pytest.raises(seddy_bulkhead.BulkheadFull):
+            instance.submit(fn, 5)
+        release.set()
+
+        # Check result
+        assert future1.result(1.0) == 6
+        assert future2.result(1.0) == 8
+        assert started == [3, 4]
+        assert instance.n_queued == 0
+        assert instance._n_running == 0
+
+    def test_submit_raises(self, instance):
+        """Test task errors are passed to the task's future."""
+
+        # Build input
+        def fn():
+            raise ValueError("spam")
+
+        # Run function
+        future = instance.submit(fn)
+
+        # Check result
+        with pytest.raises(ValueError) as e:
+            future.result(1.0)
+        assert str(e.value) == "spam"
+        assert instance._n_running == 0
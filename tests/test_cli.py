@@ -2,15 +2,26 @@
 
 import sys
 import json
+import pathlib
 import logging as lg
 from unittest import mock
 
 from seddy import __main__ as seddy_main
 from seddy import decider as seddy_decider
 from seddy import registration as seddy_registration
+from seddy import replay as seddy_replay
+from seddy import _specs as seddy_specs
+from seddy import _profiling as seddy_profiling
+from seddy import _ratelimit as seddy_ratelimit
+from seddy import _tracing as seddy_tracing
+from seddy import _util as seddy_util
 import pytest
 import coloredlogs
-import pkg_resources
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # pragma: no cover
+    import importlib_metadata
 
 
 @pytest.fixture
@@ -109,6 +120,75 @@ def test_json_logging(decider_mock, tmp_path, coloredlogs_module, capsys):
     }
 
 
+def test_queue_logging(decider_mock, tmp_path):
+    """Ensure queue logging options are passed to logging set-up."""
+    # Setup environment
+    setup_logging_mock = mock.Mock()
+    setup_logging_patch = mock.patch.object(
+        seddy_util, "setup_logging", setup_logging_mock
+    )
+
+    # Run function
+    parser = seddy_main.build_parser()
+    args = parser.parse_args(
+        ["--queue-logging", "--log-payload-size", "50", "decider"]
+        + [str(tmp_path / "workflows.json"), "spam", "eggs"]
+    )
+    with setup_logging_patch:
+        seddy_main.run_app(args)
+
+    # Check logging configuration
+    setup_logging_mock.assert_called_once_with(0, False, True, 50)
+
+
+def test_rate_limit(decider_mock, tmp_path):
+    """Ensure SWF request rate limits are scaled as configured."""
+    # Setup environment
+    rate_limiter = seddy_ratelimit.RateLimiter()
+    rate_limiter_patch = mock.patch.object(
+        seddy_ratelimit, "rate_limiter", rate_limiter
+    )
+
+    # Run function
+    parser = seddy_main.build_parser()
+    args = parser.parse_args(
+        ["--rate-limit", "0.5", "decider", str(tmp_path / "a.json"), "spam", "eggs"]
+    )
+    with rate_limiter_patch:
+        seddy_main.run_app(args)
+        res = seddy_ratelimit.rate_limiter
+
+    # Check configuration
+    assert res is not rate_limiter
+    assert res.buckets["poll"].rate == 100.0
+    assert res.buckets["list"].burst == 50.0
+    decider_mock.assert_called_once()
+
+
+@pytest.mark.parametrize("scale", ["0", "-1", "spam"])
+def test_rate_limit_invalid(scale):
+    """Ensure non-positive rate-limit scales are rejected."""
+    parser = seddy_main.build_parser()
+    with pytest.raises(SystemExit) as e:
+        parser.parse_args(["--rate-limit", scale, "decider", "a.json", "spam", "eggs"])
+    assert e.value.code == 2
+
+
+def test_json_logging_unavailable():
+    """Ensure JSON logging option is unavailable without its dependency."""
+    # Setup environment
+    has_module_patch = mock.patch.object(
+        seddy_main, "_has_module", mock.Mock(return_value=False)
+    )
+
+    # Run function
+    with has_module_patch:
+        parser = seddy_main.build_parser()
+    with pytest.raises(SystemExit) as e:
+        parser.parse_args(["-J", "decider", "a.json", "spam", "eggs"])
+    assert e.value.code == 2
+
+
 @pytest.mark.parametrize(
     ("command_line_args", "description"),
     [
@@ -125,6 +205,11 @@ def test_json_logging(decider_mock, tmp_path, coloredlogs_module, capsys):
             "Synchronise workflow registration status with SWF.",
             id='"register -h"',
         ),
+        pytest.param(
+            ["replay", "-h"],
+            "Replay recorded decision tasks, comparing decisions.",
+            id='"replay -h"',
+        ),
     ],
 )
 def test_usage(decider_mock, command_line_args, capsys, description):
@@ -138,7 +223,7 @@ def test_usage(decider_mock, command_line_args, capsys, description):
     # Check output
     res_out = capsys.readouterr().out
     assert res_out[:6] == "usage:"
-    assert res_out.splitlines()[2] == description
+    assert res_out.split("\n\n")[1] == description
 
 
 @pytest.mark.parametrize(
@@ -162,42 +247,190 @@ def test_version(decider_mock, command_line_args, capsys):
 
     # Check output
     res_out = capsys.readouterr().out
-    assert res_out.strip() == pkg_resources.get_distribution("seddy").version
+    assert res_out.strip() == importlib_metadata.version("seddy")
 
 
 @pytest.mark.parametrize(
     ("args_extra", "decider_args"),
     [
-        pytest.param([], [None], id='""'),
-        pytest.param(["-i", "abcd1234"], ["abcd1234"], id='"-i abcd1234"'),
+        pytest.param([], [None, False, 0, None, None, None], id='""'),
+        pytest.param(
+            ["-i", "abcd1234"],
+            ["abcd1234", False, 0, None, None, None],
+            id='"-i abcd1234"',
+        ),
+        pytest.param(
+            ["--compact-history"],
+            [None, True, 0, None, None, None],
+            id='"--compact-history"',
+        ),
+        pytest.param(["-p", "2"], [None, False, 2, None, None, None], id='"-p 2"'),
+        pytest.param(
+            ["--record", "tasks.jsonl.gz"],
+            [None, False, 0, pathlib.Path("tasks.jsonl.gz"), None, None],
+            id='"--record tasks.jsonl.gz"',
+        ),
+        pytest.param(
+            ["--report-interval", "60"],
+            [None, False, 0, None, None, 60.0],
+            id='"--report-interval 60"',
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "workflows_files",
+    [
+        pytest.param(["workflows.json"], id="file"),
+        pytest.param(["workflows.json", "workflows.d"], id="files"),
     ],
 )
-def test_decider(decider_mock, tmp_path, args_extra, decider_args):
+def test_decider(decider_mock, tmp_path, args_extra, decider_args, workflows_files):
     """Ensure decider application is run with the correct input."""
+    # Build input
+    workflows_paths = [tmp_path / f for f in workflows_files]
+
     # Run function
     parser = seddy_main.build_parser()
     args = parser.parse_args(
-        ["decider", str(tmp_path / "workflows.json"), "spam", "eggs"] + args_extra
+        ["decider"] + [str(p) for p in workflows_paths] + ["spam", "eggs"] + args_extra
     )
     seddy_main.run_app(args)
 
     # Check application input
-    decider_mock.assert_called_once_with(
-        tmp_path / "workflows.json", "spam", "eggs", *decider_args
+    decider_mock.assert_called_once_with(workflows_paths, "spam", "eggs", *decider_args)
+
+
+@pytest.mark.parametrize(
+    ("args_extra", "exp"),
+    [
+        pytest.param(
+            ["--trace-file", "spans.jsonl"],
+            seddy_tracing.JSONLExporter,
+            id='"--trace-file spans.jsonl"',
+        ),
+        pytest.param(
+            ["--trace-file", "spans.jsonl", "--trace-format", "otlp"],
+            seddy_tracing.OTLPJSONExporter,
+            id='"--trace-file spans.jsonl --trace-format otlp"',
+        ),
+    ],
+)
+def test_decider_tracing(decider_mock, tmp_path, args_extra, exp):
+    """Ensure decision task traces are exported as configured."""
+    # Setup environment
+    tracer = seddy_tracing.Tracer()
+    tracer_patch = mock.patch.object(seddy_tracing, "tracer", tracer)
+
+    # Run function
+    parser = seddy_main.build_parser()
+    args = parser.parse_args(
+        ["decider", str(tmp_path / "workflows.json"), "spam", "eggs"] + args_extra
+    )
+    with tracer_patch:
+        seddy_main.run_app(args)
+
+    # Check configuration
+    assert type(tracer.exporter) is exp
+    assert tracer.exporter.path == pathlib.Path("spans.jsonl")
+
+
+@pytest.mark.parametrize(
+    ("args_extra", "exp"),
+    [
+        pytest.param(
+            ["--profile-dir", "profiles"],
+            (1.0, None, False, True),
+            id='"--profile-dir profiles"',
+        ),
+        pytest.param(
+            [
+                "--profile-dir",
+                "profiles",
+                "--profile-sample-rate",
+                "0.1",
+                "--profile-threshold",
+                "2.5",
+                "--profile-memory",
+                "--profile-paused",
+            ],
+            (0.1, 2.5, True, False),
+            id='"--profile-dir profiles --profile-sample-rate 0.1 ..."',
+        ),
+    ],
+)
+def test_decider_profiling(decider_mock, tmp_path, args_extra, exp):
+    """Ensure decider application is run with the configured profiler."""
+    # Run function
+    parser = seddy_main.build_parser()
+    args = parser.parse_args(
+        ["decider", str(tmp_path / "workflows.json"), "spam", "eggs"] + args_extra
     )
+    seddy_main.run_app(args)
+
+    # Check application input
+    profiler = decider_mock.call_args[0][-2]
+    assert isinstance(profiler, seddy_profiling.Profiler)
+    assert profiler.directory == pathlib.Path("profiles")
+    assert (
+        profiler.sample_rate,
+        profiler.threshold,
+        profiler.trace_memory,
+        profiler.enabled,
+    ) == exp
 
 
-def test_register(tmp_path):
+@pytest.mark.parametrize(
+    "workflows_files",
+    [
+        pytest.param(["workflows.json"], id="file"),
+        pytest.param(["workflows.json", "workflows.d"], id="files"),
+    ],
+)
+def test_register(tmp_path, workflows_files):
     """Ensure workflow registration application is run correctly."""
     # Setup environment
     run_app_mock = mock.Mock()
     run_app_patch = mock.patch.object(seddy_registration, "run_app", run_app_mock)
 
+    # Build input
+    workflows_paths = [tmp_path / f for f in workflows_files]
+
     # Run function
     parser = seddy_main.build_parser()
-    args = parser.parse_args(["register", str(tmp_path / "workflows.json"), "spam"])
+    args = parser.parse_args(
+        ["register"] + [str(p) for p in workflows_paths] + ["spam"]
+    )
     with run_app_patch:
         seddy_main.run_app(args)
 
     # Check application input
-    run_app_mock.assert_called_once_with(tmp_path / "workflows.json", "spam")
+    run_app_mock.assert_called_once_with(workflows_paths, "spam")
+
+
+@pytest.mark.parametrize(("n_different", "exp"), [(0, 0), (2, 1)])
+def test_replay(tmp_path, n_different, exp):
+    """Ensure decision task replay application is run correctly."""
+    # Setup environment
+    replay_mock = mock.Mock(return_value=n_different)
+    replay_patch = mock.patch.object(seddy_replay, "replay", replay_mock)
+    workflows_mock = [mock.Mock()]
+    loader_mock = mock.Mock(spec=seddy_specs.WorkflowsLoader)
+    loader_mock.return_value.load.return_value = workflows_mock
+    loader_patch = mock.patch.object(seddy_specs, "WorkflowsLoader", loader_mock)
+
+    # Build input
+    workflows_paths = [tmp_path / "workflows.json", tmp_path / "workflows.d"]
+    recording_path = tmp_path / "tasks.jsonl.gz"
+
+    # Run function
+    parser = seddy_main.build_parser()
+    args = parser.parse_args(
+        ["replay", str(recording_path)] + [str(p) for p in workflows_paths]
+    )
+    with replay_patch, loader_patch:
+        res = seddy_main.run_app(args)
+
+    # Check result
+    assert res == exp
+    loader_mock.assert_called_once_with(workflows_paths)
+    replay_mock.assert_called_once_with(workflows_mock, recording_path)
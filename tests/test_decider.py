@@ -1,12 +1,20 @@
 """Test ``seddy.decider``."""
 
 import os
+import time
 import socket
+import datetime
+import threading
 from unittest import mock
 from concurrent import futures as cf
 
 from seddy import decider as seddy_decider
+from seddy import _watch as seddy_watch
 from seddy import _specs as seddy_specs
+from seddy import _recording as seddy_recording
+from seddy import _profiling as seddy_profiling
+from seddy import _metrics as seddy_metrics
+from seddy import _tracing as seddy_tracing
 import moto
 import pytest
 from botocore import client as botocore_client
@@ -43,15 +51,16 @@ class TestDecider:
             yield env_update
 
     @pytest.fixture
-    def workflows_spec_file(self, tmp_path):
-        return tmp_path / "workflows.json"
+    def workflows_spec_files(self, tmp_path):
+        return [tmp_path / "workflows.json"]
 
     @pytest.fixture
-    def instance(self, workflows_spec_file, aws_environment):
-        return seddy_decider.Decider(workflows_spec_file, "spam", "eggs", "abcd1234")
+    def instance(self, workflows_spec_files, aws_environment):
+        return seddy_decider.Decider(workflows_spec_files, "spam", "eggs", "abcd1234")
 
-    def test_init(self, instance, workflows_spec_file):
-        assert instance.workflows_spec_file == workflows_spec_file
+    def test_init(self, instance, workflows_spec_files):
+        assert instance.workflows_spec_files == workflows_spec_files
+        assert instance._workflows_loader.paths == workflows_spec_files
         assert instance.domain == "spam"
         assert instance.task_list == "eggs"
         assert isinstance(instance.client, botocore_client.BaseClient)
@@ -83,6 +92,8 @@ class TestDecider:
     @moto.mock_swf
     def test_poll_for_decision_task(self, instance, patch_moto_swf_decision_task):
         # Setup environment
+        load_mock = mock.Mock(return_value=[])
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
         instance.client.register_domain(
             name="spam", workflowExecutionRetentionPeriodInDays="2"
         )
@@ -100,7 +111,8 @@ class TestDecider:
         )
 
         # Run function
-        res = instance._poll_for_decision_task()
+        with load_patch:
+            res = instance._poll_for_decision_task()
 
         # Check result
         assert res == {
@@ -143,10 +155,68 @@ class TestDecider:
             "workflowType": {"name": "bar", "version": "0.42"},
         }
 
+    @pytest.mark.parametrize("compact", [False, True])
+    @pytest.mark.parametrize("workflow_type", ["bar", "ham"])
+    def test_poll_for_decision_task_pruned(
+        self, instance, workflow_mocks, workflow_type, compact
+    ):
+        """Test decision task history pruning and compaction over pages."""
+        # Setup environment
+        instance.compact_history = compact
+        workflow_mocks[1].history_attributes = {"DecisionTaskStarted": ()}
+        load_mock = mock.Mock(return_value=workflow_mocks)
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
+        events = [
+            {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+            {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+            {
+                "eventId": 3,
+                "eventType": "DecisionTaskStarted",
+                "decisionTaskStartedEventAttributes": {"identity": "abcd1234"},
+            },
+        ]
+        pages = [
+            {
+                "events": events[:2],
+                "nextPageToken": "spam",
+                "taskToken": "eggs",
+                "startedEventId": 3,
+                "workflowType": {"name": workflow_type, "version": "0.42"},
+            },
+            {"events": events[2:], "taskToken": "eggs", "startedEventId": 3},
+        ]
+        poll_mock = mock.Mock(side_effect=pages)
+        poll_patch = mock.patch.object(
+            instance.client, "poll_for_decision_task", poll_mock
+        )
+
+        # Run function
+        with load_patch, poll_patch:
+            instance._load_workflows()
+            res = instance._poll_for_decision_task()
+
+        # Check result
+        assert res["taskToken"] == "eggs"
+        assert "nextPageToken" not in res
+        assert len(res["events"]) == 3
+        if workflow_type == "bar":
+            assert isinstance(res["events"], seddy_specs.History) is compact
+            assert res["events"][2]["decisionTaskStartedEventAttributes"] == {}
+        else:
+            assert res["events"][2]["decisionTaskStartedEventAttributes"] == {
+                "identity": "abcd1234"
+            }
+        assert poll_mock.call_args_list[1] == mock.call(
+            domain="spam",
+            identity="abcd1234",
+            taskList={"name": "eggs"},
+            nextPageToken="spam",
+        )
+
     def test_get_workflow(self, instance, workflow_mocks):
         # Setup environment
         load_mock = mock.Mock(return_value=workflow_mocks)
-        load_patch = mock.patch.object(seddy_specs, "load_workflows", load_mock)
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
 
         # Build input
         task = {
@@ -192,16 +262,97 @@ class TestDecider:
 
         # Run function
         with load_patch:
+            instance._load_workflows()
             res = instance._get_workflow(task)
 
         # Check result
         assert res is workflow_mocks[1]
+        load_mock.assert_called_once_with()
+        for workflow_mock in workflow_mocks:
+            workflow_mock.setup.assert_called_once_with()
+
+    def test_get_workflow_not_loaded(self, instance, workflow_mocks):
+        """Check workflow specifications aren't loaded on getting a workflow."""
+        # Setup environment
+        load_mock = mock.Mock(return_value=workflow_mocks)
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
+
+        # Build input
+        task = {"workflowType": {"name": "bar", "version": "0.42"}}
+
+        # Run function
+        with pytest.raises(seddy_decider.UnsupportedWorkflow):
+            with load_patch:
+                instance._get_workflow(task)
+
+        # Check result
+        load_mock.assert_not_called()
+        workflow_mocks[1].setup.assert_not_called()
+
+    def test_load_workflows_locked(self, instance, workflow_mocks):
+        """Check workflow specifications are loaded and set up under lock."""
+
+        # Setup environment
+        def setup():
+            assert instance._workflows_lock.locked()
+            assert instance._workflows is None
+
+        workflow_mocks[0].setup.side_effect = setup
+        load_mock = mock.Mock(return_value=workflow_mocks)
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
+
+        # Run function
+        with load_patch:
+            instance._load_workflows()
+
+        # Check result
+        workflow_mocks[0].setup.assert_called_once_with()
+        assert not instance._workflows_lock.locked()
+        assert len(instance._workflows) == 3
+
+    def test_reload_workflows(self, instance, workflow_mocks):
+        """Check workflow specifications reload replaces registry."""
+        # Setup environment
+        instance._workflows = {
+            ("spam", "1.0"): workflow_mocks[0],
+            ("bar", "0.42"): workflow_mocks[1],
+        }
+        load_mock = mock.Mock(return_value=workflow_mocks[1:])
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
+
+        # Run function
+        with load_patch:
+            instance._reload_workflows()
+
+        # Check result
+        assert instance._workflows == {
+            ("bar", "0.42"): workflow_mocks[1],
+            ("spam", "1.1"): workflow_mocks[2],
+        }
+        workflow_mocks[0].setup.assert_not_called()
+        workflow_mocks[1].setup.assert_not_called()
+        workflow_mocks[2].setup.assert_called_once_with()
+
+    def test_reload_workflows_invalid(self, instance, workflow_mocks):
+        """Check failed workflow specifications reload keeps registry."""
+        # Setup environment
+        workflows = {("spam", "1.0"): workflow_mocks[0]}
+        instance._workflows = workflows
+        load_mock = mock.Mock(side_effect=ValueError("Unknown extension: .spam"))
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
+
+        # Run function
+        with load_patch:
+            instance._reload_workflows()
+
+        # Check result
+        assert instance._workflows is workflows
 
     def test_get_workflow_unsupported(self, instance, workflow_mocks):
         """Check workflow-get raises for unsupported workflows."""
         # Setup environment
         load_mock = mock.Mock(return_value=workflow_mocks)
-        load_patch = mock.patch.object(seddy_specs, "load_workflows", load_mock)
+        load_patch = mock.patch.object(instance._workflows_loader, "load", load_mock)
 
         # Build input
         task = {
@@ -214,6 +365,7 @@ class TestDecider:
         # Run function
         with pytest.raises(seddy_decider.UnsupportedWorkflow) as e:
             with load_patch:
+                instance._load_workflows()
                 instance._get_workflow(task)
 
         # Check result
@@ -316,6 +468,76 @@ class TestDecider:
         instance._get_workflow.assert_not_called()
         instance._respond_decision_task_completed.assert_not_called()
 
+    def test_poll_and_run_traced(self, workflow_mocks, aws_environment):
+        """Test decision task handling is traced."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+            "events": [
+                {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+                {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+            ],
+        }
+        empty_task = {"taskToken": ""}
+        exporter = mock.Mock(spec=seddy_tracing.Exporter)
+        tracer = seddy_tracing.Tracer(exporter)
+        tracer_patch = mock.patch.object(seddy_tracing, "tracer", tracer)
+
+        class Decider(seddy_decider.Decider):
+            _poll_for_decision_task = mock.Mock(side_effect=[empty_task, task])
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock()
+
+        workflow_mocks[1].make_decisions.return_value = []
+        instance = Decider(workflow_mocks, "spam", "eggs")
+
+        # Run function
+        with tracer_patch:
+            instance._poll_and_run()
+            instance._poll_and_run()
+
+        # Check result
+        (spans,), _ = exporter.export.call_args
+        assert [s.name for s in spans] == ["poll", "get_workflow", "decision_task"]
+        assert spans[-1].attributes == {
+            "workflow": "bar-0.42",
+            "workflow_id": "1234",
+            "run_id": "9abc",
+            "n_events": 2,
+        }
+        assert {s.parent_id for s in spans[:-1]} == {spans[-1].span_id}
+        assert not tracer._traces
+
+    def test_poll_and_run_traced_submit_error(self, workflow_mocks, aws_environment):
+        """Test decision task trace ends if its handling can't be started."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+        }
+        exporter = mock.Mock(spec=seddy_tracing.Exporter)
+        tracer = seddy_tracing.Tracer(exporter)
+        tracer_patch = mock.patch.object(seddy_tracing, "tracer", tracer)
+
+        class Decider(seddy_decider.Decider):
+            _poll_for_decision_task = mock.Mock(return_value=task)
+
+        instance = Decider(workflow_mocks, "spam", "eggs")
+        instance._executor.shutdown()
+
+        # Run function
+        with tracer_patch, pytest.raises(RuntimeError):
+            instance._poll_and_run()
+
+        # Check result
+        (spans,), _ = exporter.export.call_args
+        assert [s.name for s in spans] == ["poll", "decision_task"]
+        assert spans[-1].error.startswith("RuntimeError: ")
+        assert not tracer._traces
+
     def test_poll_and_run_unsupported(self, workflow_mocks, aws_environment):
         """Task for workflow not in specifications file."""
         # Setup environment
@@ -383,6 +605,351 @@ class TestDecider:
             [exp_decision], task
         )
 
+    def test_poll_and_run_pipelined(self, workflow_mocks, aws_environment):
+        """Decision task is handled while polling for the next."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+        }
+        responding = threading.Event()
+        responded = threading.Event()
+
+        def respond(decisions, task):
+            responding.set()
+            assert responded.wait(1.0)
+
+        class Decider(seddy_decider.Decider):
+            _poll_for_decision_task = mock.Mock(return_value=task)
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock(side_effect=respond)
+
+        workflow_mocks[1].make_decisions.return_value = []
+
+        instance = Decider(workflow_mocks, "spam", "eggs", pipeline_depth=1)
+
+        # Run function
+        instance._poll_and_run()
+        assert responding.wait(1.0)
+        assert len(instance._futures) == 1
+        instance._poll_for_decision_task.return_value = {"taskToken": ""}
+        instance._poll_and_run()
+        responded.set()
+        instance._wait_for_decision_tasks()
+
+        # Check calls
+        assert instance._poll_for_decision_task.call_count == 2
+        instance._respond_decision_task_completed.assert_called_once_with([], task)
+        assert not instance._futures
+
+    def test_poll_and_run_pipelined_error(self, workflow_mocks, aws_environment):
+        """Decision task error is raised before the next poll."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+        }
+
+        class Decider(seddy_decider.Decider):
+            _poll_for_decision_task = mock.Mock(return_value=task)
+            _get_workflow = mock.Mock(
+                side_effect=seddy_decider.UnsupportedWorkflow(task["workflowType"])
+            )
+            _respond_decision_task_completed = mock.Mock()
+
+        instance = Decider(workflow_mocks, "spam", "eggs", pipeline_depth=1)
+        instance._poll_and_run()
+        next(iter(instance._futures)).exception()
+
+        # Run function
+        with pytest.raises(seddy_decider.UnsupportedWorkflow):
+            instance._poll_and_run()
+
+        # Check calls
+        instance._poll_for_decision_task.assert_called_once_with()
+        assert not instance._futures
+
+    @pytest.mark.parametrize(
+        ("scheduled_attrs", "registration", "exp"),
+        [
+            pytest.param({"startToCloseTimeout": "10"}, None, 10, id="scheduled"),
+            pytest.param(
+                {"startToCloseTimeout": "10"},
+                seddy_specs.Registration(task_timeout=20),
+                10,
+                id="scheduled-registered",
+            ),
+            pytest.param(
+                {}, seddy_specs.Registration(task_timeout=20), 20, id="registered"
+            ),
+            pytest.param({}, seddy_specs.Registration(), None, id="unknown"),
+            pytest.param({"startToCloseTimeout": "NONE"}, None, None, id="unlimited"),
+        ],
+    )
+    def test_get_deadline(
+        self, instance, workflow_mocks, scheduled_attrs, registration, exp
+    ):
+        """Test decision task deadline calculation."""
+        # Build input
+        started = datetime.datetime(2020, 3, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        task = {
+            "taskToken": "spam",
+            "events": [
+                {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+                {
+                    "eventId": 2,
+                    "eventType": "DecisionTaskScheduled",
+                    "decisionTaskScheduledEventAttributes": scheduled_attrs,
+                },
+                {
+                    "eventId": 3,
+                    "eventTimestamp": started,
+                    "eventType": "DecisionTaskStarted",
+                },
+            ],
+        }
+        workflow_mocks[1].registration = registration
+
+        # Run function
+        res = instance._get_deadline(task, workflow_mocks[1])
+
+        # Check result
+        if exp is None:
+            assert res is None
+        else:
+            assert res == started + datetime.timedelta(seconds=exp)
+
+    @pytest.mark.parametrize(
+        ("seconds_ago", "exp_skipped"),
+        [pytest.param(5, False, id="fresh"), pytest.param(15, True, id="stale")],
+    )
+    def test_decide_and_respond_stale(
+        self, workflow_mocks, aws_environment, seconds_ago, exp_skipped
+    ):
+        """Test decision task is skipped after its decision time-out."""
+        # Setup environment
+        started = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+            seconds=seconds_ago
+        )
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+            "events": [
+                {
+                    "eventId": 2,
+                    "eventType": "DecisionTaskScheduled",
+                    "decisionTaskScheduledEventAttributes": {
+                        "startToCloseTimeout": "10"
+                    },
+                },
+                {
+                    "eventId": 3,
+                    "eventTimestamp": started,
+                    "eventType": "DecisionTaskStarted",
+                },
+            ],
+        }
+
+        class Decider(seddy_decider.Decider):
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock()
+
+        workflow_mocks[1].make_decisions.return_value = []
+        instance = Decider(workflow_mocks, "spam", "eggs")
+
+        # Run function
+        instance._decide_and_respond(task)
+
+        # Check calls
+        if exp_skipped:
+            workflow_mocks[1].make_decisions.assert_not_called()
+            instance._respond_decision_task_completed.assert_not_called()
+            assert instance.metrics.counts == {"decision_tasks_skipped": 1}
+        else:
+            instance._respond_decision_task_completed.assert_called_once_with([], task)
+            assert instance.metrics.counts == {}
+
+    def test_decide_and_respond_memo(self, workflow_mocks, aws_environment):
+        """Test decisions are reused for decision tasks rescheduled on time-out."""
+        # Setup environment
+        events = [
+            {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+            {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 3, "eventType": "DecisionTaskStarted"},
+            {"eventId": 4, "eventType": "DecisionTaskTimedOut"},
+            {"eventId": 5, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 6, "eventType": "DecisionTaskStarted"},
+            {"eventId": 7, "eventType": "DecisionTaskCompleted"},
+            {"eventId": 8, "eventType": "ActivityTaskScheduled"},
+            {"eventId": 9, "eventType": "ActivityTaskCompleted"},
+            {"eventId": 10, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 11, "eventType": "DecisionTaskStarted"},
+        ]
+        tasks = [
+            {
+                "taskToken": "spam%d" % j,
+                "workflowType": {"name": "bar", "version": "0.42"},
+                "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+                "events": events[:n_events],
+            }
+            for j, n_events in enumerate([3, 6, 11])
+        ]
+
+        class Decider(seddy_decider.Decider):
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock()
+
+        decisions = [[{"decisionType": "ScheduleActivityTask"}], []]
+        workflow_mocks[1].make_decisions.side_effect = decisions
+        instance = Decider(workflow_mocks, "spam", "eggs")
+
+        # Run function
+        for task in tasks:
+            instance._decide_and_respond(task)
+
+        # Check calls
+        assert workflow_mocks[1].make_decisions.call_args_list == [
+            mock.call(tasks[0]),
+            mock.call(tasks[2]),
+        ]
+        assert instance._respond_decision_task_completed.call_args_list == [
+            mock.call(decisions[0], tasks[0]),
+            mock.call(decisions[0], tasks[1]),  # rescheduled after time-out
+            mock.call(decisions[1], tasks[2]),
+        ]
+        assert instance.metrics.counts == {"decisions_reused": 1}
+        latencies = instance.metrics.pop_latencies()
+        assert latencies[(("bar", "0.42"), "decide")].count == 2
+
+    def test_decide_and_respond_record(self, workflow_mocks, aws_environment, tmp_path):
+        """Test decision tasks and their decisions are recorded."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+            "events": [{"eventId": 1, "eventType": "WorkflowExecutionStarted"}],
+            "ResponseMetadata": {"RequestId": "abcd"},
+        }
+
+        class Decider(seddy_decider.Decider):
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock()
+
+        decisions = [{"decisionType": "ScheduleActivityTask"}]
+        workflow_mocks[1].make_decisions.return_value = decisions
+        record_file = tmp_path / "tasks.jsonl.gz"
+        instance = Decider(workflow_mocks, "spam", "eggs", record_file=record_file)
+
+        # Run function
+        instance._decide_and_respond(task)
+        instance._recorder.close()
+
+        # Check recording
+        exp_task = {k: v for k, v in task.items() if k != "ResponseMetadata"}
+        records = list(seddy_recording.load_recording(record_file))
+        assert records == [{"task": exp_task, "decisions": decisions}]
+
+    def test_decide_and_respond_profiled(self, workflow_mocks, aws_environment):
+        """Test decisions are made by the profiler, if configured."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "workflowType": {"name": "bar", "version": "0.42"},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+        }
+
+        class Decider(seddy_decider.Decider):
+            _get_workflow = mock.Mock(return_value=workflow_mocks[1])
+            _respond_decision_task_completed = mock.Mock()
+
+        profiler = mock.Mock(spec=seddy_profiling.Profiler)
+        profiler.make_decisions.return_value = [{"decisionType": "Spam"}]
+        instance = Decider(workflow_mocks, "spam", "eggs", profiler=profiler)
+
+        # Run function
+        instance._decide_and_respond(task)
+
+        # Check calls
+        profiler.make_decisions.assert_called_once_with(workflow_mocks[1], task)
+        workflow_mocks[1].make_decisions.assert_not_called()
+        instance._respond_decision_task_completed.assert_called_once_with(
+            [{"decisionType": "Spam"}], task
+        )
+
+    def test_poll_and_run_bulkhead(self, workflow_mocks, aws_environment):
+        """Decision tasks beyond workflow's concurrency limit are queued or dropped."""
+        # Setup environment
+        tasks = [
+            {
+                "taskToken": "spam%d" % j,
+                "workflowType": {"name": name, "version": version},
+                "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+            }
+            for j, (name, version) in enumerate(
+                [("bar", "0.42"), ("bar", "0.42"), ("bar", "0.42"), ("spam", "1.0")]
+            )
+        ]
+        release = threading.Event()
+        decided = []
+
+        def make_decisions(task):
+            decided.append(task["taskToken"])
+            if task["workflowType"]["name"] == "bar":
+                assert release.wait(1.0)
+            return []
+
+        class Decider(seddy_decider.Decider):
+            _poll_for_decision_task = mock.Mock(side_effect=tasks)
+            _respond_decision_task_completed = mock.Mock()
+
+        for workflow in workflow_mocks:
+            workflow.make_decisions.side_effect = make_decisions
+            workflow.decision_concurrency = None
+        workflow_mocks[1].decision_concurrency = seddy_specs.DecisionConcurrency(1, 1)
+        instance = Decider(workflow_mocks, "spam", "eggs", pipeline_depth=2)
+        instance._workflows = {(w.name, w.version): w for w in workflow_mocks}
+
+        # Run function
+        for _ in tasks:
+            instance._poll_and_run()
+        for _ in range(100):
+            if "spam3" in decided:
+                break
+            time.sleep(0.01)
+        assert sorted(decided) == ["spam0", "spam3"]
+        release.set()
+        instance._wait_for_decision_tasks()
+
+        # Check calls
+        assert decided[-1] == "spam1"
+        assert instance.metrics.counts == {"decision_tasks_dropped": 1}
+        assert instance._respond_decision_task_completed.call_count == 3
+        responded = [
+            c[0][1] for c in instance._respond_decision_task_completed.call_args_list
+        ]
+        assert tasks[2] not in responded
+
+    def test_get_bulkhead_unpipelined(self, workflow_mocks, aws_environment):
+        """Decision concurrency limits are ignored without pipelining."""
+        # Setup environment
+        workflow_mocks[1].decision_concurrency = seddy_specs.DecisionConcurrency(1, 1)
+        instance = seddy_decider.Decider(workflow_mocks, "spam", "eggs")
+        instance._workflows = {(w.name, w.version): w for w in workflow_mocks}
+
+        # Build input
+        task = {"workflowType": {"name": "bar", "version": "0.42"}}
+
+        # Run function
+        res = instance._get_bulkhead(task)
+
+        # Check result
+        assert res is None
+        assert not instance._bulkheads
+
     def test_run_uncaught(self, workflow_mocks, aws_environment):
         # Setup environment
         class Decider(seddy_decider.Decider):
@@ -397,37 +964,100 @@ class TestDecider:
         # Check calls
         assert instance._poll_and_run.call_args_list == [mock.call()] * 4
 
-    def test_run(self, workflow_mocks, aws_environment):
+    def test_run(self, workflows_spec_files, aws_environment):
         # Setup environment
+        watcher_mock = mock.Mock(spec=seddy_watch.Watcher)
+        watcher_class_mock = mock.Mock(return_value=watcher_mock)
+        watcher_patch = mock.patch.object(seddy_watch, "Watcher", watcher_class_mock)
+
         class Decider(seddy_decider.Decider):
             _run_uncaught = mock.Mock(side_effect=KeyboardInterrupt)
+            _load_workflows = mock.Mock()
 
-        instance = Decider(workflow_mocks, "spam", "eggs")
-        instance._future = mock.Mock(spec=cf.Future)
-        instance._future.running.return_value = False
+        instance = Decider(workflows_spec_files, "spam", "eggs")
+        future = cf.Future()
+        future.set_result(None)
+        instance._futures = {future}
 
         # Run function
-        instance.run()
+        with watcher_patch:
+            instance.run()
 
         # Check calls
+        instance._load_workflows.assert_called_once_with()
         instance._run_uncaught.assert_called_once_with()
-        instance._future.result.assert_not_called()
+        assert not instance._futures
+        watcher_class_mock.assert_called_once_with(
+            workflows_spec_files, instance._reload_workflows, instance.watch_interval
+        )
+        watcher_mock.start.assert_called_once_with()
+        watcher_mock.stop.assert_called_once_with()
 
-    def test_run_handling_decision(self, workflow_mocks, aws_environment):
+    def test_run_reporting(self, workflows_spec_files, aws_environment):
+        """Test latencies are reported while running, if configured."""
         # Setup environment
+        reporter_mock = mock.Mock(spec=seddy_metrics.Reporter)
+        reporter_class_mock = mock.Mock(return_value=reporter_mock)
+        reporter_patch = mock.patch.object(
+            seddy_metrics, "Reporter", reporter_class_mock
+        )
+
         class Decider(seddy_decider.Decider):
             _run_uncaught = mock.Mock(side_effect=KeyboardInterrupt)
+            _load_workflows = mock.Mock()
+            _start_watcher = mock.Mock()
 
-        instance = Decider(workflow_mocks, "spam", "eggs")
-        instance._future = mock.Mock(spec=cf.Future)
-        instance._future.running.return_value = True
+        instance = Decider(workflows_spec_files, "spam", "eggs", report_interval=60.0)
+
+        # Run function
+        with reporter_patch:
+            instance.run()
+
+        # Check calls
+        reporter_class_mock.assert_called_once_with(instance.metrics, 60.0)
+        reporter_mock.start.assert_called_once_with()
+        reporter_mock.stop.assert_called_once_with()
+
+    def test_run_traced(self, workflows_spec_files, aws_environment):
+        """Test trace exporter is closed on finishing."""
+        # Setup environment
+        exporter = mock.Mock(spec=seddy_tracing.Exporter)
+        tracer_patch = mock.patch.object(
+            seddy_tracing, "tracer", seddy_tracing.Tracer(exporter)
+        )
+
+        class Decider(seddy_decider.Decider):
+            _run_uncaught = mock.Mock(side_effect=KeyboardInterrupt)
+            _load_workflows = mock.Mock()
+            _start_watcher = mock.Mock()
+
+        instance = Decider(workflows_spec_files, "spam", "eggs")
+
+        # Run function
+        with tracer_patch:
+            instance.run()
+
+        # Check calls
+        exporter.close.assert_called_once_with()
+
+    def test_run_handling_decision(self, workflows_spec_files, aws_environment):
+        # Setup environment
+        class Decider(seddy_decider.Decider):
+            _run_uncaught = mock.Mock(side_effect=KeyboardInterrupt)
+            _load_workflows = mock.Mock()
+
+        instance = Decider(workflows_spec_files, "spam", "eggs")
+        future = cf.Future()
+        instance._futures = {future}
+        threading.Timer(0.05, future.set_result, (None,)).start()
 
         # Run function
         instance.run()
 
         # Check calls
         instance._run_uncaught.assert_called_once_with()
-        instance._future.result.assert_called_once_with()
+        assert future.done()
+        assert not instance._futures
 
 
 def test_run_app(tmp_path):
@@ -440,14 +1070,14 @@ def test_run_app(tmp_path):
     )
 
     # Build input
-    workflows_spec_json = tmp_path / "workflows.json"
+    workflows_spec_files = [tmp_path / "workflows.json"]
 
     # Run function
     with decider_class_patch:
-        seddy_decider.run_app(workflows_spec_json, "spam", "eggs", "abcd1234")
+        seddy_decider.run_app(workflows_spec_files, "spam", "eggs", "abcd1234")
 
     # Check decider configuration
     decider_class_mock.assert_called_once_with(
-        workflows_spec_json, "spam", "eggs", "abcd1234"
+        workflows_spec_files, "spam", "eggs", "abcd1234", False, 0, None, None, None
     )
     decider_class_mock.return_value.run.assert_called_once_with()
@@ -0,0 +1,59 @@
+"""Test ``seddy._memo``."""
+
+from unittest import mock
+
+from seddy import _memo as seddy_memo
+import pytest
+
+
+class TestTTLCache:
+    """Test ``seddy._memo.TTLCache``."""
+
+    @pytest.fixture
+    def clock(self):
+        """Fake monotonic clock."""
+        return mock.Mock(return_value=100.0)
+
+    @pytest.fixture
+    def instance(self, clock):
+        """Cache instance."""
+        return seddy_memo.TTLCache(10.0, max_size=2, clock=clock)
+
+    def test_get(self, instance, clock):
+        """Test entries are retrieved until expired."""
+        # Setup environment
+        instance.set("spam", 42)
+
+        # Run function
+        clock.return_value = 109.0
+        assert instance.get("spam") == 42
+        assert instance.get("eggs") is None
+        clock.return_value = 110.0
+        assert instance.get("spam", "ham") == "ham"
+        assert len(instance) == 0
+
+    def test_set_replace(self, instance, clock):
+        """Test replaced entries have a renewed expiry."""
+        # Setup environment
+        instance.set("spam", 42)
+        clock.return_value = 105.0
+
+        # Run function
+        instance.set("spam", 43)
+
+        # Check result
+        clock.return_value = 112.0
+        assert instance.get("spam") == 43
+
+    def test_max_size(self, instance):
+        """Test oldest entries are evicted."""
+        # Run function
+        instance.set("spam", 42)
+        instance.set("eggs", 43)
+        instance.set("ham", 44)
+
+        # Check result
+        assert len(instance) == 2
+        assert instance.get("spam") is None
+        assert instance.get("eggs") == 43
+        assert instance.get("ham") == 44
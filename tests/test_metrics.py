@@ -0,0 +1,135 @@
+"""Test ``seddy._metrics``."""
+
+import math
+import time
+
+from seddy import _metrics as seddy_metrics
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("q", "exp"), [(0, 1.0), (50, 2.0), (90, 4.0), (99, 4.0), (100, 4.0)]
+)
+def test_percentile(q, exp):
+    """Test nearest-rank percentile."""
+    assert seddy_metrics.percentile([1.0, 2.0, 3.0, 4.0], q) == exp
+
+
+def test_percentile_empty():
+    """Test percentile of no values is NaN."""
+    assert math.isnan(seddy_metrics.percentile([], 50))
+
+
+class TestMetrics:
+    """Test ``seddy._metrics.Metrics``."""
+
+    def test_increment(self):
+        """Test event counting."""
+        # Setup environment
+        instance = seddy_metrics.Metrics()
+
+        # Run function
+        instance.increment("spam")
+        instance.increment("eggs", 3)
+        instance.increment("spam")
+
+        # Check result
+        assert instance.counts == {"spam": 2, "eggs": 3}
+
+    def test_record_latency(self):
+        """Test latencies are recorded and reset."""
+        # Setup environment
+        instance = seddy_metrics.Metrics()
+
+        # Run function
+        instance.record_latency("poll", ("spam", "1.0"), 0.5)
+        instance.record_latency("poll", ("spam", "1.0"), 1.5)
+        instance.record_latency("decide", ("spam", "1.0"), 0.1)
+        res = instance.pop_latencies()
+
+        # Check result
+        assert sorted(res) == [(("spam", "1.0"), "decide"), (("spam", "1.0"), "poll")]
+        assert res[(("spam", "1.0"), "poll")].count == 2
+        assert res[(("spam", "1.0"), "poll")].total == 2.0
+        assert instance.pop_latencies() == {}
+
+
+class TestHistogram:
+    """Test ``seddy._metrics.Histogram``."""
+
+    def test_percentile(self):
+        """Test percentiles are within the histogram's precision."""
+        # Setup environment
+        instance = seddy_metrics.Histogram()
+        values = [j / 1000.0 for j in range(1, 1001)]  # 1 ms to 1 s
+
+        # Run function
+        for value in values:
+            instance.record(value)
+
+        # Check result
+        assert instance.count == 1000
+        assert instance.max == 1.0
+        for q in (1, 50, 90, 99, 100):
+            exp = seddy_metrics.percentile(values, q)
+            assert exp <= instance.percentile(q) <= exp * (1 + 1 / 16)
+
+    def test_percentile_small(self):
+        """Test percentiles of sub-millisecond values."""
+        # Setup environment
+        instance = seddy_metrics.Histogram()
+
+        # Run function
+        instance.record(3e-6)
+        instance.record(0.0)
+
+        # Check result
+        assert instance.percentile(50) == 1e-6
+        assert instance.percentile(100) == 3e-6
+
+    def test_percentile_empty(self):
+        """Test percentile of no values is NaN."""
+        assert math.isnan(seddy_metrics.Histogram().percentile(50))
+
+
+class TestReporter:
+    """Test ``seddy._metrics.Reporter``."""
+
+    def test_report(self, caplog):
+        """Test latencies are summarised in logs and reset."""
+        # Setup environment
+        caplog.set_level(25)
+        metrics = seddy_metrics.Metrics()
+        metrics.record_latency("poll", ("spam", "1.0"), 0.5)
+        metrics.record_latency("decide", ("spam", "1.0"), 0.1)
+        metrics.record_latency("decide", ("eggs", "2"), 0.2)
+        instance = seddy_metrics.Reporter(metrics, 60.0)
+
+        # Run function
+        instance.report()
+
+        # Check result
+        assert [r.levelno for r in caplog.records] == [25, 25]
+        assert "'eggs-2'" in caplog.records[0].getMessage()
+        assert "decide n=1 p50=" in caplog.records[1].getMessage()
+        assert "; poll n=1 p50=" in caplog.records[1].getMessage()
+        assert metrics.pop_latencies() == {}
+
+    def test_start_stop(self, caplog):
+        """Test latencies are reported periodically and on stop."""
+        # Setup environment
+        caplog.set_level(25)
+        metrics = seddy_metrics.Metrics()
+        instance = seddy_metrics.Reporter(metrics, 0.01)
+
+        # Run function
+        instance.start()
+        metrics.record_latency("poll", ("spam", "1.0"), 0.5)
+        time.sleep(0.05)
+        metrics.record_latency("poll", ("spam", "1.0"), 0.5)
+        instance.stop()
+
+        # Check result
+        messages = [r.getMessage() for r in caplog.records]
+        assert sum(int(m.split(" n=")[1].split()[0]) for m in messages) == 2
+        assert metrics.pop_latencies() == {}
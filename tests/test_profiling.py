@@ -0,0 +1,113 @@
+"""Test ``seddy._profiling``."""
+
+import os
+import signal
+import pstats
+from unittest import mock
+
+from seddy import _profiling as seddy_profiling
+from seddy import _specs as seddy_specs
+import pytest
+
+
+class TestProfiler:
+    """Test ``seddy._profiling.Profiler``."""
+
+    @pytest.fixture
+    def workflow(self):
+        """Workflow specification mock."""
+        workflow = mock.Mock(spec=seddy_specs.Workflow)
+        workflow.name = "spam/foo"
+        workflow.version = "1.0"
+        workflow.make_decisions.return_value = [{"decisionType": "Spam"}]
+        return workflow
+
+    @pytest.fixture
+    def task(self):
+        """Decision task."""
+        return {"taskToken": "spam", "events": [{"eventId": 1}, {"eventId": 2}]}
+
+    @pytest.mark.parametrize("trace_memory", [False, True])
+    def test_make_decisions(self, workflow, task, tmp_path, trace_memory):
+        """Test decision-making is profiled."""
+        # Setup environment
+        directory = tmp_path / "profiles"
+        instance = seddy_profiling.Profiler(directory, trace_memory=trace_memory)
+
+        # Run function
+        res = instance.make_decisions(workflow, task)
+
+        # Check result
+        assert res == [{"decisionType": "Spam"}]
+        workflow.make_decisions.assert_called_once_with(task)
+        paths = sorted(directory.iterdir())
+        assert [p.suffix for p in paths] == (
+            [".prof", ".tracemalloc"] if trace_memory else [".prof"]
+        )
+        assert "-spam_foo-1.0-2events-" in paths[0].name
+        pstats.Stats(str(paths[0]))
+
+    @pytest.mark.parametrize(
+        ("kwargs", "enabled"),
+        [
+            pytest.param({"threshold": 60.0}, True, id="threshold"),
+            pytest.param({"sample_rate": 0.0}, True, id="sample_rate"),
+            pytest.param({}, False, id="disabled"),
+        ],
+    )
+    def test_make_decisions_skipped(self, workflow, task, tmp_path, kwargs, enabled):
+        """Test no profile is saved for unprofiled decision tasks."""
+        # Setup environment
+        directory = tmp_path / "profiles"
+        instance = seddy_profiling.Profiler(directory, enabled=enabled, **kwargs)
+
+        # Run function
+        res = instance.make_decisions(workflow, task)
+
+        # Check result
+        assert res == [{"decisionType": "Spam"}]
+        assert not directory.exists()
+
+    def test_make_decisions_error(self, workflow, task, tmp_path):
+        """Test profile is saved when decision-making fails."""
+        # Setup environment
+        workflow.make_decisions.side_effect = RuntimeError("eggs")
+        instance = seddy_profiling.Profiler(tmp_path)
+
+        # Run function
+        with pytest.raises(RuntimeError):
+            instance.make_decisions(workflow, task)
+
+        # Check result
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_rotation(self, workflow, task, tmp_path):
+        """Test only the most recent profiles are kept."""
+        # Setup environment
+        instance = seddy_profiling.Profiler(tmp_path, max_files=2)
+
+        # Run function
+        for _ in range(4):
+            instance.make_decisions(workflow, task)
+
+        # Check result
+        paths = sorted(p.name for p in tmp_path.iterdir())
+        assert [p[16:20] for p in paths] == ["0003", "0004"]
+
+    def test_signal(self, tmp_path):
+        """Test profiling is toggled on signal."""
+        # Setup environment
+        instance = seddy_profiling.Profiler(tmp_path, enabled=False)
+        handler = signal.getsignal(signal.SIGUSR1)
+
+        # Run function
+        try:
+            instance.install_signal_handler()
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert instance.enabled is True
+            os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, handler)
+
+        # Check result
+        assert instance.enabled is False
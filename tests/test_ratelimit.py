@@ -0,0 +1,190 @@
+"""Test ``seddy._ratelimit``."""
+
+import os
+from unittest import mock
+
+from seddy import _util as seddy_util
+from seddy import _ratelimit as seddy_ratelimit
+import moto
+import pytest
+
+
+class TestTokenBucket:
+    """Test ``seddy._ratelimit.TokenBucket``."""
+
+    @pytest.fixture
+    def clock(self):
+        """Fake monotonic clock."""
+        return mock.Mock(return_value=100.0)
+
+    @pytest.fixture
+    def instance(self, clock):
+        """Token-bucket instance."""
+        return seddy_ratelimit.TokenBucket(
+            4.0, 2.0, min_rate=1.0, clock=clock, sleep=mock.Mock()
+        )
+
+    def test_acquire(self, instance, clock):
+        """Test tokens are taken, waiting when the bucket is empty."""
+        # Run function
+        instance.acquire()
+        instance.acquire()
+        instance.sleep.assert_not_called()
+        instance.acquire()
+        instance.sleep.assert_called_once_with(0.25)
+        instance.sleep.reset_mock()
+        clock.return_value = 101.0
+        instance.acquire()
+        instance.sleep.assert_not_called()
+
+    def test_adapt(self, instance):
+        """Test rate decreases on throttling, and recovers on success."""
+        # Run function
+        instance.on_throttle()
+        assert instance.rate == 2.0
+        instance.on_throttle()
+        instance.on_throttle()
+        assert instance.rate == 1.0
+        instance.on_success()
+        assert instance.rate == 1.0625
+        for _ in range(100):
+            instance.on_success()
+        assert instance.rate == 4.0
+
+
+class TestRateLimiter:
+    """Test ``seddy._ratelimit.RateLimiter``."""
+
+    @pytest.fixture
+    def instance(self):
+        """Rate-limiter instance."""
+        buckets = [
+            mock.Mock(spec=seddy_ratelimit.TokenBucket, rate=1.0) for _ in range(3)
+        ]
+        return seddy_ratelimit.RateLimiter(*buckets)
+
+    @pytest.mark.parametrize(
+        ("scale", "exp_budgets"),
+        [
+            pytest.param(
+                1.0,
+                {"poll": (200, 1000), "respond": (200, 1000), "list": (5, 100)},
+                id="default",
+            ),
+            pytest.param(
+                0.1,
+                {"poll": (20, 100), "respond": (20, 100), "list": (0.5, 10)},
+                id="scaled",
+            ),
+            pytest.param(
+                0.001,
+                {"poll": (0.2, 1), "respond": (0.2, 1), "list": (0.005, 1)},
+                id="minimum-burst",
+            ),
+        ],
+    )
+    def test_init_scale(self, scale, exp_budgets):
+        """Test default budgets are scaled."""
+        res = seddy_ratelimit.RateLimiter(scale=scale)
+        for name, (exp_rate, exp_burst) in exp_budgets.items():
+            assert res.buckets[name].rate == pytest.approx(exp_rate)
+            assert res.buckets[name].max_rate == pytest.approx(exp_rate)
+            assert res.buckets[name].burst == pytest.approx(exp_burst)
+
+    def test_init_scale_invalid(self):
+        """Test non-positive scale is rejected."""
+        with pytest.raises(ValueError):
+            seddy_ratelimit.RateLimiter(scale=0.0)
+
+    @pytest.mark.parametrize(
+        ("operation_name", "exp"),
+        [
+            pytest.param("PollForDecisionTask", "poll", id="poll"),
+            pytest.param("RespondDecisionTaskCompleted", "respond", id="respond"),
+            pytest.param("ListWorkflowTypes", "list", id="list"),
+            pytest.param("DescribeWorkflowExecution", "list", id="describe"),
+            pytest.param("RegisterWorkflowType", None, id="unlimited"),
+        ],
+    )
+    def test_get_bucket(self, instance, operation_name, exp):
+        """Test operations' budgets."""
+        res = instance.get_bucket(operation_name)
+        assert res is (exp and instance.buckets[exp])
+
+    @moto.mock_swf
+    def test_install(self, instance):
+        """Test client requests are rate-limited."""
+        # Setup environment
+        env_update = {
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "AWS_ACCESS_KEY_ID": "id",
+            "AWS_SECRET_ACCESS_KEY": "key",
+        }
+        with mock.patch.dict(os.environ, env_update):
+            client = seddy_util.get_swf_client(instance)
+        client.register_domain(name="spam", workflowExecutionRetentionPeriodInDays="2")
+
+        # Run function
+        client.list_domains(registrationStatus="REGISTERED")
+        with pytest.raises(client.exceptions.UnknownResourceFault):
+            client.poll_for_decision_task(domain="eggs", taskList={"name": "ham"})
+
+        # Check calls
+        instance.buckets["list"].acquire.assert_called_once_with()
+        instance.buckets["list"].on_success.assert_called_once_with()
+        instance.buckets["poll"].acquire.assert_called_once_with()
+        instance.buckets["poll"].on_success.assert_not_called()
+        instance.buckets["respond"].acquire.assert_not_called()
+
+    def test_needs_retry(self, instance):
+        """Test rate is reduced on throttled requests."""
+        # Build input
+        operation = mock.Mock()
+        operation.name = "RespondDecisionTaskCompleted"
+        throttled = (None, {"Error": {"Code": "ThrottlingException"}})
+        failed = (None, {"Error": {"Code": "UnknownResourceFault"}})
+
+        # Run function
+        instance._needs_retry(operation=operation, response=None, attempts=1)
+        instance._needs_retry(operation=operation, response=failed, attempts=1)
+        instance.buckets["respond"].on_throttle.assert_not_called()
+        instance._needs_retry(operation=operation, response=throttled, attempts=1)
+
+        # Check calls
+        instance.buckets["respond"].on_throttle.assert_called_once_with()
+
+    @moto.mock_swf
+    def test_install_throttled(self):
+        """Test client requests back off on throttling, via the retry hook."""
+        # Setup environment
+        env_update = {
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "AWS_ACCESS_KEY_ID": "id",
+            "AWS_SECRET_ACCESS_KEY": "key",
+        }
+        instance = seddy_ratelimit.RateLimiter()
+        with mock.patch.dict(os.environ, env_update):
+            client = seddy_util.get_swf_client(instance)
+        operation = client.meta.service_model.operation_model(
+            "RespondDecisionTaskCompleted"
+        )
+        http_response = mock.Mock(status_code=400)
+        throttled = (http_response, {"Error": {"Code": "ThrottlingException"}})
+        failed = (http_response, {"Error": {"Code": "UnknownResourceFault"}})
+
+        # Run function
+        for response in [failed, throttled, throttled]:
+            client.meta.events.emit(
+                "needs-retry.swf.RespondDecisionTaskCompleted",
+                response=response,
+                endpoint=None,
+                operation=operation,
+                attempts=1,
+                caught_exception=None,
+                request_dict={"context": {}},
+            )
+
+        # Check result
+        assert instance.buckets["respond"].rate == 50.0
+        assert instance.buckets["poll"].rate == 200.0
+        assert instance.buckets["list"].rate == 5.0
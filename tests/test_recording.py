@@ -0,0 +1,78 @@
+"""Test ``seddy._recording``."""
+
+import datetime
+
+from seddy import _recording as seddy_recording
+from seddy import _specs as seddy_specs
+
+
+class TestRecorder:
+    """Test ``seddy._recording.Recorder``."""
+
+    def test_record(self, tmp_path):
+        """Test decision tasks are recorded and loaded."""
+        # Setup environment
+        path = tmp_path / "tasks.jsonl.gz"
+        timestamp = datetime.datetime(2020, 1, 2, tzinfo=datetime.timezone.utc)
+        history = seddy_specs.History()
+        history.append(
+            {
+                "eventId": 1,
+                "eventType": "WorkflowExecutionStarted",
+                "eventTimestamp": timestamp,
+                "workflowExecutionStartedEventAttributes": {"input": "spam"},
+            }
+        )
+        tasks = [
+            {
+                "taskToken": "spam",
+                "events": history,
+                "ResponseMetadata": {"RequestId": "abcd"},
+            },
+            {"taskToken": "eggs", "events": []},
+        ]
+        decisions = [[{"decisionType": "ScheduleActivityTask"}], []]
+        instance = seddy_recording.Recorder(path)
+
+        # Run function
+        for task, task_decisions in zip(tasks, decisions):
+            instance.record(task, task_decisions)
+        instance.close()
+        instance.record({"taskToken": "bar"}, [])
+
+        # Check result
+        res = list(seddy_recording.load_recording(path))
+        assert res == [
+            {
+                "task": {
+                    "taskToken": "spam",
+                    "events": [
+                        {
+                            "eventId": 1,
+                            "eventType": "WorkflowExecutionStarted",
+                            "eventTimestamp": "2020-01-02T00:00:00+00:00",
+                            "workflowExecutionStartedEventAttributes": {
+                                "input": "spam"
+                            },
+                        }
+                    ],
+                },
+                "decisions": decisions[0],
+            },
+            {"task": tasks[1], "decisions": []},
+        ]
+
+    def test_record_full(self, tmp_path):
+        """Test recording stops once the file is full."""
+        # Setup environment
+        path = tmp_path / "tasks.jsonl.gz"
+        instance = seddy_recording.Recorder(path, max_bytes=1)
+
+        # Run function
+        instance.record({"taskToken": "spam"}, [])
+        instance.record({"taskToken": "eggs"}, [])
+        instance.close()
+
+        # Check result
+        res = list(seddy_recording.load_recording(path))
+        assert res == [{"task": {"taskToken": "spam"}, "decisions": []}]
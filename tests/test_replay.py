@@ -0,0 +1,174 @@
+"""Test ``seddy.replay``."""
+
+import os
+import sys
+import json
+import subprocess
+from unittest import mock
+
+from seddy import replay as seddy_replay
+from seddy import _specs as seddy_specs
+from seddy import _recording as seddy_recording
+import pytest
+
+
+@pytest.fixture
+def workflow_mocks():
+    """Workflow specification mocks."""
+    workflows = [
+        mock.Mock(spec=seddy_specs.Workflow),
+        mock.Mock(spec=seddy_specs.Workflow),
+    ]
+    workflows[0].name = "spam"
+    workflows[0].version = "1.0"
+    workflows[1].name = "bar"
+    workflows[1].version = "0.42"
+    return workflows
+
+
+def test_replay(workflow_mocks, tmp_path, caplog):
+    """Test recorded decision tasks are replayed and compared."""
+    # Setup environment
+    caplog.set_level(25)
+    tasks = [
+        {
+            "taskToken": "spam%d" % j,
+            "workflowType": {"name": name, "version": version},
+            "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+            "events": [],
+        }
+        for j, (name, version) in enumerate(
+            [("spam", "1.0"), ("bar", "0.42"), ("spam", "1.0"), ("foo", "2.0")]
+        )
+    ]
+    decisions = [
+        [{"decisionType": "ScheduleActivityTask"}],
+        [{"decisionType": "CompleteWorkflowExecution"}],
+        [],
+        [],
+    ]
+    path = tmp_path / "tasks.jsonl.gz"
+    recorder = seddy_recording.Recorder(path)
+    for task, task_decisions in zip(tasks, decisions):
+        recorder.record(task, task_decisions)
+    recorder.close()
+
+    workflow_mocks[0].make_decisions.side_effect = lambda task: (
+        decisions[0] if task["taskToken"] == "spam0" else decisions[1]
+    )
+    workflow_mocks[1].make_decisions.side_effect = RuntimeError("eggs")
+
+    # Run function
+    res = seddy_replay.replay(workflow_mocks, path)
+
+    # Check result
+    assert res == 2
+    for workflow in workflow_mocks:
+        workflow.setup.assert_called_once_with()
+    assert workflow_mocks[0].make_decisions.call_count == 4
+    assert workflow_mocks[1].make_decisions.call_count == 2
+    assert "unsupported workflow type" in caplog.text
+    assert "Replayed 3 decision tasks (1 unsupported)" in caplog.text
+    assert "2 with different decisions" in caplog.text
+
+
+_record_script = """
+import sys, json, pathlib
+from seddy import _specs, _recording
+workflow, = _specs.WorkflowsLoader([pathlib.Path(sys.argv[1])]).load()
+workflow.setup()
+task = json.loads(sys.argv[3])
+recorder = _recording.Recorder(pathlib.Path(sys.argv[2]))
+recorder.record(task, workflow.make_decisions(task))
+recorder.close()
+"""
+
+
+@pytest.mark.parametrize("hash_seed", ["2", "3"])
+def test_replay_hash_seed(tmp_path, hash_seed):
+    """Test parallel DAG tasks replay the same under another hash seed."""
+    # Setup environment
+    tasks = [{"id": "a", "type": {"name": "spam", "version": "1"}}]
+    for task_id in ["b", "c", "d", "e"]:
+        task = {
+            "id": task_id,
+            "type": {"name": "spam", "version": "1"},
+            "dependencies": ["a"],
+        }
+        tasks.append(task)
+    workflow_spec = {"spec_type": "dag", "name": "foo", "version": "1.0"}
+    workflow_spec["tasks"] = tasks
+    workflows_file = tmp_path / "workflows.json"
+    workflows_file.write_text(
+        json.dumps({"version": "1.0", "workflows": [workflow_spec]})
+    )
+    task = {
+        "taskToken": "spam",
+        "workflowType": {"name": "foo", "version": "1.0"},
+        "workflowExecution": {"workflowId": "1234", "runId": "9abc"},
+        "previousStartedEventId": 3,
+        "startedEventId": 8,
+        "events": [
+            {
+                "eventId": 1,
+                "eventType": "WorkflowExecutionStarted",
+                "workflowExecutionStartedEventAttributes": {},
+            },
+            {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 3, "eventType": "DecisionTaskStarted"},
+            {"eventId": 4, "eventType": "DecisionTaskCompleted"},
+            {
+                "eventId": 5,
+                "eventType": "ActivityTaskScheduled",
+                "activityTaskScheduledEventAttributes": {"activityId": "a"},
+            },
+            {
+                "eventId": 6,
+                "eventType": "ActivityTaskCompleted",
+                "activityTaskCompletedEventAttributes": {"scheduledEventId": 5},
+            },
+            {"eventId": 7, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 8, "eventType": "DecisionTaskStarted"},
+        ],
+    }
+    recording_file = tmp_path / "tasks.jsonl.gz"
+    record_args = [str(workflows_file), str(recording_file), json.dumps(task)]
+    record_env = dict(os.environ, PYTHONHASHSEED="1")
+    replay_args = ["replay", str(recording_file), str(workflows_file)]
+    replay_env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+
+    # Run function
+    subprocess.run(
+        [sys.executable, "-c", _record_script] + record_args,
+        env=record_env,
+        check=True,
+    )
+    res = subprocess.run([sys.executable, "-m", "seddy"] + replay_args, env=replay_env)
+
+    # Check result
+    assert res.returncode == 0
+
+
+@pytest.mark.parametrize(("n_different", "exp"), [(0, 0), (1, 1)])
+def test_run_app(tmp_path, n_different, exp):
+    """Ensure replay is run with the loaded workflows."""
+    # Setup environment
+    replay_mock = mock.Mock(return_value=n_different)
+    replay_patch = mock.patch.object(seddy_replay, "replay", replay_mock)
+    loader_mock = mock.Mock(spec=seddy_specs.WorkflowsLoader)
+    loader_patch = mock.patch.object(seddy_specs, "WorkflowsLoader", loader_mock)
+
+    # Build input
+    workflows_spec_files = [tmp_path / "workflows.json"]
+    recording_file = tmp_path / "tasks.jsonl.gz"
+
+    # Run function
+    with replay_patch, loader_patch:
+        res = seddy_replay.run_app(workflows_spec_files, recording_file)
+
+    # Check result
+    assert res == exp
+    loader_mock.assert_called_once_with(workflows_spec_files)
+    replay_mock.assert_called_once_with(
+        loader_mock.return_value.load.return_value, recording_file
+    )
@@ -68,6 +68,7 @@ class TestWorkflow:
                 "child_policy": "TERMINATE",
                 "lambda_role": "arn:aws:iam::spam:role/eggs",
             },
+            "decision_concurrency": {"max_tasks": 2, "max_queued": 10},
         }
 
     @pytest.fixture
@@ -97,6 +98,16 @@ class TestWorkflow:
         assert res.registration.task_priority == 2
         assert res.registration.child_policy == seddy_decisions.ChildPolicy.TERMINATE
         assert res.registration.lambda_role == "arn:aws:iam::spam:role/eggs"
+        assert res.decision_concurrency == seddy_decisions.DecisionConcurrency(2, 10)
+
+    def test_from_spec_defaults(self, spec):
+        """Test workflow specification construction with defaults."""
+        del spec["registration"]
+        spec["decision_concurrency"] = {"max_tasks": 1}
+        res = self.Workflow.from_spec(spec)
+        assert res.registration is None
+        assert res.decision_concurrency == seddy_decisions.DecisionConcurrency(1)
+        assert res.decision_concurrency.max_queued is None
 
     def test_setup(self, instance):
         """Test workflow specification pre-computation."""
@@ -1,8 +1,13 @@
 """Test ``seddy._specs._dag``."""
 
+import sys
+import json
+import dataclasses
 import logging as lg
+from unittest import mock
 
 from seddy import _specs as seddy_specs
+from seddy import _tracing as seddy_tracing
 from seddy._specs import _dag
 import pytest
 
@@ -179,6 +184,178 @@ def test_build_activity_input_unknown_type():
         _dag._build_activity_input(input_spec, workflow_input, activity_results)
 
 
+@pytest.mark.parametrize(
+    "instance",
+    [
+        pytest.param(_dag.NoInput(), id="none"),
+        pytest.param(_dag.Constant(42), id="constant"),
+        pytest.param(_dag.WorkflowInput("$.foo"), id="workflow-input"),
+        pytest.param(_dag.DependencyResult("foo", "$.bar"), id="dependency-result"),
+        pytest.param(_dag.Object({"spam": _dag.Constant(42)}), id="object"),
+        pytest.param(_dag.Task("foo", "spam-foo", "0.3"), id="task"),
+        pytest.param(_dag.MapTask("foo", "spam-foo", "0.3"), id="map-task"),
+    ],
+)
+def test_slotted(instance):
+    """Test task and task-input specifications have no instance dictionary."""
+    assert not hasattr(instance, "__dict__")
+    assert instance == type(instance)(
+        **{
+            f.name: getattr(instance, f.name)
+            for f in dataclasses.fields(instance)
+            if f.init
+        }
+    )
+
+
+class TestTask:
+    """Test ``seddy._specs._dag.Task``."""
+
+    @pytest.fixture
+    def spec(self):
+        """Example task specification."""
+        return {
+            "id": "foo",
+            "type": {"name": "spam-foo", "version": "0.3"},
+            "input": {"type": "workflow-input", "path": "$.foo"},
+            "heartbeat": 60,
+            "timeout": 86400,
+            "task_list": "eggs",
+            "priority": 1,
+            "dependencies": ["bar"],
+            "duration": 2.5,
+        }
+
+    def test_from_spec(self, spec):
+        """Test construction from specification."""
+        res = _dag.Task.from_spec(spec)
+        assert res == _dag.Task(
+            "foo",
+            "spam-foo",
+            "0.3",
+            input=_dag.WorkflowInput("$.foo"),
+            heartbeat=60,
+            timeout=86400,
+            task_list="eggs",
+            priority=1,
+            dependencies=["bar"],
+            duration=2.5,
+        )
+        assert res.name is sys.intern("spam-foo")
+
+    def test_type(self, spec):
+        """Test activity type is only built once."""
+        res = _dag.Task.from_spec(spec)
+        assert res.type == {"name": "spam-foo", "version": "0.3"}
+        assert res.type is res.type
+        with pytest.raises(TypeError):
+            res.type["version"] = "0.4"
+
+    def test_build_decision_template(self, spec):
+        """Test fixed decision attributes template."""
+        res = _dag.Task.from_spec(spec)
+        assert res.decision_template is None
+        res.build_decision_template()
+        assert res.decision_template == {
+            "activityType": {"name": "spam-foo", "version": "0.3"},
+            "heartbeatTimeout": "60",
+            "startToCloseTimeout": "86400",
+            "taskList": {"name": "eggs"},
+            "taskPriority": "1",
+        }
+        with pytest.raises(TypeError):
+            res.decision_template["activityId"] = "foo"
+        with pytest.raises(TypeError):
+            res.decision_template["taskList"]["name"] = "foo"
+
+        res = _dag.Task("foo", "spam-foo", "0.3")
+        res.build_decision_template()
+        assert res.decision_template == {
+            "activityType": {"name": "spam-foo", "version": "0.3"}
+        }
+
+    def test_build_decision_template_default_priority(self, spec):
+        """Test default priority doesn't override specified priority."""
+        res = _dag.Task.from_spec(spec)
+        res.build_decision_template(default_priority=5)
+        assert res.decision_template["taskPriority"] == "1"
+
+        res = _dag.Task("foo", "spam-foo", "0.3")
+        res.build_decision_template(default_priority=5)
+        assert res.decision_template["taskPriority"] == "5"
+
+    def test_batch_key(self, spec):
+        """Test only tasks with the same scheduling attributes are batched."""
+        spec["batch_size"] = 10
+        res = _dag.Task.from_spec(spec)
+        assert res.batch_size == 10
+        res.build_decision_template()
+        other = _dag.Task.from_spec(dict(spec, id="bar"))
+        other.build_decision_template()
+        assert res.batch_key == other.batch_key
+        other = _dag.Task.from_spec(dict(spec, id="bar", task_list="ham"))
+        other.build_decision_template()
+        assert res.batch_key != other.batch_key
+
+
+class TestMapTask:
+    """Test ``seddy._specs._dag.MapTask``."""
+
+    def test_from_spec(self):
+        """Test construction from specification."""
+        spec = {
+            "id": "foo",
+            "type": {"name": "spam-foo", "version": "0.3"},
+            "input": {"type": "workflow-input", "path": "$.foo"},
+            "map": {"chunk_size": 2, "max_parallelism": 3},
+        }
+        res = _dag.MapTask.from_spec(spec)
+        assert res == _dag.MapTask(
+            "foo",
+            "spam-foo",
+            "0.3",
+            input=_dag.WorkflowInput("$.foo"),
+            chunk_size=2,
+            max_parallelism=3,
+        )
+
+        spec["map"] = {}
+        res = _dag.MapTask.from_spec(spec)
+        assert res.chunk_size is None
+        assert res.max_parallelism is None
+
+    @pytest.mark.parametrize(
+        ("chunk_size", "input_", "exp"),
+        [
+            pytest.param(None, [1, 2, 3], [1, 2, 3], id="items"),
+            pytest.param(2, [1, 2, 3], [[1, 2], [3]], id="chunks"),
+            pytest.param(2, [], [], id="empty"),
+        ],
+    )
+    def test_split_input(self, chunk_size, input_, exp):
+        """Test task input splitting into items or chunks."""
+        instance = _dag.MapTask("foo", "spam-foo", "0.3", chunk_size=chunk_size)
+        assert instance.split_input(input_) == exp
+
+    def test_split_input_not_array(self):
+        """Test task input splitting rejects non-array input."""
+        instance = _dag.MapTask("foo", "spam-foo", "0.3")
+        with pytest.raises(seddy_specs._base.DeciderError):
+            instance.split_input({"spam": 42})
+
+    @pytest.mark.parametrize(
+        ("chunk_size", "results", "exp"),
+        [
+            pytest.param(None, [[1], None, 3], [[1], None, 3], id="items"),
+            pytest.param(2, [[1, 2], None, [3]], [1, 2, None, 3], id="chunks"),
+        ],
+    )
+    def test_gather_results(self, chunk_size, results, exp):
+        """Test items' or chunks' results gathering."""
+        instance = _dag.MapTask("foo", "spam-foo", "0.3", chunk_size=chunk_size)
+        assert instance.gather_results(results) == exp
+
+
 class TestDAGDecisionsBuilding:
     """Test ``seddy._specs.DAGBuilder``."""
 
@@ -272,6 +449,145 @@ class TestDAGDecisionsBuilding:
         instance.build_decisions()
         assert instance.decisions == expected_decisions
 
+        # Decisions don't share state with the task's decision template
+        attrs = instance.decisions[0]["scheduleActivityTaskDecisionAttributes"]
+        assert type(attrs["activityType"]) is dict
+        assert type(attrs["taskList"]) is dict
+        attrs["taskList"]["name"] = "spam"
+        assert workflow.task_specs[0].decision_template["taskList"]["name"] == "eggs"
+
+    def test_traced(self, workflow):
+        """Test DAG decisions building phases are traced."""
+        # Setup environment
+        task = {
+            "taskToken": "spam",
+            "previousStartedEventId": 0,
+            "startedEventId": 3,
+            "events": [
+                {
+                    "eventId": 1,
+                    "eventType": "WorkflowExecutionStarted",
+                    "workflowExecutionStartedEventAttributes": {
+                        "input": '{"foo": null, "bar": null, "yay": null}'
+                    },
+                },
+                {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 3, "eventType": "DecisionTaskStarted"},
+            ],
+        }
+        exporter = mock.Mock(spec=seddy_tracing.Exporter)
+        tracer = seddy_tracing.Tracer(exporter)
+
+        # Run function
+        with mock.patch.object(seddy_tracing, "tracer", tracer):
+            workflow.make_decisions(task)
+
+        # Check result
+        (spans,), _ = exporter.export.call_args
+        assert [s.name for s in spans] == [
+            "scan_events",
+            "process_events",
+            "build_decisions",
+        ]
+        assert spans[1].attributes == {"n_new_events": 1, "n_error_events": 0}
+        assert spans[2].attributes == {"n_events": 3, "n_decisions": 1}
+
+    def test_scan_events(self, workflow):
+        """Test history events indexing and classification."""
+        events = [
+            {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+            {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 3, "eventType": "DecisionTaskStarted"},
+            {"eventId": 4, "eventType": "DecisionTaskCompleted"},
+            {
+                "eventId": 5,
+                "eventType": "ActivityTaskScheduled",
+                "activityTaskScheduledEventAttributes": {"activityId": "foo"},
+            },
+            {
+                "eventId": 6,
+                "eventType": "ActivityTaskStarted",
+                "activityTaskStartedEventAttributes": {"scheduledEventId": 5},
+            },
+            {
+                "eventId": 7,
+                "eventType": "ActivityTaskCompleted",
+                "activityTaskCompletedEventAttributes": {"scheduledEventId": 5},
+            },
+            {"eventId": 8, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 9, "eventType": "DecisionTaskStarted"},
+            {"eventId": 10, "eventType": "DecisionTaskCompleted"},
+            {
+                "eventId": 11,
+                "eventType": "ActivityTaskScheduled",
+                "activityTaskScheduledEventAttributes": {"activityId": "bar"},
+            },
+            {
+                "eventId": 12,
+                "eventType": "ActivityTaskTimedOut",
+                "activityTaskTimedOutEventAttributes": {"scheduledEventId": 11},
+            },
+            {"eventId": 13, "eventType": "DecisionTaskScheduled"},
+            {"eventId": 14, "eventType": "DecisionTaskStarted"},
+        ]
+        task = {
+            "taskToken": "spam",
+            "previousStartedEventId": 9,
+            "startedEventId": 14,
+            "events": events,
+        }
+        instance = seddy_specs.DAGBuilder(workflow, task)
+        instance._scan_events()
+        assert instance._scheduled == {5: "foo", 11: "bar"}
+        assert instance._latest_activity_task_events == {
+            "foo": events[6],
+            "bar": events[11],
+        }
+        assert instance._decision_task_events == {
+            3: events[2],
+            4: events[3],
+            9: events[8],
+            10: events[9],
+            14: events[13],
+        }
+        assert instance._new_events == []
+        assert instance._error_events == [events[11]]
+
+    def test_scan_events_counts(self, workflow):
+        """Test completed dependencies counting."""
+        task = {
+            "taskToken": "spam",
+            "previousStartedEventId": 3,
+            "startedEventId": 9,
+            "events": [
+                {"eventId": 1, "eventType": "WorkflowExecutionStarted"},
+                {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 3, "eventType": "DecisionTaskStarted"},
+                {"eventId": 4, "eventType": "DecisionTaskCompleted"},
+                {
+                    "eventId": 5,
+                    "eventType": "ActivityTaskScheduled",
+                    "activityTaskScheduledEventAttributes": {"activityId": "foo"},
+                },
+                {
+                    "eventId": 6,
+                    "eventType": "ActivityTaskStarted",
+                    "activityTaskStartedEventAttributes": {"scheduledEventId": 5},
+                },
+                {
+                    "eventId": 7,
+                    "eventType": "ActivityTaskCompleted",
+                    "activityTaskCompletedEventAttributes": {"scheduledEventId": 5},
+                },
+                {"eventId": 8, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 9, "eventType": "DecisionTaskStarted"},
+            ],
+        }
+        instance = seddy_specs.DAGBuilder(workflow, task)
+        instance._scan_events()
+        assert instance._n_completed == 1
+        assert instance._n_dependencies_completed == {"bar": 1, "yay": 1}
+
     def test_other_event(self, workflow):
         """Test DAG decisions building after other event."""
         task = {
@@ -386,9 +702,10 @@ class TestDAGDecisionsBuilding:
 
     def test_foo_complete_yay_unsatisfied(self, workflow):
         """Test DAG decisions building after foo completes yet yay not ready."""
-        workflow.dependants["bar"] = ["yay"]
         assert workflow.task_specs[2].id == "yay"
         workflow.task_specs[2].dependencies = ["foo", "bar"]
+        workflow.setup()
+        assert workflow.dependants["bar"] == ["yay"]
         task = {
             "taskToken": "spam",
             "previousStartedEventId": 3,
@@ -679,7 +996,8 @@ class TestDAGDecisionsBuilding:
         instance.build_decisions()
         assert instance.decisions == []
 
-    def test_tin_complete(self, workflow):
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_tin_complete(self, workflow, compact):
         """Test DAG decisions building after tin activity completes."""
         task = {
             "taskToken": "spam",
@@ -811,11 +1129,16 @@ class TestDAGDecisionsBuilding:
                 },
             }
         ]
+        if compact:
+            task["events"] = seddy_specs.History(
+                task["events"], workflow.history_attributes
+            )
         instance = seddy_specs.DAGBuilder(workflow, task)
         instance.build_decisions()
         assert instance.decisions == expected_decisions
 
-    def test_bar_and_yay_complete(self, workflow):
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_bar_and_yay_complete(self, workflow, compact):
         """Test DAG decisions building after bar and yay activities complete."""
         task = {
             "taskToken": "spam",
@@ -925,6 +1248,10 @@ class TestDAGDecisionsBuilding:
                 },
             },
         ]
+        if compact:
+            task["events"] = seddy_specs.History(
+                task["events"], workflow.history_attributes
+            )
         instance = seddy_specs.DAGBuilder(workflow, task)
         instance.build_decisions()
         assert instance.decisions == expected_decisions
@@ -1120,7 +1447,7 @@ class TestDAGDecisionsBuilding:
         assert instance.decisions == expected_decisions
 
     def test_decision_timed_out(self, workflow):
-        """Test DAG decisions building after decision task times-out."""
+        """Test decision task time-out doesn't fail the workflow execution."""
         # Events sections
         task = {
             "taskToken": "spam",
@@ -1170,17 +1497,75 @@ class TestDAGDecisionsBuilding:
                 {"eventId": 9, "eventType": "DecisionTaskStarted"},
             ],
         }
-        expected_decisions = [
-            {
-                "decisionType": "FailWorkflowExecution",
-                "failWorkflowExecutionDecisionAttributes": {
-                    "details": "1 actions timed-out",
+        instance = seddy_specs.DAGBuilder(workflow, task)
+        instance.build_decisions()
+        assert instance.decisions == []
+
+    def test_decision_timed_out_activity_completed(self, workflow):
+        """Test decision task time-out doesn't lose completed activities."""
+        task = {
+            "taskToken": "spam",
+            "previousStartedEventId": 3,
+            "startedEventId": 12,
+            "events": [
+                {
+                    "eventId": 1,
+                    "eventType": "WorkflowExecutionStarted",
+                    "workflowExecutionStartedEventAttributes": {
+                        "input": (
+                            "{\n"
+                            '    "foo": {"spam": [42], "eggs": null},\n'
+                            '    "bar": null,\n'
+                            '    "yay": {"spam": [17], "eggs": [42]}\n'
+                            "}"
+                        )
+                    },
                 },
-            }
-        ]
+                {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 3, "eventType": "DecisionTaskStarted"},
+                {"eventId": 4, "eventType": "DecisionTaskCompleted"},
+                {
+                    "eventId": 5,
+                    "eventType": "ActivityTaskScheduled",
+                    "activityTaskScheduledEventAttributes": {
+                        "activityId": "foo",
+                        "activityType": {"name": "spam-foo", "version": "0.3"},
+                        "decisionTaskCompletedEventId": 4,
+                        "input": '{"spam": [42], "eggs": null}',
+                    },
+                },
+                {
+                    "eventId": 6,
+                    "eventType": "ActivityTaskStarted",
+                    "activityTaskStartedEventAttributes": {"scheduledEventId": 5},
+                },
+                {
+                    "eventId": 7,
+                    "eventType": "ActivityTaskCompleted",
+                    "activityTaskCompletedEventAttributes": {
+                        "scheduledEventId": 5,
+                        "result": "3",
+                    },
+                },
+                {"eventId": 8, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 9, "eventType": "DecisionTaskStarted"},
+                {
+                    "eventId": 10,
+                    "eventType": "DecisionTaskTimedOut",
+                    "decisionTaskTimedOutEventAttributes": {
+                        "timeoutType": "START_TO_CLOSE",
+                    },
+                },
+                {"eventId": 11, "eventType": "DecisionTaskScheduled"},
+                {"eventId": 12, "eventType": "DecisionTaskStarted"},
+            ],
+        }
         instance = seddy_specs.DAGBuilder(workflow, task)
         instance.build_decisions()
-        assert instance.decisions == expected_decisions
+        assert sorted(
+            d["scheduleActivityTaskDecisionAttributes"]["activityId"]
+            for d in instance.decisions
+        ) == ["bar", "yay"]
 
     def test_workflow_cancel(self, workflow):
         """Test DAG decisions building after workflow is cancelled."""
@@ -1361,7 +1746,10 @@ class TestDAGDecisionsBuilding:
             ),
         ],
     )
-    def test_decision_failure(self, workflow, cause, identity, event_type, exp):
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_decision_failure(
+        self, workflow, cause, identity, event_type, exp, compact
+    ):
         """Test decision failure handling."""
         # Build input
         event_attr_key = event_type[0].lower() + event_type[1:] + "EventAttributes"
@@ -1395,6 +1783,10 @@ class TestDAGDecisionsBuilding:
                 },
             ],
         }
+        if compact:
+            task["events"] = seddy_specs.History(
+                task["events"], workflow.history_attributes
+            )
         instance = seddy_specs.DAGBuilder(workflow, task)
 
         # Run function
@@ -1498,56 +1890,1020 @@ class TestDAGDecisionsBuilding:
         assert instance.decisions == [{"decisionType": "CompleteWorkflowExecution"}]
 
 
-class TestWorkflow:
-    """Test ``seddy._specs.DAGWorkflow``."""
+def _build_history(
+    input_=None, scheduled=(), completed=None, events=(), previous_id=None
+):
+    """Build decision task for an execution's history.
 
-    @pytest.fixture
-    def task_spec_dicts(self):
-        """Example DAG-type workflow tasks specifications."""
-        return [
+    Args:
+        input_: execution input, default: none
+        scheduled: scheduled activity IDs, or mapping of scheduled activity
+            IDs to batch activity tasks' task IDs
+        completed: completed activities' results, by activity ID
+        events: further history events, as event types and attributes
+        previous_id: previous decision task's started event ID, default:
+            the event before the decision task
+    """
+
+    started_attrs = {
+        "taskList": {"name": "eggs"},
+        "executionStartToCloseTimeout": "3600",
+        "childPolicy": "TERMINATE",
+    }
+    if input_ is not None:
+        started_attrs["input"] = json.dumps(input_)
+    history = [
+        {
+            "eventId": 1,
+            "eventType": "WorkflowExecutionStarted",
+            "workflowExecutionStartedEventAttributes": started_attrs,
+        },
+    ]
+    scheduled_event_ids = {}
+    for activity_id in scheduled:
+        scheduled_event_ids[activity_id] = len(history) + 1
+        attrs = {"activityId": activity_id}
+        if isinstance(scheduled, dict) and scheduled[activity_id]:
+            attrs["control"] = json.dumps({"batch": scheduled[activity_id]})
+        history.append(
             {
-                "id": "foo",
-                "type": {"name": "spam-foo", "version": "0.3"},
-                "heartbeat": "60",
-                "timeout": "86400",
-                "task_list": "eggs",
-                "priority": "1",
-            },
+                "eventId": len(history) + 1,
+                "eventType": "ActivityTaskScheduled",
+                "activityTaskScheduledEventAttributes": attrs,
+            }
+        )
+    for activity_id, result in (completed or {}).items():
+        attrs = {
+            "scheduledEventId": scheduled_event_ids[activity_id],
+            "result": json.dumps(result),
+        }
+        history.append(
             {
-                "id": "bar",
-                "type": {"name": "spam-bar", "version": "0.1"},
-                "heartbeat": "60",
-                "timeout": "86400",
-                "dependencies": "foo",
-            },
+                "eventId": len(history) + 1,
+                "eventType": "ActivityTaskCompleted",
+                "activityTaskCompletedEventAttributes": attrs,
+            }
+        )
+    for event_type, attrs in events:
+        event = {"eventId": len(history) + 1, "eventType": event_type}
+        event[_dag._attr_keys[event_type]] = attrs
+        history.append(event)
+    history.append({"eventId": len(history) + 1, "eventType": "DecisionTaskScheduled"})
+    history.append({"eventId": len(history) + 1, "eventType": "DecisionTaskStarted"})
+    if previous_id is None:
+        previous_id = len(history) - 2
+    return {
+        "taskToken": "spam",
+        "previousStartedEventId": previous_id,
+        "startedEventId": len(history),
+        "workflowExecution": {"workflowId": "ham", "runId": "abcd"},
+        "workflowType": {"name": "foo", "version": "0.42"},
+        "events": history,
+    }
+
+
+class TestConcurrencyLimitedScheduling:
+    """Test ``seddy._specs.DAGBuilder`` with concurrency limits."""
+
+    @pytest.fixture
+    def workflow(self):
+        """Example concurrency-limited fan-out DAG workflow specification."""
+        tasks = [{"id": "start", "type": {"name": "spam", "version": "1"}}]
+        for j in range(5):
+            task = {
+                "id": "item%d" % j,
+                "type": {"name": "spam", "version": "1"},
+                "input": {"type": "none"},
+                "dependencies": ["start"],
+            }
+            if j < 3:
+                task["task_list"] = "eggs"
+            tasks.append(task)
+        tasks[4]["priority"] = 5
+        workflow = seddy_specs.DAGWorkflow.from_spec(
             {
-                "id": "yay",
-                "type": {"name": "spam-foo", "version": "0.3"},
-                "heartbeat": "60",
-                "timeout": "86400",
-                "dependencies": "foo",
-            },
+                "name": "foo",
+                "version": "0.42",
+                "tasks": tasks,
+                "max_concurrency": 3,
+                "task_list_max_concurrency": {"eggs": 1},
+            }
+        )
+        workflow.setup()
+        return workflow
+
+    @pytest.mark.parametrize(
+        ("scheduled", "completed", "exp"),
+        [
+            pytest.param(["start"], ["start"], ["item3", "item0", "item4"], id="start"),
+            pytest.param(
+                ["start", "item0", "item3", "item4"],
+                ["start", "item3"],
+                [],
+                id="task-list-limited",
+            ),
+            pytest.param(
+                ["start", "item0", "item3", "item4"],
+                ["start", "item0"],
+                ["item1"],
+                id="item0-complete",
+            ),
+            pytest.param(
+                ["start", "item0", "item1", "item3", "item4"],
+                ["start", "item0", "item3", "item4"],
+                [],
+                id="held-back",
+            ),
+            pytest.param(
+                ["start", "item0", "item1", "item3", "item4"],
+                ["start", "item0", "item1", "item3", "item4"],
+                ["item2"],
+                id="last",
+            ),
+        ],
+    )
+    def test_schedule(self, workflow, scheduled, completed, exp):
+        """Test ready tasks are held back by concurrency limits."""
+        # Setup environment
+        task = _build_history(scheduled=scheduled, completed=dict.fromkeys(completed))
+        instance = seddy_specs.DAGBuilder(workflow, task)
+        build_input_mock = mock.Mock(wraps=instance._build_task_input)
+        instance._build_task_input = build_input_mock
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        res = [
+            d["scheduleActivityTaskDecisionAttributes"]["activityId"]
+            for d in instance.decisions
         ]
+        assert res == exp
+        built = [c[0][0].id for c in build_input_mock.call_args_list]
+        assert built == exp  # held-back tasks' inputs aren't built
 
-    @pytest.fixture
-    def task_specs(self, task_spec_dicts):
-        """Example deserialised DAG-type workflow tasks specifications."""
-        return [_dag.Task.from_spec(s) for s in task_spec_dicts]
+    def test_is_concurrency_limited(self, workflow):
+        """Test concurrency-limited workflow detection."""
+        assert workflow.is_concurrency_limited is True
+        workflow.max_concurrency = None
+        assert workflow.is_concurrency_limited is True
+        workflow.task_list_max_concurrency = {}
+        assert workflow.is_concurrency_limited is False
 
-    @pytest.fixture
-    def spec(self, task_spec_dicts):
-        """Example DAG-type workflow specification."""
-        return {
-            "name": "foo",
-            "version": "0.42",
-            "description": "A DAGflow",
-            "tasks": task_spec_dicts,
-            "type": "dag",
-        }
+
+class TestMapTaskScheduling:
+    """Test ``seddy._specs.DAGBuilder`` with map tasks."""
 
     @pytest.fixture
-    def instance(self, task_specs):
-        """DAG-type workflow specification instance."""
+    def workflow(self):
+        """Example map-task DAG workflow specification."""
+        workflow = seddy_specs.DAGWorkflow.from_spec(
+            {
+                "name": "foo",
+                "version": "0.42",
+                "tasks": [
+                    {
+                        "id": "foo",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "workflow-input", "path": "$.items"},
+                        "map": {"chunk_size": 2, "max_parallelism": 2},
+                    },
+                    {
+                        "id": "bar",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "dependency-result", "id": "foo"},
+                        "dependencies": ["foo"],
+                    },
+                ],
+            }
+        )
+        workflow.setup()
+        return workflow
+
+    @staticmethod
+    def _get_scheduled(decisions):
+        return [
+            (
+                d["scheduleActivityTaskDecisionAttributes"]["activityId"],
+                json.loads(d["scheduleActivityTaskDecisionAttributes"]["input"]),
+            )
+            for d in decisions
+        ]
+
+    @pytest.mark.parametrize(
+        ("scheduled", "completed", "exp"),
+        [
+            pytest.param([], {}, [("foo[0]", [1, 2]), ("foo[1]", [3, 4])], id="start"),
+            pytest.param(["foo[0]", "foo[1]"], {}, [], id="max-parallelism"),
+            pytest.param(
+                ["foo[0]", "foo[1]"],
+                {"foo[1]": [30, 40]},
+                [("foo[2]", [5])],
+                id="item-complete",
+            ),
+            pytest.param(
+                ["foo[0]", "foo[1]", "foo[2]"],
+                {"foo[1]": [30, 40], "foo[2]": [50]},
+                [],
+                id="waiting",
+            ),
+            pytest.param(
+                ["foo[0]", "foo[1]", "foo[2]"],
+                {"foo[1]": [30, 40], "foo[2]": [50], "foo[0]": [10, 20]},
+                [("bar", [10, 20, 30, 40, 50])],
+                id="map-complete",
+            ),
+        ],
+    )
+    def test_schedule(self, workflow, scheduled, completed, exp):
+        """Test map task items are scheduled, then results gathered."""
+        # Setup environment
+        task = _build_history({"items": [1, 2, 3, 4, 5]}, scheduled, completed)
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert self._get_scheduled(instance.decisions) == exp
+
+    def test_scan_cursor(self, workflow):
+        """Test map task items' scheduling and completion are tracked by scan."""
+        # Setup environment
+        task = _build_history(
+            {"items": list(range(10))},
+            ["foo[0]", "foo[1]", "foo[2]"],
+            {"foo[0]": [0, 1], "foo[2]": [4, 5]},
+        )
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert instance._map_next_items == {"foo": 3}
+        assert instance._n_map_items_completed == {"foo": 2}
+        assert self._get_scheduled(instance.decisions) == [("foo[3]", [6, 7])]
+
+    def test_complete(self, workflow):
+        """Test workflow result includes map task's gathered results."""
+        # Setup environment
+        task = _build_history(
+            {"items": [1, 2, 3]},
+            ["foo[0]", "foo[1]", "bar"],
+            {"foo[0]": [10, 20], "foo[1]": [30], "bar": 42},
+        )
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert instance.decisions == [
+            {
+                "decisionType": "CompleteWorkflowExecution",
+                "completeWorkflowExecutionDecisionAttributes": {
+                    "result": json.dumps({"foo": [10, 20, 30], "bar": 42})
+                },
+            }
+        ]
+
+    def test_empty(self, workflow):
+        """Test map task over an empty array completes immediately."""
+        # Setup environment
+        task = _build_history({"items": []})
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert self._get_scheduled(instance.decisions) == [("bar", [])]
+
+    def test_not_array(self, workflow):
+        """Test map task over a non-array input fails decision-making."""
+        # Setup environment
+        task = _build_history({"items": {"spam": 42}})
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        with pytest.raises(seddy_specs._base.DeciderError):
+            instance.build_decisions()
+
+    def test_map_tasks(self, workflow):
+        """Test map tasks and topological order are found on set-up."""
+        assert list(workflow.map_tasks) == ["foo"]
+        assert workflow.topological_order == ["foo", "bar"]
+
+
+class TestBatchedScheduling:
+    """Test ``seddy._specs.DAGBuilder`` with batched tasks."""
+
+    @pytest.fixture
+    def workflow(self):
+        """Example batched fan-out DAG workflow specification."""
+        tasks = [{"id": "start", "type": {"name": "spam", "version": "1"}}]
+        for j in range(6):
+            tasks.append(
+                {
+                    "id": "item%d" % j,
+                    "type": {"name": "spam" if j < 5 else "eggs", "version": "1"},
+                    "input": {"type": "constant", "value": j},
+                    "dependencies": ["start"],
+                    "batch_size": 2,
+                }
+            )
+        tasks.append(
+            {
+                "id": "end",
+                "type": {"name": "spam", "version": "1"},
+                "input": {"type": "dependency-result", "id": "item1"},
+                "dependencies": ["item0", "item1"],
+            }
+        )
+        workflow = seddy_specs.DAGWorkflow.from_spec(
+            {"name": "foo", "version": "0.42", "tasks": tasks}
+        )
+        workflow.setup()
+        return workflow
+
+    @staticmethod
+    def _get_scheduled(decisions):
+        return [
+            (
+                d["scheduleActivityTaskDecisionAttributes"]["activityId"],
+                json.loads(d["scheduleActivityTaskDecisionAttributes"]["input"]),
+                d["scheduleActivityTaskDecisionAttributes"].get("control"),
+            )
+            for d in decisions
+        ]
+
+    def test_coalesce(self, workflow):
+        """Test ready tasks are coalesced into batch activity tasks."""
+        # Setup environment
+        task = _build_history(scheduled={"start": None}, completed={"start": None})
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert self._get_scheduled(instance.decisions) == [
+            ("item0+2", [0, 1], json.dumps({"batch": ["item0", "item1"]})),
+            ("item2+2", [2, 3], json.dumps({"batch": ["item2", "item3"]})),
+            ("item4+1", [4], json.dumps({"batch": ["item4"]})),
+            ("item5+1", [5], json.dumps({"batch": ["item5"]})),
+        ]
+        decision_attrs = instance.decisions[0]["scheduleActivityTaskDecisionAttributes"]
+        assert decision_attrs["activityType"] == {"name": "spam", "version": "1"}
+
+    def test_concurrency_limited(self, workflow):
+        """Test batch activity tasks count once towards concurrency limits."""
+        # Setup environment
+        workflow.max_concurrency = 3
+        scheduled = {"start": None, "item0+2": ["item0", "item1"]}
+        task = _build_history(scheduled=scheduled, completed={"start": None})
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert self._get_scheduled(instance.decisions) == [
+            ("item2+2", [2, 3], json.dumps({"batch": ["item2", "item3"]})),
+            ("item4+1", [4], json.dumps({"batch": ["item4"]})),
+        ]
+
+    def test_split_result(self, workflow):
+        """Test batch activity task result is split to its tasks."""
+        # Setup environment
+        scheduled = {"start": None, "item0+2": ["item0", "item1"]}
+        completed = {"start": None, "item0+2": [{"spam": 10}, {"spam": 11}]}
+        task = _build_history(scheduled=scheduled, completed=completed)
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert self._get_scheduled(instance.decisions) == [
+            ("item2+2", [2, 3], json.dumps({"batch": ["item2", "item3"]})),
+            ("item4+1", [4], json.dumps({"batch": ["item4"]})),
+            ("item5+1", [5], json.dumps({"batch": ["item5"]})),
+            ("end", {"spam": 11}, None),
+        ]
+
+    def test_complete(self, workflow):
+        """Test workflow result includes batched tasks' results."""
+        # Setup environment
+        scheduled = {
+            "start": None,
+            "item0+2": ["item0", "item1"],
+            "item2+2": ["item2", "item3"],
+            "item4+1": ["item4"],
+            "item5+1": ["item5"],
+            "end": None,
+        }
+        completed = {
+            "start": None,
+            "item0+2": [0, 10],
+            "item2+2": [20, 30],
+            "item4+1": [40],
+            "item5+1": [50],
+            "end": 42,
+        }
+        task = _build_history(scheduled=scheduled, completed=completed)
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        exp_result = {"start": None, "end": 42}
+        exp_result.update({"item%d" % j: j * 10 for j in range(6)})
+        assert instance.decisions[0]["decisionType"] == "CompleteWorkflowExecution"
+        decision_attrs = instance.decisions[0][
+            "completeWorkflowExecutionDecisionAttributes"
+        ]
+        assert json.loads(decision_attrs["result"]) == exp_result
+
+    def test_bad_result(self, workflow):
+        """Test batch activity task result must have each task's result."""
+        # Setup environment
+        scheduled = {"start": None, "item0+2": ["item0", "item1"]}
+        completed = {"start": None, "item0+2": [10]}
+        task = _build_history(scheduled=scheduled, completed=completed)
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        with pytest.raises(seddy_specs._base.DeciderError):
+            instance.build_decisions()
+
+    def test_is_batched(self, workflow):
+        """Test batched workflow detection on set-up."""
+        assert workflow.is_batched is True
+        assert workflow.history_attributes["ActivityTaskScheduled"] == (
+            "activityId",
+            "control",
+        )
+
+
+class TestPartitioning:
+    """Test partitioned ``seddy._specs.DAGWorkflow`` decisions building."""
+
+    @pytest.fixture
+    def workflow(self):
+        """Example partitioned DAG workflow specification."""
+        workflow = seddy_specs.DAGWorkflow.from_spec(
+            {
+                "name": "foo",
+                "version": "0.42",
+                "partition_size": 2,
+                "tasks": [
+                    {
+                        "id": "a",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "workflow-input", "path": "$.x"},
+                    },
+                    {
+                        "id": "b",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "dependency-result", "id": "a"},
+                        "dependencies": ["a"],
+                    },
+                    {
+                        "id": "c",
+                        "type": {"name": "spam", "version": "1"},
+                        "dependencies": ["b"],
+                    },
+                    {
+                        "id": "d",
+                        "type": {"name": "spam", "version": "1"},
+                        "dependencies": ["a"],
+                    },
+                ],
+            }
+        )
+        workflow.setup()
+        return workflow
+
+    @staticmethod
+    def _build_partition_events(partition_id, result=None):
+        events = [
+            ("StartChildWorkflowExecutionInitiated", {"control": partition_id}),
+            ("ChildWorkflowExecutionStarted", {"initiatedEventId": None}),
+        ]
+        if result is not None:
+            attrs = {"initiatedEventId": None, "result": json.dumps(result)}
+            events.append(("ChildWorkflowExecutionCompleted", attrs))
+        return events
+
+    def _build_parent_history(self, partitions, previous_id=1):
+        events = []
+        for partition_id, result in partitions.items():
+            partition_events = self._build_partition_events(partition_id, result)
+            initiated_event_id = len(events) + 2
+            for _, attrs in partition_events[1:]:
+                attrs["initiatedEventId"] = initiated_event_id
+            events.extend(partition_events)
+        return _build_history({"x": 1}, events=events, previous_id=previous_id)
+
+    def test_setup(self, workflow):
+        """Test tasks are split into partitions in topological order."""
+        assert workflow.decisions_builder is _dag.PartitionedDAGBuilder
+        partitions = workflow.partition_graph.task_specs
+        assert [p.id for p in partitions] == ["partition-0", "partition-1"]
+        assert [p.dependencies for p in partitions] == [None, ["partition-0"]]
+        assert [p.external_dependencies for p in partitions] == [[], ["a"]]
+        assert [p.index for p in partitions] == [0, 1]
+        assert all(p.type == {"name": "foo", "version": "0.42"} for p in partitions)
+
+        tasks = partitions[0].workflow.task_specs
+        assert [(t.id, t.dependencies) for t in tasks] == [("a", None), ("d", ["a"])]
+        tasks = partitions[1].workflow.task_specs
+        assert [(t.id, t.dependencies) for t in tasks] == [("b", None), ("c", ["b"])]
+        assert tasks[0].decision_template == {
+            "activityType": {"name": "spam", "version": "1"}
+        }
+
+    def test_setup_small(self, workflow):
+        """Test workflows within the partition size aren't partitioned."""
+        workflow.partition_size = 4
+        workflow.decisions_builder = _dag.DAGBuilder
+        workflow.partition_graph = None
+        workflow.setup()
+        assert workflow.partition_graph is None
+        assert workflow.decisions_builder is _dag.DAGBuilder
+
+    def test_start(self, workflow):
+        """Test first partition's child execution is started."""
+        # Setup environment
+        task = _build_history({"x": 1}, previous_id=0)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == [
+            {
+                "decisionType": "StartChildWorkflowExecution",
+                "startChildWorkflowExecutionDecisionAttributes": {
+                    "workflowType": {"name": "foo", "version": "0.42"},
+                    "childPolicy": "TERMINATE",
+                    "workflowId": "ham-partition-0",
+                    "input": json.dumps(
+                        {"seddy_partition": 0, "input": {"x": 1}, "results": {}}
+                    ),
+                    "control": "partition-0",
+                    "taskList": {"name": "eggs"},
+                    "executionStartToCloseTimeout": "3600",
+                },
+            }
+        ]
+
+    def test_partition_complete(self, workflow):
+        """Test partition is started with its dependencies' results."""
+        # Setup environment
+        task = self._build_parent_history({"partition-0": {"a": 2, "d": 5}})
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert len(res) == 1
+        decision_attrs = res[0]["startChildWorkflowExecutionDecisionAttributes"]
+        assert decision_attrs["workflowId"] == "ham-partition-1"
+        assert json.loads(decision_attrs["input"]) == {
+            "seddy_partition": 1,
+            "input": {"x": 1},
+            "results": {"a": 2},
+        }
+
+    def test_running(self, workflow):
+        """Test nothing is scheduled while a partition is running."""
+        # Setup environment
+        task = self._build_parent_history(
+            {"partition-0": {"a": 2, "d": 5}, "partition-1": None}, previous_id=4
+        )
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == []
+
+    def test_complete(self, workflow):
+        """Test workflow result has all partitions' tasks' results."""
+        # Setup environment
+        task = self._build_parent_history(
+            {"partition-0": {"a": 2, "d": 5}, "partition-1": {"b": 3, "c": 4}},
+            previous_id=6,
+        )
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res[0]["decisionType"] == "CompleteWorkflowExecution"
+        decision_attrs = res[0]["completeWorkflowExecutionDecisionAttributes"]
+        assert json.loads(decision_attrs["result"]) == {"a": 2, "b": 3, "c": 4, "d": 5}
+
+    def test_partition_failed(self, workflow):
+        """Test workflow fails on partition child execution failure."""
+        # Setup environment
+        events = self._build_partition_events("partition-0")
+        events.append(("ChildWorkflowExecutionFailed", {"initiatedEventId": 2}))
+        events[1][1]["initiatedEventId"] = 2
+        task = _build_history({"x": 1}, events=events, previous_id=1)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == [
+            {
+                "decisionType": "FailWorkflowExecution",
+                "failWorkflowExecutionDecisionAttributes": {
+                    "details": "1 activities failed"
+                },
+            }
+        ]
+
+    def test_partition_execution(self, workflow):
+        """Test partition's child execution runs the partition's tasks."""
+        # Setup environment
+        input_ = {"seddy_partition": 1, "input": {"x": 1}, "results": {"a": 2}}
+        task = _build_history(input_, previous_id=0)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == [
+            {
+                "decisionType": "ScheduleActivityTask",
+                "scheduleActivityTaskDecisionAttributes": {
+                    "activityType": {"name": "spam", "version": "1"},
+                    "activityId": "b",
+                    "input": "2",
+                },
+            }
+        ]
+
+    def test_partition_execution_complete(self, workflow):
+        """Test partition's child execution result has its tasks' results."""
+        # Setup environment
+        input_ = {"seddy_partition": 0, "input": {"x": 1}, "results": {}}
+        events = []
+        for activity_id, result in [("a", 2), ("d", 5)]:
+            events.append(("ActivityTaskScheduled", {"activityId": activity_id}))
+            attrs = {"scheduledEventId": len(events) + 1, "result": json.dumps(result)}
+            events.append(("ActivityTaskCompleted", attrs))
+        task = _build_history(input_, events=events, previous_id=4)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == [
+            {
+                "decisionType": "CompleteWorkflowExecution",
+                "completeWorkflowExecutionDecisionAttributes": {
+                    "result": json.dumps({"a": 2, "d": 5})
+                },
+            }
+        ]
+
+
+class TestContinueAsNew:
+    """Test continue-as-new ``seddy._specs.DAGWorkflow`` decisions building."""
+
+    @pytest.fixture
+    def workflow(self):
+        """Example continue-as-new DAG workflow specification."""
+        workflow = seddy_specs.DAGWorkflow.from_spec(
+            {
+                "name": "foo",
+                "version": "0.42",
+                "continue_as_new": {"max_events": 5},
+                "tasks": [
+                    {
+                        "id": "a",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "workflow-input", "path": "$.x"},
+                    },
+                    {
+                        "id": "b",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "dependency-result", "id": "a"},
+                        "dependencies": ["a"],
+                    },
+                    {
+                        "id": "c",
+                        "type": {"name": "spam", "version": "1"},
+                        "dependencies": ["a"],
+                    },
+                    {
+                        "id": "d",
+                        "type": {"name": "spam", "version": "1"},
+                        "input": {"type": "dependency-result", "id": "b"},
+                        "dependencies": ["b"],
+                    },
+                ],
+            }
+        )
+        workflow.setup()
+        return workflow
+
+    @staticmethod
+    def _get_scheduled(decisions):
+        return [
+            (
+                d["scheduleActivityTaskDecisionAttributes"]["activityId"],
+                d["scheduleActivityTaskDecisionAttributes"].get("input"),
+            )
+            for d in decisions
+        ]
+
+    def test_from_spec(self, workflow):
+        """Test continue-as-new configuration construction from specification."""
+        assert workflow.continue_as_new == _dag.ContinueAsNew(max_events=5)
+        res = _dag.ContinueAsNew.from_spec({"max_events": 10, "max_bytes": 1000})
+        assert res == _dag.ContinueAsNew(max_events=10, max_bytes=1000)
+
+    def test_continue(self, workflow):
+        """Test large history's execution continues with its progress."""
+        # Setup environment
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=2)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        exp_input = {
+            "seddy_continued": {
+                "input": {"x": 1},
+                "completed": ["a"],
+                "results": {"a": 2},
+            }
+        }
+        assert res == [
+            {
+                "decisionType": "ContinueAsNewWorkflowExecution",
+                "continueAsNewWorkflowExecutionDecisionAttributes": {
+                    "input": json.dumps(exp_input),
+                    "taskList": {"name": "eggs"},
+                    "executionStartToCloseTimeout": "3600",
+                    "childPolicy": "TERMINATE",
+                },
+            }
+        ]
+
+    def test_small(self, workflow):
+        """Test small history's execution schedules tasks as usual."""
+        # Setup environment
+        workflow.continue_as_new.max_events = 6
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=2)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert sorted(self._get_scheduled(res)) == [("b", "2"), ("c", None)]
+
+    @pytest.mark.parametrize(
+        ("result", "exp"),
+        [
+            pytest.param("2", "ScheduleActivityTask", id="small"),
+            pytest.param('"spam"', "ContinueAsNewWorkflowExecution", id="large"),
+        ],
+    )
+    def test_max_bytes(self, workflow, result, exp):
+        """Test continuing on history's activity results size."""
+        # Setup environment
+        workflow.continue_as_new = _dag.ContinueAsNew(max_bytes=5)
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": result}),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=2)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res[0]["decisionType"] == exp
+
+    def test_max_bytes_carried(self, workflow):
+        """Test carried results don't count towards history's results size."""
+        # Setup environment
+        workflow.continue_as_new = _dag.ContinueAsNew(max_bytes=5)
+        input_ = {
+            "seddy_continued": {
+                "input": {"x": 1},
+                "completed": ["a"],
+                "results": {"a": "spam"},
+            }
+        }
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "b"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+        ]
+        task = _build_history(input_, events=events, previous_id=2)
+        instance = seddy_specs.DAGBuilder(workflow, task)
+
+        # Run function
+        instance.build_decisions()
+
+        # Check result
+        assert instance._n_result_bytes == 1
+        assert self._get_scheduled(instance.decisions) == [("c", None), ("d", "2")]
+
+    def test_continue_too_large(self, workflow):
+        """Test execution fails if its progress is too large to carry."""
+        # Setup environment
+        result = json.dumps("spam" * 10000)
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": result}),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=2)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res[0]["decisionType"] == "FailWorkflowExecution"
+        attrs = res[0]["failWorkflowExecutionDecisionAttributes"]
+        assert attrs["reason"] == "Progress too large to continue as new execution"
+        assert attrs["details"].endswith("(limit: 32768)")
+
+    def test_in_flight(self, workflow):
+        """Test ready tasks are held back while tasks are in flight."""
+        # Setup environment
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+            ("ActivityTaskScheduled", {"activityId": "b"}),
+            ("ActivityTaskScheduled", {"activityId": "c"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 4, "result": "3"}),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=5)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == []
+
+    def test_continued(self, workflow):
+        """Test continued execution resumes from carried progress."""
+        # Setup environment
+        workflow.continue_as_new.max_events = 1
+        input_ = {
+            "seddy_continued": {
+                "input": {"x": 1},
+                "completed": ["a", "b"],
+                "results": {"a": 2, "b": 3},
+            }
+        }
+        task = _build_history(input_, previous_id=0)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert self._get_scheduled(res) == [("c", None), ("d", "3")]
+
+    def test_continued_complete(self, workflow):
+        """Test continued execution's result includes carried results."""
+        # Setup environment
+        input_ = {
+            "seddy_continued": {
+                "input": {"x": 1},
+                "completed": ["a", "b", "c"],
+                "results": {"a": 2, "b": 3},
+            }
+        }
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "d"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "4"}),
+        ]
+        task = _build_history(input_, events=events, previous_id=2)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res == [
+            {
+                "decisionType": "CompleteWorkflowExecution",
+                "completeWorkflowExecutionDecisionAttributes": {
+                    "result": json.dumps({"a": 2, "b": 3, "d": 4})
+                },
+            }
+        ]
+
+    def test_continue_failed_unhandled(self, workflow):
+        """Test continuing is retried after an unhandled decision."""
+        # Setup environment
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+            ("DecisionTaskCompleted", {"startedEventId": 1}),
+            (
+                "ContinueAsNewWorkflowExecutionFailed",
+                {"cause": "UNHANDLED_DECISION", "decisionTaskCompletedEventId": 4},
+            ),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=4)
+
+        # Run function
+        res = workflow.make_decisions(task)
+
+        # Check result
+        assert res[0]["decisionType"] == "ContinueAsNewWorkflowExecution"
+
+    def test_continue_failed(self, workflow):
+        """Test continuing failure fails decision-making."""
+        # Setup environment
+        events = [
+            ("ActivityTaskScheduled", {"activityId": "a"}),
+            ("ActivityTaskCompleted", {"scheduledEventId": 2, "result": "2"}),
+            ("DecisionTaskCompleted", {"startedEventId": 1}),
+            (
+                "ContinueAsNewWorkflowExecutionFailed",
+                {
+                    "cause": "DEFAULT_CHILD_POLICY_UNDEFINED",
+                    "decisionTaskCompletedEventId": 4,
+                },
+            ),
+        ]
+        task = _build_history({"x": 1}, events=events, previous_id=4)
+
+        # Run function
+        with pytest.raises(seddy_specs._base.DeciderError):
+            workflow.make_decisions(task)
+
+
+class TestWorkflow:
+    """Test ``seddy._specs.DAGWorkflow``."""
+
+    @pytest.fixture
+    def task_spec_dicts(self):
+        """Example DAG-type workflow tasks specifications."""
+        return [
+            {
+                "id": "foo",
+                "type": {"name": "spam-foo", "version": "0.3"},
+                "heartbeat": "60",
+                "timeout": "86400",
+                "task_list": "eggs",
+                "priority": "1",
+            },
+            {
+                "id": "bar",
+                "type": {"name": "spam-bar", "version": "0.1"},
+                "heartbeat": "60",
+                "timeout": "86400",
+                "dependencies": "foo",
+            },
+            {
+                "id": "yay",
+                "type": {"name": "spam-foo", "version": "0.3"},
+                "heartbeat": "60",
+                "timeout": "86400",
+                "dependencies": "foo",
+            },
+        ]
+
+    @pytest.fixture
+    def task_specs(self, task_spec_dicts):
+        """Example deserialised DAG-type workflow tasks specifications."""
+        return [_dag.Task.from_spec(s) for s in task_spec_dicts]
+
+    @pytest.fixture
+    def spec(self, task_spec_dicts):
+        """Example DAG-type workflow specification."""
+        return {
+            "name": "foo",
+            "version": "0.42",
+            "description": "A DAGflow",
+            "tasks": task_spec_dicts,
+            "type": "dag",
+        }
+
+    @pytest.fixture
+    def instance(self, task_specs):
+        """DAG-type workflow specification instance."""
         return seddy_specs.DAGWorkflow("foo", "0.42", task_specs, "A DAGflow")
 
     def test_init(self, instance, task_specs):
@@ -1569,6 +2925,12 @@ class TestWorkflow:
         assert res.description == "A DAGflow"
         assert res.task_specs == task_specs
 
+    def test_from_spec_registration(self, spec):
+        """Test construction from specification with registration."""
+        spec["registration"] = {"task_timeout": 30}
+        res = seddy_specs.DAGWorkflow.from_spec(spec)
+        assert res.registration == seddy_specs.Registration(task_timeout=30)
+
     def test_setup(self, instance):
         """Test DAG-type workflow specification pre-computation."""
         instance.setup()
@@ -1578,3 +2940,65 @@ class TestWorkflow:
             "bar": [],
             "yay": [],
         }
+        assert instance.dependency_counts == {"foo": 0, "bar": 1, "yay": 1}
+        assert instance.task_specs_by_id == {
+            "foo": instance.task_specs[0],
+            "bar": instance.task_specs[1],
+            "yay": instance.task_specs[2],
+        }
+        assert instance.task_specs[0].decision_template == {
+            "activityType": {"name": "spam-foo", "version": "0.3"},
+            "heartbeatTimeout": "60",
+            "startToCloseTimeout": "86400",
+            "taskList": {"name": "eggs"},
+            "taskPriority": "1",
+        }
+        assert instance.task_specs[1].decision_template == {
+            "activityType": {"name": "spam-bar", "version": "0.1"},
+            "heartbeatTimeout": "60",
+            "startToCloseTimeout": "86400",
+        }
+        assert instance.critical_path_lengths == {}
+
+    def test_from_spec_critical_path_priority(self, spec):
+        """Test construction from specification with critical-path priority."""
+        spec["critical_path_priority"] = True
+        res = seddy_specs.DAGWorkflow.from_spec(spec)
+        assert res.critical_path_priority is True
+
+    def test_setup_critical_path_priority(self):
+        """Test tasks are prioritised by their critical-path length."""
+        # Setup environment
+        task_specs = [
+            _dag.Task("foo", "spam", "1.0", duration=10.0),
+            _dag.Task("bar", "spam", "1.0", dependencies=["foo"], duration=60.0),
+            _dag.Task("baz", "spam", "1.0", dependencies=["bar"]),
+            _dag.Task("yay", "spam", "1.0", dependencies=["foo"], duration=300.5),
+            _dag.Task("tin", "spam", "1.0", duration=5.0, priority=-3),
+            _dag.Task("qux", "spam", "1.0", dependencies=["baz", "tin"]),
+        ]
+        instance = seddy_specs.DAGWorkflow(
+            "foo", "0.42", task_specs, critical_path_priority=True
+        )
+
+        # Run function
+        instance.setup()
+
+        # Check result
+        assert instance.critical_path_lengths == {
+            "foo": 310.5,
+            "bar": 62.0,
+            "baz": 2.0,
+            "yay": 300.5,
+            "tin": 6.0,
+            "qux": 1.0,
+        }
+        priorities = {ts.id: ts.decision_template["taskPriority"] for ts in task_specs}
+        assert priorities == {
+            "foo": "311",
+            "bar": "62",
+            "baz": "2",
+            "yay": "301",
+            "tin": "-3",
+            "qux": "1",
+        }
@@ -0,0 +1,131 @@
+"""Test ``seddy._specs._history``."""
+
+import datetime
+
+from seddy import _specs as seddy_specs
+import pytest
+
+
+@pytest.fixture
+def events():
+    """Example history events."""
+    return [
+        {
+            "eventId": 1,
+            "eventTimestamp": datetime.datetime(
+                2020, 3, 1, 12, 30, tzinfo=datetime.timezone.utc
+            ),
+            "eventType": "WorkflowExecutionStarted",
+            "workflowExecutionStartedEventAttributes": {
+                "input": '{"foo": 42}',
+                "taskList": {"name": "eggs"},
+            },
+        },
+        {"eventId": 2, "eventType": "DecisionTaskScheduled"},
+        {
+            "eventId": 3,
+            "eventType": "DecisionTaskStarted",
+            "decisionTaskStartedEventAttributes": {
+                "identity": "spam-1234",
+                "scheduledEventId": 2,
+            },
+        },
+        {
+            "eventId": 4,
+            "eventType": "MarkerRecorded",
+            "markerRecordedEventAttributes": {"markerName": "ham"},
+        },
+    ]
+
+
+def test_prune_history(events):
+    """Test history event attributes pruning."""
+    # Build input
+    attribute_names = {"WorkflowExecutionStarted": ("input",)}
+
+    # Run function
+    seddy_specs.prune_history(events, attribute_names)
+
+    # Check result
+    assert events[0]["workflowExecutionStartedEventAttributes"] == {
+        "input": '{"foo": 42}'
+    }
+    assert "decisionTaskScheduledEventAttributes" not in events[1]
+    assert events[2]["decisionTaskStartedEventAttributes"] == {"scheduledEventId": 2}
+    assert events[3]["markerRecordedEventAttributes"] == {}
+
+
+class TestHistory:
+    """Test ``seddy._specs.History``."""
+
+    def test_all_attributes(self, events):
+        """Test history events are unchanged when keeping all attributes."""
+        # Run function
+        instance = seddy_specs.History(events)
+
+        # Check result
+        assert len(instance) == 4
+        assert list(instance) == [
+            events[0],
+            {
+                "eventId": 2,
+                "eventType": "DecisionTaskScheduled",
+                "decisionTaskScheduledEventAttributes": {},
+            },
+            events[2],
+            events[3],
+        ]
+
+    def test_pruned(self, events):
+        """Test history event attributes are pruned."""
+        # Build input
+        attribute_names = {"WorkflowExecutionStarted": ("input",)}
+
+        # Run function
+        instance = seddy_specs.History(events, attribute_names)
+
+        # Check result
+        assert instance[0] == {
+            "eventId": 1,
+            "eventTimestamp": events[0]["eventTimestamp"],
+            "eventType": "WorkflowExecutionStarted",
+            "workflowExecutionStartedEventAttributes": {"input": '{"foo": 42}'},
+        }
+        assert instance[2] == {
+            "eventId": 3,
+            "eventType": "DecisionTaskStarted",
+            "decisionTaskStartedEventAttributes": {"scheduledEventId": 2},
+        }
+        assert instance[3]["markerRecordedEventAttributes"] == {}
+
+    def test_indexing(self, events):
+        """Test history event indexing."""
+        # Setup environment
+        instance = seddy_specs.History(events)
+
+        # Run function
+        assert instance[-1]["eventId"] == 4
+        assert [e["eventId"] for e in instance[1:3]] == [2, 3]
+        assert [e["eventId"] for e in instance[::-2]] == [4, 2]
+        with pytest.raises(IndexError):
+            instance[4]
+        with pytest.raises(IndexError):
+            instance[-5]
+
+    def test_extend(self, events):
+        """Test history is extended by later pages."""
+        # Setup environment
+        instance = seddy_specs.History(events[:1])
+
+        # Run function
+        instance.extend(events[1:])
+        instance.append({"eventId": 5, "eventType": "DecisionTaskTimedOut"})
+
+        # Check result
+        assert [e["eventId"] for e in instance] == [1, 2, 3, 4, 5]
+        assert instance[4]["eventType"] == "DecisionTaskTimedOut"
+
+    def test_repr(self, events):
+        """Test history representation."""
+        assert repr(seddy_specs.History()) == "History([])"
+        assert repr(seddy_specs.History(events)) == "History(<4 events, IDs 1 to 4>)"
@@ -0,0 +1,187 @@
+"""Test ``seddy._tracing``."""
+
+import json
+import threading
+from unittest import mock
+
+from seddy import _tracing as seddy_tracing
+import pytest
+
+
+class TestTracer:
+    """Test ``seddy._tracing.Tracer``."""
+
+    @pytest.fixture
+    def exporter(self):
+        """Trace exporter mock."""
+        return mock.Mock(spec=seddy_tracing.Exporter)
+
+    @pytest.fixture
+    def instance(self, exporter):
+        """Tracer instance."""
+        return seddy_tracing.Tracer(exporter)
+
+    def test_span(self, instance, exporter):
+        """Test nested spans are exported as a trace."""
+        # Run function
+        with instance.span("spam", n=1) as root:
+            with instance.span("eggs") as child:
+                child.set_attribute("size", 42)
+                assert instance.current_span is child
+            exporter.export.assert_not_called()
+        assert instance.current_span is None
+
+        # Check result
+        exporter.export.assert_called_once_with([child, root])
+        assert root.parent_id is None
+        assert child.parent_id == root.span_id
+        assert child.trace_id == root.trace_id
+        assert root.attributes == {"n": 1}
+        assert child.attributes == {"size": 42}
+        assert root.start_time <= child.start_time <= child.end_time <= root.end_time
+        assert root.error is None
+
+    def test_span_error(self, instance, exporter):
+        """Test failed operations' spans have the error."""
+        # Run function
+        with pytest.raises(ValueError):
+            with instance.span("spam") as root:
+                raise ValueError("eggs")
+
+        # Check result
+        exporter.export.assert_called_once_with([root])
+        assert root.error == "ValueError: eggs"
+
+    def test_span_other_thread(self, instance, exporter):
+        """Test spans in other threads with explicit parent."""
+        # Setup environment
+        root = instance.start_span("spam")
+
+        def fn():
+            with instance.span("eggs", root):
+                pass
+
+        # Run function
+        thread = threading.Thread(target=fn)
+        thread.start()
+        thread.join()
+        root.end()
+
+        # Check result
+        (spans,), _ = exporter.export.call_args
+        assert [s.name for s in spans] == ["eggs", "spam"]
+        assert spans[0].parent_id == root.span_id
+
+    def test_discard(self, instance, exporter):
+        """Test discarded traces aren't exported."""
+        # Run function
+        root = instance.start_span("spam")
+        instance.discard(root)
+        root.end()
+
+        # Check result
+        exporter.export.assert_not_called()
+
+    def test_disabled(self):
+        """Test spans aren't recorded without an exporter."""
+        # Setup environment
+        instance = seddy_tracing.Tracer()
+
+        # Run function
+        with instance.span("spam") as span:
+            span.set_attribute("eggs", 42)
+            with instance.span("eggs"):
+                pass
+
+        # Check result
+        assert span.trace_id is None
+        assert not instance._traces
+
+    def test_export_error(self, instance, exporter, caplog):
+        """Test trace export errors are logged."""
+        # Setup environment
+        exporter.export.side_effect = OSError("eggs")
+
+        # Run function
+        with instance.span("spam"):
+            pass
+
+        # Check result
+        assert "Failed to export trace" in caplog.text
+
+
+def _make_spans():
+    tracer = seddy_tracing.Tracer(mock.Mock(spec=seddy_tracing.Exporter))
+    root = tracer.start_span("spam", workflow="foo-1.0")
+    child = tracer.start_span("eggs", root, n_events=3, ratio=0.5, new=True)
+    child.end(ValueError("bar"))
+    root.end()
+    return child, root
+
+
+def test_jsonl_exporter(tmp_path):
+    """Test spans are exported as JSON-lines."""
+    # Setup environment
+    path = tmp_path / "spans.jsonl"
+    child, root = _make_spans()
+    instance = seddy_tracing.JSONLExporter(path)
+
+    # Run function
+    instance.export([child, root])
+    instance.export([root])
+    instance.close()
+
+    # Check result
+    res = [json.loads(line) for line in path.read_text().splitlines()]
+    assert res == [child.to_dict(), root.to_dict(), root.to_dict()]
+    assert res[0]["name"] == "eggs"
+    assert res[0]["parent_id"] == root.span_id
+    assert res[0]["error"] == "ValueError: bar"
+
+
+def test_otlp_json_exporter(tmp_path):
+    """Test traces are exported as OTLP/JSON requests."""
+    # Setup environment
+    path = tmp_path / "traces.jsonl"
+    child, root = _make_spans()
+    instance = seddy_tracing.OTLPJSONExporter(path)
+
+    # Run function
+    instance.export([child, root])
+    instance.close()
+
+    # Check result
+    (line,) = path.read_text().splitlines()
+    (resource_spans,) = json.loads(line)["resourceSpans"]
+    assert resource_spans["resource"] == {
+        "attributes": [{"key": "service.name", "value": {"stringValue": "seddy"}}]
+    }
+    (scope_spans,) = resource_spans["scopeSpans"]
+    assert scope_spans["scope"] == {"name": "seddy"}
+    assert scope_spans["spans"] == [
+        {
+            "traceId": root.trace_id,
+            "spanId": child.span_id,
+            "parentSpanId": root.span_id,
+            "name": "eggs",
+            "kind": 1,
+            "startTimeUnixNano": str(child.start_time),
+            "endTimeUnixNano": str(child.end_time),
+            "attributes": [
+                {"key": "n_events", "value": {"intValue": "3"}},
+                {"key": "ratio", "value": {"doubleValue": 0.5}},
+                {"key": "new", "value": {"boolValue": True}},
+            ],
+            "status": {"code": 2, "message": "ValueError: bar"},
+        },
+        {
+            "traceId": root.trace_id,
+            "spanId": root.span_id,
+            "name": "spam",
+            "kind": 1,
+            "startTimeUnixNano": str(root.start_time),
+            "endTimeUnixNano": str(root.end_time),
+            "attributes": [{"key": "workflow", "value": {"stringValue": "foo-1.0"}}],
+            "status": {"code": 1},
+        },
+    ]
@@ -2,6 +2,8 @@
 
 import sys
 import json
+import logging as lg
+import logging.handlers
 from unittest import mock
 
 from seddy import _util as seddy_util
@@ -29,6 +31,62 @@ def test_list_paginated():
     }
 
 
+def test_iter_paginated():
+    # Build input
+    def fn(foo, token=None):
+        resp = {"foo": foo, "spam": {None: [0, 1], "spam": [2]}[token]}
+        if token is None:
+            resp["next"] = "spam"
+        return resp
+
+    # Run function
+    pages = seddy_util.iter_paginated(fn, {"foo": 42}, "next", "token")
+
+    # Check result
+    assert next(pages) == {"foo": 42, "spam": [0, 1]}
+    assert list(pages) == [{"foo": 42, "spam": [2]}]
+
+
+@pytest.mark.parametrize(
+    ("obj", "max_size", "exp"),
+    [
+        pytest.param({"a": [1, 2]}, 1000, "{'a': [1, 2]}", id="small"),
+        pytest.param(
+            list(range(20)), 1000, repr(list(range(10)))[:-1] + ", ...]", id="long"
+        ),
+        pytest.param([[[[[42]]]]], 1000, "[[[[[...]]]]]", id="deep"),
+        pytest.param("a" * 20, 10, "'aaaaaa...", id="large"),
+    ],
+)
+def test_payload(obj, max_size, exp):
+    """Test large payload summary."""
+    with mock.patch.object(seddy_util.Payload, "max_size", max_size):
+        assert str(seddy_util.Payload(obj)) == exp
+
+
+def test_setup_queue_logging(capsys):
+    """Test logs are formatted and written in a background thread."""
+    # Setup environment
+    root_logger = lg.RootLogger("WARNING")
+    root_logger_patch = mock.patch.object(lg, "root", root_logger)
+    atexit_register_mock = mock.Mock()
+    atexit_register_patch = mock.patch("atexit.register", atexit_register_mock)
+    coloredlogs_patch = mock.patch.dict(sys.modules, {"coloredlogs": None})
+    payload_patch = mock.patch.object(seddy_util.Payload, "max_size", 1000)
+
+    # Run function
+    with root_logger_patch, atexit_register_patch, coloredlogs_patch, payload_patch:
+        seddy_util.setup_logging(0, queue_logging=True, payload_size=10)
+
+        # Check logging configuration
+        (handler,) = root_logger.handlers
+        assert isinstance(handler, lg.handlers.QueueHandler)
+        root_logger.critical("spam %s", seddy_util.Payload("a" * 20))
+        (stop,), _ = atexit_register_mock.call_args
+        stop()
+    assert capsys.readouterr().err[24:] == "[CRITICAL] root: spam 'aaaaaa...\n"
+
+
 @pytest.fixture
 def workflows_spec():
     """Example workflows specifications."""
@@ -97,3 +155,77 @@ def test_load_workflows_with_incorrect_suffix(tmp_path, workflows_spec):
     # Run function
     with pytest.raises(ValueError):
         seddy_specs_io._load_specs(workflows_file)
+
+
+def test_get_spec_files(tmp_path):
+    """Test workflows specs directory expansion."""
+    # Build input
+    workflows_dir = tmp_path / "workflows.d"
+    workflows_dir.mkdir()
+    for name in ["b.yml", "a.json", "c.yaml", "README.md"]:
+        (workflows_dir / name).write_text("{}")
+    (workflows_dir / "d.json").mkdir()
+    paths = [tmp_path / "workflows.json", workflows_dir]
+
+    # Run function
+    assert seddy_specs_io._get_spec_files(paths) == [
+        tmp_path / "workflows.json",
+        workflows_dir / "a.json",
+        workflows_dir / "b.yml",
+        workflows_dir / "c.yaml",
+    ]
+
+
+class TestWorkflowsLoader:
+    """Test ``seddy._specs.WorkflowsLoader``."""
+
+    @pytest.fixture
+    def workflows_dir(self, tmp_path, workflows_spec):
+        """Example workflows specifications directory."""
+        workflows_dir = tmp_path / "workflows.d"
+        workflows_dir.mkdir()
+        (workflows_dir / "a.json").write_text(json.dumps(workflows_spec))
+        workflows_spec["workflows"][0]["version"] = "1.1"
+        (workflows_dir / "b.yml").write_text(yaml.safe_dump(workflows_spec))
+        return workflows_dir
+
+    @pytest.fixture
+    def instance(self, workflows_dir):
+        """Workflows loader instance."""
+        return seddy_specs_io.WorkflowsLoader([workflows_dir])
+
+    def test_load(self, instance):
+        """Test workflows loading from multiple files."""
+        res = instance.load()
+        assert [(w.name, w.version) for w in res] == [("spam", "1.0"), ("spam", "1.1")]
+
+    def test_load_cached(self, instance, workflows_dir, workflows_spec):
+        """Test only modified files are re-loaded."""
+        # Setup environment
+        res_initial = instance.load()
+        workflows_spec["workflows"][0]["version"] = "1.2"
+        (workflows_dir / "b.yml").write_text(yaml.safe_dump(workflows_spec))
+
+        # Run function
+        res = instance.load()
+
+        # Check result
+        assert [(w.name, w.version) for w in res] == [("spam", "1.0"), ("spam", "1.2")]
+        assert res[0] is res_initial[0]
+        assert res[1] is not res_initial[1]
+
+    def test_load_duplicate(self, instance, workflows_dir, workflows_spec):
+        """Test loading raises on workflow defined in multiple files."""
+        # Setup environment
+        res_initial = instance.load()
+        (workflows_dir / "c.json").write_text(json.dumps(workflows_spec))
+
+        # Run function
+        with pytest.raises(ValueError) as e:
+            instance.load()
+        assert "'spam' (version 1.1)" in str(e.value)
+
+        # Check cache is unchanged
+        (workflows_dir / "c.json").unlink()
+        res = instance.load()
+        assert res == res_initial
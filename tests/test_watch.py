@@ -0,0 +1,101 @@
+"""Test ``seddy._watch``."""
+
+import time
+import threading
+from unittest import mock
+
+from seddy import _watch as seddy_watch
+import pytest
+
+
+@pytest.fixture
+def no_inotify():
+    """Force modification-time polling."""
+    with mock.patch.object(seddy_watch, "inotify_simple", None):
+        yield
+
+
+def test_get_file_state(tmp_path):
+    """Test file modification state."""
+    path = tmp_path / "workflows.json"
+    assert seddy_watch._get_file_state(path) is None
+    path.write_text("{}")
+    state = seddy_watch._get_file_state(path)
+    assert state[1] == 2
+    path.write_text("{} ")
+    assert seddy_watch._get_file_state(path) != state
+
+
+class TestWatcher:
+    """Test ``seddy._watch.Watcher``."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Watched file path."""
+        path = tmp_path / "workflows.json"
+        path.write_text("{}")
+        return path
+
+    @pytest.fixture
+    def called(self):
+        """Watcher call-back event."""
+        return threading.Event()
+
+    @pytest.fixture
+    def instance(self, path, called, no_inotify):
+        """Watcher instance."""
+        instance = seddy_watch.Watcher([path], called.set, interval=0.01)
+        yield instance
+        instance.stop()
+
+    def test_modified(self, instance, path, called):
+        """Test call-back on file modification."""
+        instance.start()
+        time.sleep(0.05)
+        assert not called.is_set()
+        path.write_text('{"version": "1.0"}')
+        assert called.wait(1.0)
+
+    def test_removed(self, instance, path, called):
+        """Test call-back on file removal."""
+        instance.start()
+        path.unlink()
+        assert called.wait(1.0)
+
+    def test_directory_modified(self, tmp_path, called, no_inotify):
+        """Test call-back on modification of file in watched directory."""
+        path = tmp_path / "workflows.d"
+        path.mkdir()
+        (path / "a.json").write_text("{}")
+        instance = seddy_watch.Watcher([path], called.set, interval=0.01)
+        instance.start()
+        try:
+            (path / "a.json").write_text('{"version": "1.0"}')
+            assert called.wait(1.0)
+            called.clear()
+            (path / "b.json").write_text("{}")
+            assert called.wait(1.0)
+        finally:
+            instance.stop()
+
+    def test_callback_raises(self, path, no_inotify):
+        """Test watching continues after call-back failure."""
+        callback = mock.Mock(side_effect=[ValueError("spam"), None])
+        instance = seddy_watch.Watcher([path], callback, interval=0.01)
+        instance.start()
+        try:
+            path.write_text('{"version": "1.0"}')
+            time.sleep(0.1)
+            path.write_text('{"version": "1.1"}')
+            time.sleep(0.1)
+        finally:
+            instance.stop()
+        assert callback.call_count == 2
+
+    def test_stop(self, instance):
+        """Test watching thread finishes on stop."""
+        instance.start()
+        thread = instance._thread
+        instance.stop()
+        assert not thread.is_alive()
+        assert instance._thread is None